@@ -0,0 +1 @@
+"""Offline benchmarks for the scrape -> normalize -> publish pipeline."""
@@ -0,0 +1,269 @@
+"""Offline benchmark of the normalize -> validate -> serialize -> publish pipeline.
+
+Runs against synthetic event/shots fixtures and in-memory storage/index fakes, so no
+network or Supabase credentials are needed. Reports throughput and p50/p95/p99 latency
+per stage and writes them as JSON::
+
+    python -m benchmarks.pipeline --matches 200 --shots 40 --concurrency 16 --out bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+from src.api.app import create_app
+from src.api.dependencies import get_async_shots_publisher
+from src.application.publish_shots import AsyncShotsPublisher, ShotsPublicationRequest, ShotsPublisher
+from src.application.serialization import StdlibShotsSerializer
+from src.infrastructure.memory import (
+    AsyncInMemoryMatchesIndexRepository,
+    AsyncInMemoryShotsStorage,
+    InMemoryMatchesIndexRepository,
+    InMemoryShotsStorage,
+)
+from src.mapping.sofa_mapper_fc import map_event_to_contract
+from src.models.schemas import ShotsResponse
+
+
+_TEAMS = ["Real Oviedo", "FC Barcelona", "Atlético de Madrid", "Real Madrid", "Sevilla FC", "Villarreal CF"]
+_SITUATIONS = ["assisted", "corner", "free-kick", "set-piece", "fast-break", "regular", "penalty", "throw-in"]
+_SHOT_TYPES = ["goal", "save", "block", "miss", "post"]
+_BODY_PARTS = ["left-foot", "right-foot", "head", "other"]
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Latency distribution and throughput of one benchmark stage."""
+
+    count: int
+    total_seconds: float
+    throughput_per_second: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float], wall_seconds: float | None = None) -> "StageStats":
+        ordered = sorted(samples)
+        total = sum(ordered)
+        wall = wall_seconds if wall_seconds is not None else total
+        return cls(
+            count=len(ordered),
+            total_seconds=wall,
+            throughput_per_second=len(ordered) / wall if wall > 0 else 0.0,
+            mean_ms=1000 * total / len(ordered) if ordered else 0.0,
+            p50_ms=1000 * _percentile(ordered, 50),
+            p95_ms=1000 * _percentile(ordered, 95),
+            p99_ms=1000 * _percentile(ordered, 99),
+        )
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def synthetic_event(match_id: int, rng: random.Random) -> dict[str, Any]:
+    home, away = rng.sample(_TEAMS, 2)
+    kickoff = datetime(2024, 8, 15, 19, 0, tzinfo=timezone.utc) + timedelta(days=match_id % 300)
+    return {
+        "id": match_id,
+        "homeTeam": {"name": home},
+        "awayTeam": {"name": away},
+        "startTimestamp": int(kickoff.timestamp()),
+        "homeScore": {"current": rng.randint(0, 4)},
+        "awayScore": {"current": rng.randint(0, 4)},
+        "status": {"type": "finished"},
+    }
+
+
+def synthetic_shots(count: int, rng: random.Random) -> list[dict[str, Any]]:
+    return [
+        {
+            "player": {"name": f"Jugador {rng.randint(1, 40)}", "shortName": "J."},
+            "isHome": rng.random() < 0.5,
+            "time": rng.randint(1, 90),
+            "addedTime": rng.choice([float("nan"), 1.0, 2.0, 3.0]),
+            "xg": round(rng.random() * 0.6, 4),
+            "xgot": rng.choice([None, round(rng.random(), 4)]),
+            "situation": rng.choice(_SITUATIONS),
+            "shotType": rng.choice(_SHOT_TYPES),
+            "bodyPart": rng.choice(_BODY_PARTS),
+        }
+        for _ in range(count)
+    ]
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[Any, float]:
+    started = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - started
+
+
+def run_benchmarks(
+    *,
+    matches: int = 200,
+    shots_per_match: int = 40,
+    concurrency: int = 16,
+    seed: int = 1234,
+) -> dict[str, Any]:
+    """Run every stage and return a JSON-serializable report."""
+
+    rng = random.Random(seed)
+    fixtures = [
+        (synthetic_event(1_000_000 + n, rng), synthetic_shots(shots_per_match, rng))
+        for n in range(matches)
+    ]
+    stages: dict[str, list[float]] = {
+        "map": [],
+        "validate": [],
+        "serialize_sha256": [],
+        "serialize_sha256_stdlib": [],
+        "publish": [],
+    }
+
+    normalized: list[dict[str, Any]] = []
+    for event, shots in fixtures:
+        value, elapsed = _timed(lambda: map_event_to_contract(event, shots))
+        normalized.append(value)
+        stages["map"].append(elapsed)
+
+    models: list[ShotsResponse] = []
+    for payload in normalized:
+        value, elapsed = _timed(lambda: ShotsResponse.model_validate(payload))
+        models.append(value)
+        stages["validate"].append(elapsed)
+
+    for model in models:
+        _, elapsed = _timed(lambda: sha256(ShotsPublisher._serialize(model)).hexdigest())
+        stages["serialize_sha256"].append(elapsed)
+
+    # Reference engine (model_dump + json.dumps), side by side with the default canonical one.
+    stdlib = StdlibShotsSerializer()
+    for model in models:
+        _, elapsed = _timed(lambda: sha256(stdlib.serialize(model)).hexdigest())
+        stages["serialize_sha256_stdlib"].append(elapsed)
+
+    publisher = ShotsPublisher(storage=InMemoryShotsStorage(), database=InMemoryMatchesIndexRepository())
+    requests = [
+        ShotsPublicationRequest(
+            match_id=model.partido.idPartido,
+            storage_path=f"matches/{model.partido.idPartido}.json",
+            shots=model,
+        )
+        for model in models
+    ]
+    for request in requests:
+        _, elapsed = _timed(lambda: publisher.publish(request))
+        stages["publish"].append(elapsed)
+
+    report_stages = {name: asdict(StageStats.from_samples(samples)) for name, samples in stages.items()}
+    endpoint_samples, endpoint_wall = asyncio.run(_bench_endpoint(models, concurrency=concurrency))
+    report_stages["endpoint"] = asdict(StageStats.from_samples(endpoint_samples, wall_seconds=endpoint_wall))
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "matches": matches,
+            "shots_per_match": shots_per_match,
+            "concurrency": concurrency,
+            "seed": seed,
+        },
+        "stages": report_stages,
+    }
+
+
+async def _bench_endpoint(models: list[ShotsResponse], *, concurrency: int) -> tuple[list[float], float]:
+    """POST every match to /v1/shots/publish with ``concurrency`` requests in flight."""
+
+    app = create_app()
+    publisher = AsyncShotsPublisher(
+        storage=AsyncInMemoryShotsStorage(),
+        database=AsyncInMemoryMatchesIndexRepository(),
+    )
+    app.dependency_overrides[get_async_shots_publisher] = lambda: publisher
+
+    bodies = [
+        json.dumps(
+            {
+                "match_id": model.partido.idPartido,
+                "storage_path": f"matches/{model.partido.idPartido}.json",
+                "shots": model.model_dump(exclude_none=True),
+            }
+        ).encode("utf-8")
+        for model in models
+    ]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    samples: list[float] = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def _post(body: bytes) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/v1/shots/publish",
+                    content=body,
+                    headers={"content-type": "application/json"},
+                )
+                samples.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_post(body) for body in bodies))
+        wall = time.perf_counter() - started
+
+    return samples, wall
+
+
+def _print_table(report: dict[str, Any]) -> None:
+    print(f"{'stage':<26}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["stages"].items():
+        print(
+            f"{name:<26}{stats['throughput_per_second']:>12.1f}"
+            f"{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=200, help="Synthetic matches per stage")
+    parser.add_argument("--shots", type=int, default=40, help="Shots per synthetic match")
+    parser.add_argument("--concurrency", type=int, default=16, help="In-flight requests for the endpoint stage")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--out", type=Path, default=None, help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        matches=args.matches,
+        shots_per_match=args.shots,
+        concurrency=args.concurrency,
+        seed=args.seed,
+    )
+    _print_table(report)
+    if args.out is not None:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
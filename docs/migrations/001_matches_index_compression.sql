@@ -0,0 +1,10 @@
+-- Columnas de matches_index para los ficheros comprimidos (SHOTS_CONTENT_ENCODING).
+--
+-- raw_size_bytes:   tamaño del JSON canónico sin comprimir (NULL si no se comprimió).
+-- content_encoding: gzip, zstd o NULL si el fichero se guardó sin comprimir.
+--
+-- Debe aplicarse antes de desplegar una versión que las lea: el publicador las pide al
+-- comprobar si un partido ya está publicado. Es idempotente.
+ALTER TABLE public.matches_index
+    ADD COLUMN IF NOT EXISTS raw_size_bytes bigint,
+    ADD COLUMN IF NOT EXISTS content_encoding text;
@@ -1,42 +1,92 @@
 """FastAPI application wiring the shots publication endpoint."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from dataclasses import asdict
+from datetime import date, datetime, time, timedelta, timezone
+from hashlib import sha256
+from http import HTTPStatus
+from typing import AsyncIterable, AsyncIterator, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response, status
+from pydantic import ValidationError
 
-from src.api.dependencies import get_shots_publisher
-from src.api.schemas import PublishShotsRequest, PublishShotsResponse
+from src.api.dependencies import (
+    close_index_writer,
+    close_local_backend,
+    close_matches_replica,
+    close_supabase_http_client,
+    get_async_shots_publisher,
+    get_matches_replica,
+    get_shots_publisher,
+)
+from src.api.ndjson import NDJSONStreamingResponse, iter_ndjson_lines
+from src.api.schemas import (
+    MatchIndexItem,
+    MatchesListResponse,
+    PublishShotsBatchItem,
+    PublishShotsBatchRequest,
+    PublishShotsBatchResponse,
+    PublishShotsRequest,
+    PublishShotsResponse,
+    PublishShotsStreamItem,
+)
+from src.application.matches_replica import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    MatchesIndexReplica,
+)
 from src.application.publish_shots import (
+    AsyncShotsPublisher,
+    PublishItemResult,
     ShotsPayloadValidationError,
     ShotsPublicationRequest,
     ShotsPublisher,
 )
+from src.observability.metrics import CONTENT_TYPE_LATEST, REGISTRY
 
 
 logger = logging.getLogger(__name__)
 
+STREAM_MAX_LINE_BYTES = 8 * 1024 * 1024
+STREAM_DEFAULT_CONCURRENCY = 8
+_STREAM_DONE = object()
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    close_matches_replica()
+    # Primero se vuelca el índice diferido: usa los clientes que se cierran después.
+    await asyncio.to_thread(close_index_writer)
+    await close_supabase_http_client()
+    close_local_backend()
+
 
 def create_app() -> FastAPI:
     """Create the FastAPI application configured with dependency injection."""
 
-    app = FastAPI(title="Shots Extractor API", version="1.0.0")
+    app = FastAPI(title="Shots Extractor API", version="1.0.0", lifespan=_lifespan)
 
     @app.post(
         "/v1/shots/publish",
         response_model=PublishShotsResponse,
         status_code=status.HTTP_201_CREATED,
         summary="Publica un fichero de disparos en Supabase",
+        description="Devuelve 200 con `skipped=true` si el mismo contenido ya estaba publicado en esa ruta.",
     )
-    def publish_shots(
+    async def publish_shots(
         payload: PublishShotsRequest,
-        publisher: ShotsPublisher = Depends(get_shots_publisher),
+        response: Response,
+        publisher: AsyncShotsPublisher = Depends(get_async_shots_publisher),
     ) -> PublishShotsResponse:
         """Endpoint que delega en el caso de uso y normaliza respuestas."""
 
         try:
-            result = publisher.publish(
+            result = await publisher.publish(
                 ShotsPublicationRequest(
                     match_id=payload.match_id,
                     storage_path=payload.storage_path,
@@ -55,6 +105,310 @@ def create_app() -> FastAPI:
                 detail="Falló la publicación en Supabase",
             ) from exc
 
+        if result.skipped:
+            response.status_code = status.HTTP_200_OK
         return PublishShotsResponse(**asdict(result))
 
+    @app.post(
+        "/v1/shots/publish:batch",
+        response_model=PublishShotsBatchResponse,
+        status_code=status.HTTP_200_OK,
+        summary="Publica varios ficheros de disparos en Supabase",
+    )
+    def publish_shots_batch(
+        payload: PublishShotsBatchRequest,
+        publisher: ShotsPublisher = Depends(get_shots_publisher),
+    ) -> PublishShotsBatchResponse:
+        """Endpoint por lotes: los errores se devuelven por elemento, no fallan el lote."""
+
+        outcomes = publisher.publish_many(
+            [
+                ShotsPublicationRequest(
+                    match_id=item.match_id,
+                    storage_path=item.storage_path,
+                    shots=item.shots,
+                )
+                for item in payload.items
+            ]
+        )
+        items = [_to_batch_item(outcome) for outcome in outcomes]
+        published = sum(1 for item in items if item.result is not None)
+
+        return PublishShotsBatchResponse(
+            published=published,
+            failed=len(items) - published,
+            items=items,
+        )
+
+    @app.post(
+        "/v1/shots/publish:stream",
+        response_class=NDJSONStreamingResponse,
+        status_code=status.HTTP_200_OK,
+        summary="Publica disparos enviados como NDJSON en streaming",
+        description=(
+            "Cuerpo NDJSON con un `PublishShotsRequest` por línea. Cada línea se publica en cuanto "
+            "llega y la respuesta devuelve, también en NDJSON, un `PublishShotsStreamItem` por línea "
+            "en orden de finalización (usa `line` para correlacionar)."
+        ),
+    )
+    async def publish_shots_stream(
+        request: Request,
+        concurrency: int = Query(STREAM_DEFAULT_CONCURRENCY, ge=1, le=64, description="Publicaciones simultáneas"),
+        publisher: AsyncShotsPublisher = Depends(get_async_shots_publisher),
+    ) -> NDJSONStreamingResponse:
+        """Endpoint NDJSON: memoria acotada por ``concurrency``, no por el tamaño del cuerpo."""
+
+        return NDJSONStreamingResponse(
+            _publish_ndjson_stream(request.stream(), publisher, concurrency=concurrency),
+        )
+
+    @app.get(
+        "/v1/matches",
+        response_model=MatchesListResponse,
+        summary="Lista los partidos publicados, más recientes primero",
+        description=(
+            "Se sirve desde una réplica local de `matches_index` que se refresca periódicamente "
+            "(`SHOTS_REPLICA_REFRESH_SECONDS`); no consulta Supabase. Admite `If-None-Match`."
+        ),
+        responses={304: {"description": "El contenido no cambió desde el ETag indicado"}},
+    )
+    def list_matches(
+        response: Response,
+        team: Optional[str] = Query(None, min_length=1, description="Equipo local o visitante (sin distinguir mayúsculas)"),
+        date_from: Optional[date] = Query(None, description="Primer día incluido (UTC)"),
+        date_to: Optional[date] = Query(None, description="Último día incluido (UTC)"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Partidos por página"),
+        cursor: Optional[str] = Query(None, description="`next_cursor` de la página anterior"),
+        if_none_match: Optional[str] = Header(None),
+        replica: MatchesIndexReplica = Depends(get_matches_replica),
+    ) -> MatchesListResponse | Response:
+        """Listado paginado por cursor con índices en memoria por fecha y equipo."""
+
+        version = _replica_version(replica)
+        etag = _etag(version, team or "", str(date_from or ""), str(date_to or ""), str(limit), cursor or "")
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        try:
+            page = replica.list_matches(
+                team=team,
+                since=_day_start(date_from) if date_from else None,
+                until=_day_start(date_to + timedelta(days=1)) if date_to else None,
+                limit=limit,
+                cursor=cursor,
+            )
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+        response.headers["ETag"] = etag
+        return MatchesListResponse(
+            items=[MatchIndexItem(**asdict(entry)) for entry in page.items],
+            next_cursor=page.next_cursor,
+        )
+
+    @app.get(
+        "/v1/matches/{match_id}",
+        response_model=MatchIndexItem,
+        summary="Devuelve la fila de matches_index de un partido",
+        responses={304: {"description": "El contenido no cambió desde el ETag indicado"}},
+    )
+    def get_match(
+        match_id: str,
+        response: Response,
+        if_none_match: Optional[str] = Header(None),
+        replica: MatchesIndexReplica = Depends(get_matches_replica),
+    ) -> MatchIndexItem | Response:
+        """Búsqueda por id en la réplica local."""
+
+        _replica_version(replica)
+        entry = replica.get(match_id)
+        if entry is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partido no encontrado")
+        item = MatchIndexItem(**asdict(entry))
+        etag = _etag(item.model_dump_json())
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return item
+
+    @app.get(
+        "/metrics",
+        response_class=Response,
+        include_in_schema=False,
+        summary="Métricas del proceso en formato de texto de Prometheus",
+    )
+    def metrics() -> Response:
+        """Expone latencias por etapa, reintentos, fallos y tamaños de la publicación."""
+
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
     return app
+
+
+async def _publish_ndjson_stream(
+    chunks: AsyncIterable[bytes],
+    publisher: AsyncShotsPublisher,
+    *,
+    concurrency: int,
+) -> AsyncIterator[bytes]:
+    """Reader -> ``concurrency`` workers -> response, joined by bounded queues.
+
+    When the workers fall behind the reader blocks on the pending queue and stops pulling
+    the request body; when the client stops reading the response the workers block on the
+    results queue. Either way backpressure reaches the other end of the connection.
+    """
+
+    pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    async def _read() -> None:
+        async for line_number, line in iter_ndjson_lines(chunks, max_line_bytes=STREAM_MAX_LINE_BYTES):
+            if line is not None and not line.strip():
+                continue
+            await pending.put((line_number, line))
+
+    async def _work() -> None:
+        while (job := await pending.get()) is not None:
+            await results.put(await _publish_ndjson_line(publisher, *job))
+
+    async def _run() -> None:
+        workers = [asyncio.create_task(_work()) for _ in range(concurrency)]
+        try:
+            try:
+                await _read()
+            except Exception:
+                logger.exception("Error leyendo el cuerpo NDJSON; se completan las líneas ya recibidas")
+            for _ in workers:
+                await pending.put(None)
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            for worker in workers:
+                worker.cancel()
+            raise
+        except Exception:  # pragma: no cover - defensivo; _publish_ndjson_line no propaga errores
+            logger.exception("Error inesperado publicando el cuerpo NDJSON")
+            for worker in workers:
+                worker.cancel()
+        await results.put(_STREAM_DONE)
+
+    runner = asyncio.create_task(_run())
+    try:
+        while (item := await results.get()) is not _STREAM_DONE:
+            yield item.model_dump_json().encode("utf-8") + b"\n"
+    finally:
+        runner.cancel()
+        try:
+            await runner
+        except asyncio.CancelledError:
+            pass
+
+
+async def _publish_ndjson_line(
+    publisher: AsyncShotsPublisher,
+    line_number: int,
+    line: bytes | None,
+) -> PublishShotsStreamItem:
+    if line is None:
+        return PublishShotsStreamItem(
+            line=line_number,
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=f"La línea supera el máximo de {STREAM_MAX_LINE_BYTES} bytes",
+        )
+    try:
+        payload = PublishShotsRequest.model_validate_json(line)
+    except ValidationError as exc:
+        return PublishShotsStreamItem(
+            line=line_number,
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=_validation_detail(exc),
+        )
+
+    try:
+        result = await publisher.publish(
+            ShotsPublicationRequest(
+                match_id=payload.match_id,
+                storage_path=payload.storage_path,
+                shots=payload.shots,
+            )
+        )
+    except Exception as exc:
+        outcome = PublishItemResult(match_id=payload.match_id, storage_path=payload.storage_path, error=exc)
+    else:
+        outcome = PublishItemResult(match_id=payload.match_id, storage_path=payload.storage_path, result=result)
+
+    item = _to_batch_item(outcome)
+    return PublishShotsStreamItem(
+        line=line_number,
+        match_id=item.match_id,
+        storage_path=item.storage_path,
+        status_code=item.status_code,
+        result=item.result,
+        detail=item.detail,
+    )
+
+
+def _replica_version(replica: MatchesIndexReplica) -> str:
+    try:
+        return replica.version
+    except Exception as exc:
+        # Solo falla la primera carga; después se sirve la última copia buena.
+        logger.exception("No se pudo cargar la réplica de matches_index")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="El índice de partidos no está disponible",
+        ) from exc
+
+
+def _etag(*parts: str) -> str:
+    return '"' + sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    errors = exc.errors(include_url=False)
+    parts = [f"{'.'.join(str(loc) for loc in error['loc']) or 'body'}: {error['msg']}" for error in errors[:5]]
+    if len(errors) > 5:
+        parts.append(f"... y {len(errors) - 5} errores más")
+    return "; ".join(parts)
+
+
+def _to_batch_item(outcome: PublishItemResult) -> PublishShotsBatchItem:
+    if outcome.ok:
+        return PublishShotsBatchItem(
+            match_id=outcome.match_id,
+            storage_path=outcome.storage_path,
+            status_code=status.HTTP_200_OK if outcome.result.skipped else status.HTTP_201_CREATED,
+            result=PublishShotsResponse(**asdict(outcome.result)),
+        )
+
+    if isinstance(outcome.error, ShotsPayloadValidationError):
+        return PublishShotsBatchItem(
+            match_id=outcome.match_id,
+            storage_path=outcome.storage_path,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(outcome.error),
+        )
+
+    logger.error(
+        "Error publicando disparos en Supabase",
+        exc_info=outcome.error,
+        extra={
+            "match_id": outcome.match_id,
+            "storage_path": outcome.storage_path,
+        },
+    )
+    return PublishShotsBatchItem(
+        match_id=outcome.match_id,
+        storage_path=outcome.storage_path,
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail="Falló la publicación en Supabase",
+    )
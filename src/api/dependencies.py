@@ -1,33 +1,90 @@
-"""FastAPI dependencies wiring external infrastructure for the application."""
+"""FastAPI dependencies wiring external infrastructure for the application.
+
+The Supabase SDK, httpx and python-dotenv are imported inside the factories that need
+them, so an app running the ``local`` or ``memory`` backend never pays for loading them.
+"""
 from __future__ import annotations
 
 import os
 from dataclasses import dataclass
 from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from dotenv import load_dotenv
-from supabase import Client, create_client
-
-from src.application.publish_shots import ShotsPublisher
-from src.infrastructure.supabase import (
-    SupabaseMatchesIndexRepository,
-    SupabaseStorageAdapter,
+from src.application.compression import resolve_content_encoding
+from src.application.matches_replica import DEFAULT_REFRESH_SECONDS, MatchesIndexReplica, MatchesIndexSource
+from src.application.resilience import CircuitBreaker, RetryPolicy, circuit_breaker
+from src.application.publish_shots import (
+    AsyncShotsPublisher,
+    MatchesIndexRepository,
+    PublishedMatchesCache,
+    ShotsPublisher,
+    ShotsStorage,
 )
+from src.infrastructure.local import LocalFileStorageAdapter, SqliteMatchesIndexRepository
+from src.infrastructure.memory import InMemoryMatchesIndexRepository, InMemoryShotsStorage
+from src.infrastructure.threaded import ThreadedMatchesIndexRepository, ThreadedShotsStorage
+from src.infrastructure.write_behind import WriteBehindMatchesIndex
+
+if TYPE_CHECKING:
+    import httpx
+    from supabase import Client
+
+STORAGE_BACKENDS = ("supabase", "local", "memory")
 
 
 @dataclass(frozen=True)
 class Settings:
-    """Configuration required to connect with Supabase services."""
+    """Configuration of the publication backend (Supabase, local disk + SQLite or memory)."""
 
-    supabase_url: str
-    supabase_service_key: str
+    supabase_url: str | None = None
+    supabase_service_key: str | None = None
     supabase_bucket: str = "shots"
+    skip_unchanged: bool = False
+    content_encoding: str | None = None
+    storage_backend: str = "supabase"
+    local_storage_dir: str = "data/published"
+    local_index_path: str | None = None
+    index_write_behind: bool = False
+    index_flush_size: int = WriteBehindMatchesIndex.DEFAULT_MAX_BATCH
+    index_flush_interval: float = WriteBehindMatchesIndex.DEFAULT_MAX_DELAY_SECONDS
+    index_journal_path: str = "data/matches_index.journal.jsonl"
+    retry_max_attempts: int = 3
+    retry_base_delay: float = 0.2
+    retry_deadline: float = 10.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    replica_refresh_interval: float = DEFAULT_REFRESH_SECONDS
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return RetryPolicy(
+            max_attempts=max(1, self.retry_max_attempts),
+            base_delay=self.retry_base_delay,
+            deadline=self.retry_deadline,
+        )
+
+    @property
+    def sqlite_index_path(self) -> Path:
+        if self.local_index_path:
+            return Path(self.local_index_path)
+        return Path(self.local_storage_dir) / "matches_index.sqlite3"
 
     @staticmethod
     def from_env() -> "Settings":
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_SERVICE_KEY")
         bucket = os.getenv("SUPABASE_BUCKET_SHOTS", "shots")
+        skip_unchanged = _env_flag("SHOTS_SKIP_UNCHANGED")
+        try:
+            content_encoding = resolve_content_encoding(os.getenv("SHOTS_CONTENT_ENCODING"))
+        except ValueError as exc:
+            raise RuntimeError(f"SHOTS_CONTENT_ENCODING inválida: {exc}") from exc
+        backend = (os.getenv("SHOTS_STORAGE_BACKEND") or "supabase").strip().lower()
+        if backend not in STORAGE_BACKENDS:
+            raise RuntimeError(
+                f"SHOTS_STORAGE_BACKEND inválido: {backend!r} (usa {', '.join(STORAGE_BACKENDS)})"
+            )
 
         missing = [
             name
@@ -35,19 +92,61 @@ class Settings:
                 ("SUPABASE_URL", url),
                 ("SUPABASE_SERVICE_KEY", key),
             )
-            if not value
+            if not value and backend == "supabase"
         ]
         if missing:
             missing_str = ", ".join(missing)
             raise RuntimeError(f"Faltan variables de entorno requeridas: {missing_str}")
 
-        return Settings(supabase_url=url, supabase_service_key=key, supabase_bucket=bucket)
+        return Settings(
+            supabase_url=url,
+            supabase_service_key=key,
+            supabase_bucket=bucket,
+            skip_unchanged=skip_unchanged,
+            content_encoding=content_encoding,
+            storage_backend=backend,
+            local_storage_dir=os.getenv("SHOTS_LOCAL_DIR") or "data/published",
+            local_index_path=os.getenv("SHOTS_LOCAL_INDEX") or None,
+            index_write_behind=_env_flag("SHOTS_INDEX_WRITE_BEHIND"),
+            index_flush_size=_env_number("SHOTS_INDEX_FLUSH_SIZE", int, WriteBehindMatchesIndex.DEFAULT_MAX_BATCH),
+            index_flush_interval=_env_number(
+                "SHOTS_INDEX_FLUSH_INTERVAL",
+                float,
+                WriteBehindMatchesIndex.DEFAULT_MAX_DELAY_SECONDS,
+            ),
+            index_journal_path=os.getenv("SHOTS_INDEX_JOURNAL") or "data/matches_index.journal.jsonl",
+            retry_max_attempts=_env_number("SHOTS_RETRY_MAX_ATTEMPTS", int, 3),
+            retry_base_delay=_env_number("SHOTS_RETRY_BASE_DELAY", float, 0.2),
+            retry_deadline=_env_number("SHOTS_RETRY_DEADLINE", float, 10.0),
+            breaker_failure_threshold=_env_number("SHOTS_BREAKER_FAILURES", int, 5),
+            breaker_reset_timeout=_env_number("SHOTS_BREAKER_RESET_SECONDS", float, 30.0),
+            replica_refresh_interval=_env_number("SHOTS_REPLICA_REFRESH_SECONDS", float, DEFAULT_REFRESH_SECONDS),
+        )
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_number(name: str, kind: type, default: float) -> Any:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return kind(value)
+    except ValueError as exc:
+        raise RuntimeError(f"{name} inválida: {value!r}") from exc
 
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Return cached settings to avoid re-reading environment on each request."""
 
+    from dotenv import load_dotenv
+
     load_dotenv()
     return Settings.from_env()
 
@@ -56,21 +155,205 @@ def get_settings() -> Settings:
 def get_supabase_client() -> Client:
     """Instantiate the Supabase client once per process."""
 
+    from supabase import create_client
+
     settings = get_settings()
     return create_client(settings.supabase_url, settings.supabase_service_key)
 
 
+def get_supabase_circuit_breaker() -> CircuitBreaker:
+    """Process-wide breaker shared by every Supabase adapter, sync and async."""
+
+    from src.infrastructure.supabase_common import SUPABASE_BREAKER
+
+    settings = get_settings()
+    return circuit_breaker(
+        SUPABASE_BREAKER,
+        failure_threshold=settings.breaker_failure_threshold,
+        reset_timeout=settings.breaker_reset_timeout,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_published_cache() -> PublishedMatchesCache:
+    """Process-wide cache of known publications shared by every publisher instance."""
+
+    return PublishedMatchesCache()
+
+
+@lru_cache(maxsize=1)
+def get_local_backend() -> tuple[ShotsStorage, MatchesIndexRepository]:
+    """Process-wide adapters of the ``local`` or ``memory`` backend, shared by sync and async publishers."""
+
+    settings = get_settings()
+    if settings.storage_backend == "memory":
+        return InMemoryShotsStorage(), InMemoryMatchesIndexRepository()
+    return (
+        LocalFileStorageAdapter(root=settings.local_storage_dir),
+        SqliteMatchesIndexRepository(path=settings.sqlite_index_path),
+    )
+
+
+def close_local_backend() -> None:
+    """Close the SQLite index, if it was ever opened (app shutdown hook)."""
+
+    if get_local_backend.cache_info().currsize:
+        _, database = get_local_backend()
+        if isinstance(database, SqliteMatchesIndexRepository):
+            database.close()
+        get_local_backend.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_index_writer() -> WriteBehindMatchesIndex:
+    """Process-wide write-behind indexer over the configured backend's blocking index adapter."""
+
+    settings = get_settings()
+    if settings.storage_backend == "supabase":
+        from src.infrastructure.supabase import SupabaseMatchesIndexRepository
+
+        repository: MatchesIndexRepository = SupabaseMatchesIndexRepository(
+            client=get_supabase_client(),
+            breaker=get_supabase_circuit_breaker(),
+        )
+    else:
+        _, repository = get_local_backend()
+    return WriteBehindMatchesIndex(
+        repository,
+        max_batch=settings.index_flush_size,
+        max_delay=settings.index_flush_interval,
+        journal_path=settings.index_journal_path,
+    )
+
+
+def close_index_writer() -> None:
+    """Flush pending index records and stop the writer, if it was ever started (app shutdown hook)."""
+
+    if get_index_writer.cache_info().currsize:
+        get_index_writer().close()
+        get_index_writer.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_matches_replica() -> MatchesIndexReplica:
+    """Process-wide read replica of matches_index, refreshed in the background."""
+
+    settings = get_settings()
+    source: MatchesIndexSource
+    if settings.index_write_behind:
+        # Incluye lo pendiente de volcar: lo publicado por este proceso aparece en el siguiente refresco.
+        source = get_index_writer()
+    elif settings.storage_backend == "supabase":
+        from src.infrastructure.supabase import SupabaseMatchesIndexRepository
+
+        source = SupabaseMatchesIndexRepository(
+            client=get_supabase_client(),
+            breaker=get_supabase_circuit_breaker(),
+        )
+    else:
+        _, source = get_local_backend()  # type: ignore[assignment]
+    replica = MatchesIndexReplica(source, refresh_interval=settings.replica_refresh_interval)
+    replica.start()
+    return replica
+
+
+def close_matches_replica() -> None:
+    """Stop the replica refresh thread, if it was ever started (app shutdown hook)."""
+
+    if get_matches_replica.cache_info().currsize:
+        get_matches_replica().close()
+        get_matches_replica.cache_clear()
+
+
+def get_shots_storage() -> ShotsStorage:
+    """Blocking storage adapter of the configured backend (publishers, rollups, CLIs)."""
+
+    settings = get_settings()
+    if settings.storage_backend == "supabase":
+        from src.infrastructure.supabase import SupabaseStorageAdapter
+
+        return SupabaseStorageAdapter(
+            client=get_supabase_client(),
+            bucket=settings.supabase_bucket,
+            breaker=get_supabase_circuit_breaker(),
+        )
+    storage, _ = get_local_backend()
+    return storage
+
+
 def get_shots_publisher() -> ShotsPublisher:
     """Provide a configured ShotsPublisher for dependency injection."""
 
     settings = get_settings()
-    client = get_supabase_client()
+    storage = get_shots_storage()
+    if settings.storage_backend == "supabase":
+        from src.infrastructure.supabase import SupabaseMatchesIndexRepository
 
-    storage = SupabaseStorageAdapter(client=client, bucket=settings.supabase_bucket)
-    database = SupabaseMatchesIndexRepository(client=client)
+        database: MatchesIndexRepository = SupabaseMatchesIndexRepository(
+            client=get_supabase_client(),
+            breaker=get_supabase_circuit_breaker(),
+        )
+    else:
+        _, database = get_local_backend()
+    if settings.index_write_behind:
+        database = get_index_writer()
 
     return ShotsPublisher(
         storage=storage,
         database=database,
         bucket=settings.supabase_bucket,
+        skip_unchanged=settings.skip_unchanged,
+        published_cache=get_published_cache(),
+        content_encoding=settings.content_encoding,
+        retry_policy=settings.retry_policy,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_supabase_http_client() -> httpx.AsyncClient:
+    """Instantiate the pooled async HTTP client once per process."""
+
+    from src.infrastructure.supabase_async import create_supabase_http_client
+
+    settings = get_settings()
+    return create_supabase_http_client(
+        url=settings.supabase_url,
+        service_key=settings.supabase_service_key,
+    )
+
+
+async def close_supabase_http_client() -> None:
+    """Close the pooled async client, if it was ever created (app shutdown hook)."""
+
+    if get_supabase_http_client.cache_info().currsize:
+        await get_supabase_http_client().aclose()
+        get_supabase_http_client.cache_clear()
+
+
+def get_async_shots_publisher() -> AsyncShotsPublisher:
+    """Provide an AsyncShotsPublisher backed by the shared async HTTP client (or the local backend)."""
+
+    settings = get_settings()
+    if settings.storage_backend == "supabase":
+        from src.infrastructure.supabase_async import AsyncSupabaseMatchesIndexRepository, AsyncSupabaseStorageAdapter
+
+        client = get_supabase_http_client()
+        breaker = get_supabase_circuit_breaker()
+        storage = AsyncSupabaseStorageAdapter(client=client, bucket=settings.supabase_bucket, breaker=breaker)
+        database = AsyncSupabaseMatchesIndexRepository(client=client, breaker=breaker)
+    else:
+        sync_storage, sync_database = get_local_backend()
+        storage = ThreadedShotsStorage(sync_storage)
+        database = ThreadedMatchesIndexRepository(sync_database)
+    if settings.index_write_behind:
+        database = ThreadedMatchesIndexRepository(get_index_writer())
+
+    return AsyncShotsPublisher(
+        storage=storage,
+        database=database,
+        bucket=settings.supabase_bucket,
+        skip_unchanged=settings.skip_unchanged,
+        published_cache=get_published_cache(),
+        content_encoding=settings.content_encoding,
+        retry_policy=settings.retry_policy,
     )
@@ -0,0 +1,69 @@
+"""NDJSON helpers for streaming request and response bodies."""
+from __future__ import annotations
+
+from typing import AsyncIterable, AsyncIterator
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming response that leaves ``receive`` to the endpoint.
+
+    Starlette's StreamingResponse listens for ``http.disconnect`` on ``receive`` for ASGI
+    servers older than spec 2.4, which would swallow request body chunks that the endpoint
+    is still reading. Here the request body is consumed while results stream back, and a
+    client disconnect surfaces as ``ClientDisconnect`` from ``Request.stream()`` instead.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes],
+    *,
+    max_line_bytes: int,
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Split a byte stream into ``(line_number, line)`` pairs without buffering the body.
+
+    Line numbers start at 1 and count every line, blank ones included. A line longer than
+    ``max_line_bytes`` is discarded as it arrives and reported as ``None``, so a single
+    oversized item cannot make memory grow with the upload.
+    """
+
+    buffer = bytearray()
+    oversized = False
+    line_number = 0
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+
+            line_number += 1
+            if oversized or len(buffer) + end - start > max_line_bytes:
+                yield line_number, None
+            else:
+                buffer += chunk[start:end]
+                yield line_number, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+
+    if buffer or oversized:
+        yield line_number + 1, None if oversized else bytes(buffer)
@@ -1,9 +1,11 @@
 """Pydantic schemas for the public HTTP API."""
 from __future__ import annotations
 
+from collections import Counter
 from datetime import datetime
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from src.models.schemas import ShotsResponse
 
@@ -24,3 +26,74 @@ class PublishShotsResponse(BaseModel):
     checksum: str
     size_bytes: int
     uploaded_at: datetime
+    skipped: bool = Field(False, description="True si el contenido ya estaba publicado y no se subió de nuevo")
+
+
+class PublishShotsBatchRequest(BaseModel):
+    """Request body for publishing several shots files in one call."""
+
+    items: List[PublishShotsRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Partidos a publicar; cada elemento se procesa de forma independiente",
+    )
+
+    @field_validator("items")
+    @classmethod
+    def _reject_repeated_match_ids(cls, items: List[PublishShotsRequest]) -> List[PublishShotsRequest]:
+        counts = Counter(item.match_id for item in items)
+        repeated = sorted(match_id for match_id, count in counts.items() if count > 1)
+        if repeated:
+            raise ValueError(f"match_id repetido en el lote: {', '.join(repeated)}")
+        return items
+
+
+class PublishShotsBatchItem(BaseModel):
+    """Outcome of a single item inside a batch publication."""
+
+    match_id: str
+    storage_path: str
+    status_code: int = Field(..., description="Código HTTP equivalente a publicar el elemento por separado")
+    result: Optional[PublishShotsResponse] = None
+    detail: Optional[str] = None
+
+
+class PublishShotsBatchResponse(BaseModel):
+    """Response returned after a batch publication, in the same order as the request."""
+
+    published: int
+    failed: int
+    items: List[PublishShotsBatchItem]
+
+
+class PublishShotsStreamItem(BaseModel):
+    """One NDJSON result line of a streamed publication, emitted as soon as the item finishes."""
+
+    line: int = Field(..., description="Número de línea (desde 1) del elemento en el cuerpo NDJSON")
+    match_id: Optional[str] = None
+    storage_path: Optional[str] = None
+    status_code: int = Field(..., description="Código HTTP equivalente a publicar el elemento por separado")
+    result: Optional[PublishShotsResponse] = None
+    detail: Optional[str] = None
+
+
+class MatchIndexItem(BaseModel):
+    """One row of matches_index as served by the read replica."""
+
+    id: str
+    date: datetime
+    home: str
+    away: str
+    storage_path: str
+    size_bytes: int
+    checksum: str
+    raw_size_bytes: Optional[int] = None
+    content_encoding: Optional[str] = None
+
+
+class MatchesListResponse(BaseModel):
+    """One page of matches, newest first."""
+
+    items: List[MatchIndexItem]
+    next_cursor: Optional[str] = Field(None, description="Cursor de la página siguiente; null en la última")
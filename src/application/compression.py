@@ -0,0 +1,78 @@
+"""Content encodings for stored shots objects.
+
+Checksums are always computed over the canonical uncompressed JSON; the encoding only
+changes the bytes handed to the storage port. Compressed objects are stored with the
+media type of the compressed format (``application/gzip``, ``application/zstd``) and no
+``Content-Encoding``, so no HTTP client decodes them behind the caller's back; the
+encoding is recorded only in ``matches_index``. ``zstd`` needs the optional ``zstandard``
+package and is imported lazily.
+"""
+from __future__ import annotations
+
+import gzip
+from typing import Any
+
+GZIP = "gzip"
+ZSTD = "zstd"
+SUPPORTED_ENCODINGS = (GZIP, ZSTD)
+
+_IDENTITY_NAMES = {"", "none", "identity"}
+_DEFAULT_LEVELS = {GZIP: 6, ZSTD: 3}
+_CONTENT_TYPES = {GZIP: "application/gzip", ZSTD: "application/zstd"}
+
+
+def resolve_content_encoding(name: str | None) -> str | None:
+    """Normalize a configured encoding name; ``None``/``identity`` mean no compression."""
+
+    if name is None:
+        return None
+    normalized = name.strip().lower()
+    if normalized in _IDENTITY_NAMES:
+        return None
+    if normalized not in SUPPORTED_ENCODINGS:
+        raise ValueError(
+            f"Codificación no soportada: {name!r} (usa {', '.join(SUPPORTED_ENCODINGS)} o 'identity')"
+        )
+    if normalized == ZSTD:
+        _zstandard()
+    return normalized
+
+
+def stored_content_type(content_type: str, encoding: str | None) -> str:
+    """Content-Type of the stored object: the compressed format's, if ``encoding`` is set."""
+
+    if encoding is None:
+        return content_type
+    try:
+        return _CONTENT_TYPES[encoding]
+    except KeyError:
+        raise ValueError(f"Codificación no soportada: {encoding!r}") from None
+
+
+def compress(data: bytes, encoding: str, *, level: int | None = None) -> bytes:
+    """Compress ``data`` deterministically (gzip without mtime, zstd without frame timestamps)."""
+
+    level = _DEFAULT_LEVELS[encoding] if level is None else level
+    if encoding == GZIP:
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == ZSTD:
+        return _zstandard().ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Codificación no soportada: {encoding!r}")
+
+
+def decompress(data: bytes, encoding: str | None) -> bytes:
+    if encoding is None:
+        return data
+    if encoding == GZIP:
+        return gzip.decompress(data)
+    if encoding == ZSTD:
+        return _zstandard().ZstdDecompressor().decompress(data)
+    raise ValueError(f"Codificación no soportada: {encoding!r}")
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as exc:  # pragma: no cover - depende del entorno
+        raise RuntimeError("La codificación zstd requiere el paquete opcional 'zstandard'") from exc
+    return zstandard
@@ -0,0 +1,277 @@
+"""Local, periodically refreshed read replica of the ``matches_index`` rows.
+
+:class:`MatchesIndexReplica` loads every row through a :class:`MatchesIndexSource` (one full
+scan per refresh) and keeps an immutable snapshot with three in-memory indexes: by ``id``,
+by match date and by team (home or away, case-insensitive). Listings and lookups are
+answered from the snapshot only, so read traffic never reaches the backing database; the
+data is at most ``refresh_interval`` seconds old.
+
+Listings are ordered newest match first and paginated with an opaque keyset cursor (the
+date and id of the last row returned), so pages stay stable when the replica refreshes
+between two requests. :attr:`MatchesIndexReplica.version` changes only when the content of
+the index does, which makes it a cheap validator for HTTP ETags.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import logging
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from hashlib import sha256
+from typing import Any, Callable, Iterable, Protocol
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SECONDS = 60.0
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class MatchesIndexSource(Protocol):
+    """Port to scan every ``matches_index`` row (implemented by the index adapters)."""
+
+    def list_match_indexes(self) -> list[dict[str, Any]]:  # pragma: no cover - protocol
+        ...
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass(frozen=True)
+class MatchIndexEntry:
+    """One ``matches_index`` row as served by the replica."""
+
+    id: str
+    date: datetime
+    home: str
+    away: str
+    storage_path: str
+    size_bytes: int
+    checksum: str
+    raw_size_bytes: int | None = None
+    content_encoding: str | None = None
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> "MatchIndexEntry":
+        return cls(
+            id=str(record["id"]),
+            date=_as_datetime(record["date"]),
+            home=str(record["home"]),
+            away=str(record["away"]),
+            storage_path=str(record["storage_path"]),
+            size_bytes=int(record["size_bytes"]),
+            checksum=str(record["checksum"]),
+            raw_size_bytes=record.get("raw_size_bytes"),
+            content_encoding=record.get("content_encoding"),
+        )
+
+    @property
+    def sort_key(self) -> tuple[datetime, str]:
+        return (self.date, self.id)
+
+
+@dataclass(frozen=True)
+class MatchesPage:
+    """One page of a listing plus the cursor of the next page (``None`` on the last one)."""
+
+    items: list[MatchIndexEntry]
+    next_cursor: str | None
+    version: str
+
+
+class _SortedEntries:
+    """Entries in ascending ``(date, id)`` order with the keys needed to bisect them."""
+
+    __slots__ = ("entries", "keys", "dates")
+
+    def __init__(self, entries: Iterable[MatchIndexEntry]) -> None:
+        self.entries = sorted(entries, key=lambda entry: entry.sort_key)
+        self.keys = [entry.sort_key for entry in self.entries]
+        self.dates = [entry.date for entry in self.entries]
+
+    def page(
+        self,
+        *,
+        since: datetime | None,
+        until: datetime | None,
+        after: tuple[datetime, str] | None,
+        limit: int,
+    ) -> tuple[list[MatchIndexEntry], bool]:
+        # Se recorre hacia atrás desde el final de la ventana: más recientes primero.
+        stop = bisect_left(self.dates, until) if until is not None else len(self.entries)
+        if after is not None:
+            stop = min(stop, bisect_left(self.keys, after))
+        start = bisect_left(self.dates, since) if since is not None else 0
+        first = max(start, stop - limit)
+        return self.entries[first:stop][::-1], first > start
+
+
+class _Snapshot:
+    __slots__ = ("by_id", "by_date", "by_team", "version", "loaded_at")
+
+    def __init__(self, entries: list[MatchIndexEntry], *, version: str, loaded_at: datetime) -> None:
+        self.by_id = {entry.id: entry for entry in entries}
+        self.by_date = _SortedEntries(self.by_id.values())
+        teams: dict[str, list[MatchIndexEntry]] = {}
+        for entry in self.by_id.values():
+            for team in {team_key(entry.home), team_key(entry.away)}:
+                teams.setdefault(team, []).append(entry)
+        self.by_team = {team: _SortedEntries(team_entries) for team, team_entries in teams.items()}
+        self.version = version
+        self.loaded_at = loaded_at
+
+
+class MatchesIndexReplica:
+    """In-memory, read-only copy of ``matches_index`` refreshed in a background thread."""
+
+    def __init__(
+        self,
+        source: MatchesIndexSource,
+        *,
+        refresh_interval: float = DEFAULT_REFRESH_SECONDS,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        self._source = source
+        self._refresh_interval = max(0.1, refresh_interval)
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._snapshot: _Snapshot | None = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -- ciclo de vida ----------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background refresh thread (the first load happens on first use)."""
+
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="matches-index-replica", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh(self) -> bool:
+        """Reload every row from the source; return ``True`` if the content changed."""
+
+        with self._refresh_lock:
+            started = time.perf_counter()
+            entries = [MatchIndexEntry.from_record(record) for record in self._source.list_match_indexes()]
+            version = _version_of(entries)
+            current = self._snapshot
+            if current is not None and current.version == version:
+                current.loaded_at = self._clock()
+                return False
+            self._snapshot = _Snapshot(entries, version=version, loaded_at=self._clock())
+        logger.info(
+            "Réplica de matches_index actualizada",
+            extra={"rows": len(entries), "seconds": round(time.perf_counter() - started, 3)},
+        )
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Se sigue sirviendo la última copia buena hasta el siguiente intento.
+                logger.exception("Error refrescando la réplica de matches_index")
+
+    # -- lecturas ---------------------------------------------------------------------
+
+    @property
+    def version(self) -> str:
+        return self._current().version
+
+    @property
+    def loaded_at(self) -> datetime:
+        return self._current().loaded_at
+
+    def __len__(self) -> int:
+        return len(self._current().by_id)
+
+    def get(self, match_id: str) -> MatchIndexEntry | None:
+        return self._current().by_id.get(str(match_id))
+
+    def list_matches(
+        self,
+        *,
+        team: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> MatchesPage:
+        """Matches newest first, optionally of one ``team`` and played in ``[since, until)``."""
+
+        snapshot = self._current()
+        limit = min(max(1, limit), MAX_PAGE_SIZE)
+        if team is not None:
+            sorted_entries = snapshot.by_team.get(team_key(team))
+            if sorted_entries is None:
+                return MatchesPage(items=[], next_cursor=None, version=snapshot.version)
+        else:
+            sorted_entries = snapshot.by_date
+        items, has_more = sorted_entries.page(
+            since=_as_datetime(since) if since is not None else None,
+            until=_as_datetime(until) if until is not None else None,
+            after=decode_cursor(cursor) if cursor else None,
+            limit=limit,
+        )
+        next_cursor = encode_cursor(items[-1]) if has_more and items else None
+        return MatchesPage(items=items, next_cursor=next_cursor, version=snapshot.version)
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Primera lectura: carga síncrona (los errores llegan al llamador).
+            self.refresh()
+            snapshot = self._snapshot
+        assert snapshot is not None
+        return snapshot
+
+
+def team_key(team: str) -> str:
+    return " ".join(team.split()).casefold()
+
+
+def encode_cursor(entry: MatchIndexEntry) -> str:
+    raw = f"{entry.date.isoformat()}|{entry.id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        date, match_id = raw.split("|", 1)
+        return (_as_datetime(date), match_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Cursor de paginación inválido") from exc
+
+
+def _as_datetime(value: Any) -> datetime:
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _version_of(entries: list[MatchIndexEntry]) -> str:
+    digest = sha256()
+    for entry in sorted(entries, key=lambda item: item.id):
+        digest.update(
+            f"{entry.id}\x1f{entry.date.isoformat()}\x1f{entry.home}\x1f{entry.away}\x1f"
+            f"{entry.storage_path}\x1f{entry.checksum}\x1f{entry.size_bytes}\x1f"
+            f"{entry.raw_size_bytes}\x1f{entry.content_encoding}\x1e".encode("utf-8")
+        )
+    return digest.hexdigest()
@@ -0,0 +1,405 @@
+"""Use case for normalizing raw SofaScore event/shots dumps into ShotsResponse files."""
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache, partial
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Sequence
+
+from src.application.raw_archive import EVENT, SHOTS, RawArchive, RecordLocation
+from src.mapping.sofa_mapper_fc import MAPPER_VERSION, map_event_to_contract
+from src.models.schemas import ShotsResponse
+from src.observability.profiling import collect_stages, merge_stages, profiling_enabled, stage
+
+
+_EVENT_FILE_RE = re.compile(r"^event_(?P<match_id>.+)\.json$")
+
+DEFAULT_STATE_FILENAME = ".normalize_state.json"
+
+
+@dataclass(frozen=True)
+class MatchInputPair:
+    """Raw event file and its shots file for a single match.
+
+    With ``archive`` set, both documents are read from that :class:`RawArchive` by
+    ``match_id``. The paths then only name the records, in reports and in the
+    incremental state.
+    """
+
+    event_path: Path
+    shots_path: Path
+    archive: Path | None = None
+    match_id: str | None = None
+
+
+@dataclass(frozen=True)
+class InputFingerprint:
+    """Content hashes (plus a cheap size/mtime shortcut) of an input pair and the mapper version."""
+
+    event_sha256: str
+    shots_sha256: str
+    event_stat: tuple[int, int]
+    shots_stat: tuple[int, int]
+    mapper_version: str = MAPPER_VERSION
+
+
+@dataclass(frozen=True)
+class NormalizationOutcome:
+    """Result for one input pair; exactly one of output_path/error is set."""
+
+    pair: MatchInputPair
+    output_path: Path | None = None
+    error: str | None = None
+    skipped: bool = False
+    fingerprint: InputFingerprint | None = None
+    # Segundos por etapa medidos en un proceso worker de una ejecución perfilada.
+    timings: dict[str, float] | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class NormalizationReport:
+    """Summary of a batch normalization run."""
+
+    outcomes: list[NormalizationOutcome] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> list[NormalizationOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.ok]
+
+    @property
+    def failed(self) -> list[NormalizationOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+    @property
+    def skipped(self) -> list[NormalizationOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.skipped]
+
+    @property
+    def throughput(self) -> float:
+        """Processed pairs per second (successes and failures)."""
+
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.outcomes) / self.elapsed_seconds
+
+
+class NormalizationState:
+    """On-disk record of the inputs each output was built from, used by incremental runs.
+
+    Entries are keyed by event path. A pair is unchanged when the mapper version matches,
+    the output still exists and either the size/mtime of both inputs or, failing that,
+    their sha256 match the stored fingerprint.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, entries: dict[str, dict[str, Any]] | None = None) -> None:
+        self.path = path
+        self._entries = entries or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "NormalizationState":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls(path)
+        except ValueError:
+            # Estado corrupto: se reconstruye desde cero en lugar de abortar.
+            return cls(path)
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return cls(path)
+        return cls(path, dict(data.get("entries") or {}))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(
+            json.dumps({"version": self.VERSION, "entries": self._entries}, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+
+    def unchanged_output(self, pair: MatchInputPair) -> Path | None:
+        """Return the previous output path if ``pair`` needs no work, else ``None``."""
+
+        entry = self._entries.get(self._key(pair))
+        if not entry or entry.get("mapper_version") != MAPPER_VERSION:
+            return None
+        if entry.get("shots_path") != str(pair.shots_path):
+            return None
+        output_path = Path(entry["output_path"])
+        if not output_path.exists():
+            return None
+
+        try:
+            event_stat = _input_signature(pair, EVENT)
+            shots_stat = _input_signature(pair, SHOTS)
+        except (OSError, KeyError):
+            return None
+        if [*event_stat] == entry.get("event_stat") and [*shots_stat] == entry.get("shots_stat"):
+            return output_path
+
+        # size/mtime cambiaron (p.ej. copia o touch): comparar contenido antes de reprocesar
+        try:
+            if (
+                _input_sha256(pair, EVENT) != entry.get("event_sha256")
+                or _input_sha256(pair, SHOTS) != entry.get("shots_sha256")
+            ):
+                return None
+        except (OSError, KeyError):
+            return None
+        entry["event_stat"] = [*event_stat]
+        entry["shots_stat"] = [*shots_stat]
+        return output_path
+
+    def record(self, pair: MatchInputPair, output_path: Path, fingerprint: InputFingerprint) -> None:
+        entry = asdict(fingerprint)
+        entry["event_stat"] = [*fingerprint.event_stat]
+        entry["shots_stat"] = [*fingerprint.shots_stat]
+        entry["shots_path"] = str(pair.shots_path)
+        entry["output_path"] = str(output_path)
+        self._entries[self._key(pair)] = entry
+
+    @staticmethod
+    def _key(pair: MatchInputPair) -> str:
+        return str(pair.event_path)
+
+
+def normalize_pair(pair: MatchInputPair, out_dir: Path) -> Path:
+    """Map, validate and persist one match; returns the written ``match_<id>.json`` path."""
+
+    output_path, _ = _normalize_pair_with_fingerprint(pair, out_dir)
+    return output_path
+
+
+def _normalize_pair_with_fingerprint(pair: MatchInputPair, out_dir: Path) -> tuple[Path, InputFingerprint]:
+    with stage("read_inputs"):
+        event_bytes, event_stat = _read_input(pair, EVENT)
+        shots_bytes, shots_stat = _read_input(pair, SHOTS)
+
+    with stage("parse_json"):
+        event = json.loads(event_bytes)
+        shots = json.loads(shots_bytes)
+
+    with stage("map"):
+        normalized = map_event_to_contract(event, shots)
+    with stage("validate"):
+        model = ShotsResponse.model_validate(normalized)
+
+    with stage("write_output"):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / f"match_{model.partido.idPartido}.json"
+        out_path.write_text(json.dumps(normalized, ensure_ascii=False, indent=2), encoding="utf-8")
+    with stage("fingerprint"):
+        fingerprint = InputFingerprint(
+            event_sha256=sha256(event_bytes).hexdigest(),
+            shots_sha256=sha256(shots_bytes).hexdigest(),
+            event_stat=event_stat,
+            shots_stat=shots_stat,
+        )
+    return out_path, fingerprint
+
+
+def discover_pairs(raw_dir: Path) -> list[MatchInputPair]:
+    """Pair every ``event_<id>.json`` in ``raw_dir`` with its ``shots_<id>.json``.
+
+    Events without a shots file are still returned so the missing file is reported as a
+    per-match error instead of being silently dropped.
+    """
+
+    pairs = []
+    for event_path in sorted(raw_dir.glob("event_*.json")):
+        match = _EVENT_FILE_RE.match(event_path.name)
+        if match is None:  # pragma: no cover - el glob ya filtra
+            continue
+        shots_path = event_path.with_name(f"shots_{match.group('match_id')}.json")
+        pairs.append(MatchInputPair(event_path=event_path, shots_path=shots_path))
+    return pairs
+
+
+def archive_pair(archive_root: Path, match_id: str) -> MatchInputPair:
+    """Input pair of one match stored in a :class:`RawArchive`."""
+
+    _open_archive(archive_root).refresh()
+    return _archive_pair(archive_root, str(match_id))
+
+
+def discover_archive_pairs(archive_root: Path) -> list[MatchInputPair]:
+    """One pair per match with an event record in the archive, in write order.
+
+    As with :func:`discover_pairs`, a missing shots record is reported as a per-match error.
+    """
+
+    archive = _open_archive(archive_root)
+    archive.refresh()
+    return [_archive_pair(archive_root, match_id) for match_id in archive.match_ids(EVENT)]
+
+
+def load_manifest(manifest_path: Path) -> list[MatchInputPair]:
+    """Read a JSON manifest: a list of ``{"event": ..., "shots": ...}`` objects.
+
+    Relative paths are resolved against the manifest's directory.
+    """
+
+    entries = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if not isinstance(entries, list):
+        raise ValueError("El manifiesto debe ser una lista de objetos {'event', 'shots'}")
+
+    base_dir = manifest_path.parent
+    pairs = []
+    for position, entry in enumerate(entries):
+        try:
+            event_path = Path(entry["event"])
+            shots_path = Path(entry["shots"])
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Entrada {position} del manifiesto inválida: {entry!r}") from exc
+        pairs.append(
+            MatchInputPair(
+                event_path=event_path if event_path.is_absolute() else base_dir / event_path,
+                shots_path=shots_path if shots_path.is_absolute() else base_dir / shots_path,
+            )
+        )
+    return pairs
+
+
+def normalize_many(
+    pairs: Sequence[MatchInputPair],
+    out_dir: Path,
+    *,
+    workers: int | None = None,
+    incremental: bool = False,
+    state_path: Path | None = None,
+) -> NormalizationReport:
+    """Normalize all pairs in one process tree, collecting per-pair errors.
+
+    With ``workers`` > 1 the pairs are spread across a ``ProcessPoolExecutor``; with a
+    single worker everything runs inline, which avoids the pool start-up cost.
+
+    With ``incremental`` the :class:`NormalizationState` stored at ``state_path`` (by
+    default ``out_dir/.normalize_state.json``) is consulted first and pairs whose inputs
+    and mapper version are unchanged are skipped without being parsed.
+    """
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    started = time.perf_counter()
+
+    state = NormalizationState.load(state_path or out_dir / DEFAULT_STATE_FILENAME) if incremental else None
+    outcomes: list[NormalizationOutcome | None] = [None] * len(pairs)
+    pending: list[int] = []
+    for position, pair in enumerate(pairs):
+        with stage("incremental_check"):
+            previous_output = state.unchanged_output(pair) if state is not None else None
+        if previous_output is not None:
+            outcomes[position] = NormalizationOutcome(pair=pair, output_path=previous_output, skipped=True)
+        else:
+            pending.append(position)
+
+    pending_pairs = [pairs[position] for position in pending]
+    if workers == 1 or len(pending_pairs) <= 1:
+        results = list(map(partial(_normalize_safely, out_dir=out_dir), pending_pairs))
+    else:
+        # Los workers no ven el perfil del proceso padre: devuelven sus tiempos por etapa.
+        task = partial(_normalize_safely, out_dir=out_dir, collect_timings=profiling_enabled())
+        chunksize = max(1, len(pending_pairs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending_pairs))) as executor:
+            results = list(executor.map(task, pending_pairs, chunksize=chunksize))
+
+    for position, outcome in zip(pending, results):
+        outcomes[position] = outcome
+        if outcome.timings:
+            merge_stages(outcome.timings)
+        if state is not None and outcome.ok and outcome.fingerprint is not None:
+            state.record(outcome.pair, outcome.output_path, outcome.fingerprint)
+
+    if state is not None:
+        with stage("save_state"):
+            state.save()
+
+    return NormalizationReport(
+        outcomes=[outcome for outcome in outcomes if outcome is not None],
+        elapsed_seconds=time.perf_counter() - started,
+    )
+
+
+def _normalize_safely(pair: MatchInputPair, *, out_dir: Path, collect_timings: bool = False) -> NormalizationOutcome:
+    if collect_timings:
+        with collect_stages() as timer:
+            outcome = _normalize_safely(pair, out_dir=out_dir)
+        return replace(outcome, timings=timer.totals())
+    try:
+        output_path, fingerprint = _normalize_pair_with_fingerprint(pair, out_dir)
+    except Exception as exc:
+        return NormalizationOutcome(pair=pair, error=f"{type(exc).__name__}: {exc}")
+    return NormalizationOutcome(pair=pair, output_path=output_path, fingerprint=fingerprint)
+
+
+def _archive_pair(archive_root: Path, match_id: str) -> MatchInputPair:
+    return MatchInputPair(
+        event_path=archive_root / f"event_{match_id}.json",
+        shots_path=archive_root / f"shots_{match_id}.json",
+        archive=archive_root,
+        match_id=match_id,
+    )
+
+
+@lru_cache(maxsize=8)
+def _open_archive(root: Path) -> RawArchive:
+    # Uno por proceso (también en cada worker): los segmentos se mapean una sola vez.
+    return RawArchive(root)
+
+
+def _read_input(pair: MatchInputPair, kind: str) -> tuple[bytes, tuple[int, int]]:
+    if pair.archive is not None:
+        archive = _open_archive(pair.archive)
+        location = archive.location(kind, pair.match_id)
+        if location is None:
+            raise KeyError(f"{kind}_{pair.match_id} no está en el archivo {pair.archive}")
+        return archive.read(location), _location_signature(location)
+    path = pair.event_path if kind == EVENT else pair.shots_path
+    # stat antes de leer: si el fichero cambia entre medias, la próxima ejecución lo rehashea
+    signature = _stat_signature(path)
+    return path.read_bytes(), signature
+
+
+def _input_signature(pair: MatchInputPair, kind: str) -> tuple[int, int]:
+    if pair.archive is not None:
+        location = _open_archive(pair.archive).location(kind, pair.match_id)
+        if location is None:
+            raise KeyError(f"{kind}_{pair.match_id}")
+        return _location_signature(location)
+    return _stat_signature(pair.event_path if kind == EVENT else pair.shots_path)
+
+
+def _input_sha256(pair: MatchInputPair, kind: str) -> str:
+    if pair.archive is not None:
+        return sha256(_open_archive(pair.archive).get_bytes(kind, pair.match_id)).hexdigest()
+    return _file_sha256(pair.event_path if kind == EVENT else pair.shots_path)
+
+
+def _location_signature(location: RecordLocation) -> tuple[int, int]:
+    # Equivale a size/mtime: reescribir un registro lo mueve a otra posición del archivo.
+    return location.length, (location.segment << 40) | location.offset
+
+
+def _stat_signature(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _file_sha256(path: Path) -> str:
+    digest = sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,342 @@
+"""Export normalized shots to a Parquet dataset partitioned by competition and season.
+
+The dataset uses hive-style directories, one file per partition::
+
+    <root>/competicion=<competition>/temporada=<season>/shots.parquet
+
+Each row is one :class:`Disparo` plus the columns of its :class:`Partido` (``fecha`` is
+the parsed ``fechaISO`` as a UTC timestamp). Rows are sorted by ``fecha`` and
+``idPartido``, so date filters can skip whole row groups.
+
+Exporting merges by ``idPartido``. The rows of the given matches replace any earlier rows
+of the same matches, including rows left in another season of the same competition when a
+match moves season (a corrected date, or an explicit ``season``). Partitions that hold none
+of the given matches are not rewritten, and neither is a partition whose rows for them are
+already identical. A partition left without rows is deleted. Matches without shots produce
+no rows.
+
+``pyarrow`` is an optional dependency and is imported lazily.
+"""
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
+
+from src.application.season_rollups import SEASON_START_MONTH, season_of
+from src.models.schemas import ShotsResponse
+from src.models.shots_table import ShotsTable
+
+if TYPE_CHECKING:
+    import pyarrow
+
+
+PARTITION_FILENAME = "shots.parquet"
+PARTITION_KEYS = ("competicion", "temporada")
+MATCH_COLUMNS = ("idPartido", "fecha", "fechaISO", "local", "visitante", "goles_local", "goles_visitante")
+ROW_GROUP_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ParquetPartitionResult:
+    """Outcome of exporting the matches of one ``(competition, season)`` partition."""
+
+    competition: str
+    season: str
+    path: Path
+    matches: int
+    rows: int
+    updated_matches: int
+    skipped: bool = False
+
+
+def export_shots_parquet(
+    matches: Iterable[ShotsResponse],
+    root: str | Path,
+    *,
+    competition: str,
+    season: str | None = None,
+    season_start_month: int = SEASON_START_MONTH,
+    compression: str = "zstd",
+) -> list[ParquetPartitionResult]:
+    """Merge ``matches`` into the dataset under ``root``; one result per touched partition.
+
+    The season comes from each match date unless ``season`` is given.
+    """
+
+    root = Path(root)
+    by_season: dict[str, ShotsTable] = defaultdict(ShotsTable)
+    for shots in matches:
+        match_season = season or season_of(shots.partido.fechaISO, start_month=season_start_month)
+        by_season[match_season].append(shots)
+
+    season_ids = {
+        match_season: {partido.idPartido for partido in table.partidos} for match_season, table in by_season.items()
+    }
+    exported_ids = set().union(*season_ids.values())
+    results = [
+        _merge_partition(
+            root,
+            competition,
+            match_season,
+            table,
+            moved_ids=exported_ids - season_ids[match_season],
+            compression=compression,
+        )
+        for match_season, table in sorted(by_season.items())
+    ]
+
+    # Un partido que cambia de temporada no puede quedarse también en la anterior.
+    exported_paths = {result.path for result in results}
+    for path in _competition_partitions(root, competition):
+        if path not in exported_paths:
+            removed = _drop_matches(path, competition, exported_ids, compression=compression)
+            if removed is not None:
+                results.append(removed)
+    return results
+
+
+def read_shots_parquet(
+    root: str | Path,
+    *,
+    columns: Sequence[str] | None = None,
+    competition: str | None = None,
+    season: str | None = None,
+    date_from: date | datetime | None = None,
+    date_to: date | datetime | None = None,
+) -> "pyarrow.Table":
+    """Load only the requested columns and rows of the dataset.
+
+    Partition filters skip whole directories and date filters skip row groups using
+    the Parquet statistics. Both ``date_from`` and ``date_to`` are inclusive; a plain
+    ``date`` as ``date_to`` covers that whole day (UTC). Call ``.to_pandas()`` on the
+    result for a DataFrame.
+    """
+
+    pa, _, ds = _pyarrow()
+    root = Path(root)
+    schema = _schema()
+    partition_schema = pa.schema([(key, pa.string()) for key in PARTITION_KEYS])
+    if not root.exists():
+        fields = [schema.field(name) for name in schema.names] + list(partition_schema)
+        empty = pa.schema(fields).empty_table()
+        return empty.select(list(columns)) if columns is not None else empty
+
+    dataset = ds.dataset(
+        root,
+        schema=pa.unify_schemas([schema, partition_schema]),
+        format="parquet",
+        partitioning=ds.partitioning(partition_schema, flavor="hive"),
+    )
+    conditions = []
+    if competition is not None:
+        conditions.append(ds.field("competicion") == _partition_value(competition))
+    if season is not None:
+        conditions.append(ds.field("temporada") == _partition_value(season))
+    if date_from is not None:
+        conditions.append(ds.field("fecha") >= pa.scalar(_as_utc(date_from), type=schema.field("fecha").type))
+    if date_to is not None:
+        if isinstance(date_to, datetime):
+            conditions.append(ds.field("fecha") <= pa.scalar(_as_utc(date_to), type=schema.field("fecha").type))
+        else:
+            end = _as_utc(date_to + timedelta(days=1))
+            conditions.append(ds.field("fecha") < pa.scalar(end, type=schema.field("fecha").type))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return dataset.to_table(columns=list(columns) if columns is not None else None, filter=expression)
+
+
+def partition_path(root: str | Path, competition: str, season: str) -> Path:
+    return (
+        Path(root)
+        / f"competicion={_partition_value(competition)}"
+        / f"temporada={_partition_value(season)}"
+        / PARTITION_FILENAME
+    )
+
+
+def shots_table_to_arrow(table: ShotsTable) -> "pyarrow.Table":
+    """Arrow table with one row per shot plus the match columns, in the dataset schema."""
+
+    pa, _, _ = _pyarrow()
+    match_values: dict[str, list[Any]] = {name: [] for name in MATCH_COLUMNS}
+    for index, partido in enumerate(table.partidos):
+        repeat = len(table.match_rows(index))
+        if not repeat:
+            continue
+        values = {
+            "idPartido": partido.idPartido,
+            "fecha": _parse_fecha(partido.fechaISO),
+            "fechaISO": partido.fechaISO,
+            "local": partido.local,
+            "visitante": partido.visitante,
+            "goles_local": partido.marcadorFinal.local,
+            "goles_visitante": partido.marcadorFinal.visitante,
+        }
+        for name, value in values.items():
+            match_values[name].extend([value] * repeat)
+
+    columns = {**match_values, **{name: values for name, values in table.to_columns().items() if name != "idPartido"}}
+    schema = _schema()
+    return pa.Table.from_pydict({name: columns[name] for name in schema.names}, schema=schema)
+
+
+def _merge_partition(
+    root: Path,
+    competition: str,
+    season: str,
+    table: ShotsTable,
+    *,
+    moved_ids: set[str],
+    compression: str,
+) -> ParquetPartitionResult:
+    pa, pc, _ = _pyarrow()
+    import pyarrow.parquet as pq
+
+    path = partition_path(root, competition, season)
+    match_ids = [partido.idPartido for partido in table.partidos]
+    new_rows = _sorted(shots_table_to_arrow(table))
+    id_set = pa.array(sorted(set(match_ids)), type=pa.string())
+    moved_set = pa.array(sorted(moved_ids), type=pa.string())
+
+    if path.exists():
+        existing = pq.read_table(path, schema=_schema())
+        replaced = existing.filter(pc.is_in(existing["idPartido"], value_set=id_set))
+        has_moved = pc.any(pc.is_in(existing["idPartido"], value_set=moved_set)).as_py()
+        if replaced.equals(new_rows) and not has_moved:
+            return ParquetPartitionResult(
+                competition=competition,
+                season=season,
+                path=path,
+                matches=len(set(existing["idPartido"].to_pylist())),
+                rows=existing.num_rows,
+                updated_matches=0,
+                skipped=True,
+            )
+        stale = pa.concat_arrays([id_set, moved_set])
+        kept = existing.filter(pc.invert(pc.is_in(existing["idPartido"], value_set=stale)))
+        merged = _sorted(pa.concat_tables([kept, new_rows]))
+    else:
+        merged = new_rows
+
+    _write_partition(path, merged, compression=compression)
+    return ParquetPartitionResult(
+        competition=competition,
+        season=season,
+        path=path,
+        matches=len(set(merged["idPartido"].to_pylist())),
+        rows=merged.num_rows,
+        updated_matches=len(set(match_ids)),
+    )
+
+
+def _drop_matches(
+    path: Path,
+    competition: str,
+    match_ids: set[str],
+    *,
+    compression: str,
+) -> ParquetPartitionResult | None:
+    """Remove ``match_ids`` from one partition; ``None`` if it held none of them."""
+
+    pa, pc, _ = _pyarrow()
+    import pyarrow.parquet as pq
+
+    id_set = pa.array(sorted(match_ids), type=pa.string())
+    # Primero solo la columna de ids: la mayoría de particiones no tienen nada que quitar.
+    stored_ids = pq.read_table(path, columns=["idPartido"])["idPartido"]
+    removed = pc.unique(stored_ids.filter(pc.is_in(stored_ids, value_set=id_set)))
+    if not len(removed):
+        return None
+
+    existing = pq.read_table(path, schema=_schema())
+    kept = existing.filter(pc.invert(pc.is_in(existing["idPartido"], value_set=id_set)))
+    _write_partition(path, kept, compression=compression)
+    return ParquetPartitionResult(
+        competition=competition,
+        season=path.parent.name.split("=", 1)[1],
+        path=path,
+        matches=len(set(kept["idPartido"].to_pylist())),
+        rows=kept.num_rows,
+        updated_matches=len(removed),
+    )
+
+
+def _write_partition(path: Path, table: "pyarrow.Table", *, compression: str) -> None:
+    import pyarrow.parquet as pq
+
+    if not table.num_rows:
+        # Sin filas no se deja un fichero vacío: la partición desaparece.
+        path.unlink(missing_ok=True)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    pq.write_table(table, tmp_path, compression=compression, row_group_size=ROW_GROUP_SIZE)
+    # Como en el backend local: los lectores nunca ven un fichero a medias.
+    os.replace(tmp_path, path)
+
+
+def _competition_partitions(root: Path, competition: str) -> list[Path]:
+    return sorted((root / f"competicion={_partition_value(competition)}").glob(f"temporada=*/{PARTITION_FILENAME}"))
+
+
+def _sorted(table: "pyarrow.Table") -> "pyarrow.Table":
+    # La ordenación de Arrow es estable: los disparos conservan su orden dentro del partido.
+    return table.sort_by([("fecha", "ascending"), ("idPartido", "ascending")])
+
+
+def _schema() -> "pyarrow.Schema":
+    pa, _, _ = _pyarrow()
+    return pa.schema(
+        [
+            ("idPartido", pa.string()),
+            ("fecha", pa.timestamp("us", tz="UTC")),
+            ("fechaISO", pa.string()),
+            ("local", pa.string()),
+            ("visitante", pa.string()),
+            ("goles_local", pa.int32()),
+            ("goles_visitante", pa.int32()),
+            ("minuto", pa.int32()),
+            ("equipo", pa.string()),
+            ("jugador", pa.string()),
+            ("xG", pa.float64()),
+            ("xGOT", pa.float64()),
+            ("situacion", pa.string()),
+            ("resultado", pa.string()),
+            ("tipo_disparo", pa.string()),
+        ]
+    )
+
+
+def _parse_fecha(fecha_iso: str) -> datetime:
+    return _as_utc(datetime.fromisoformat(fecha_iso.replace("Z", "+00:00")))
+
+
+def _as_utc(value: date | datetime) -> datetime:
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _partition_value(value: str) -> str:
+    segment = value.strip().replace("/", "-")
+    if not segment or segment in (".", "..") or "=" in segment:
+        raise ValueError(f"Valor de partición inválido: {value!r}")
+    return segment
+
+
+def _pyarrow() -> tuple[Any, Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+    except ImportError as exc:  # pragma: no cover - depende del entorno
+        raise RuntimeError("La exportación a Parquet requiere el paquete opcional 'pyarrow'") from exc
+    return pyarrow, pyarrow.compute, pyarrow.dataset
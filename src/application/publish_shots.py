@@ -1,21 +1,53 @@
 """Use case for publishing normalized shots data into Supabase Storage and index."""
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
+from functools import partial
 from hashlib import sha256
-from typing import Any, Callable, Protocol
+from typing import Any, Callable, Iterator, Protocol, Sequence
 
 from pydantic import ValidationError
 
+from src.application.compression import compress, resolve_content_encoding
+from src.application.resilience import RetryPolicy, TransientStorageError  # noqa: F401 - TransientStorageError se reexporta
+from src.application.serialization import DEFAULT_SERIALIZER, ShotsSerializer
 from src.models.schemas import ShotsResponse
+from src.observability.publish_metrics import DEFAULT_PUBLISH_METRICS, PublishMetrics
+
+
+logger = logging.getLogger(__name__)
 
 
 class ShotsStorage(Protocol):
     """Port representing the storage service responsible for binary uploads."""
 
-    def upload(self, *, bucket: str, path: str, content: bytes, content_type: str) -> None:  # pragma: no cover - protocol
+    def upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:  # pragma: no cover - protocol
+        """Store ``content``; ``content_encoding`` is only passed when the publisher compresses.
+
+        ``cache_control`` overrides the adapter's default (long-lived, immutable) caching for
+        objects that are rewritten in place, such as season rollups.
+        """
+        ...
+
+    def download(self, *, bucket: str, path: str) -> bytes | None:  # pragma: no cover - protocol
+        """Return the stored bytes as uploaded, or ``None`` if the object does not exist."""
         ...
 
 
@@ -25,16 +57,57 @@ class MatchesIndexRepository(Protocol):
     def upsert_match_index(self, *, record: dict[str, Any]) -> None:  # pragma: no cover - protocol
         ...
 
+    def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:  # pragma: no cover - protocol
+        ...
+
+    def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:  # pragma: no cover - protocol
+        """Return the stored records for ``match_ids`` keyed by id; unknown ids are omitted."""
+        ...
+
+
+class AsyncShotsStorage(Protocol):
+    """Async counterpart of :class:`ShotsStorage` for non-blocking adapters."""
+
+    async def upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:  # pragma: no cover - protocol
+        ...
+
+    async def download(self, *, bucket: str, path: str) -> bytes | None:  # pragma: no cover - protocol
+        ...
+
+
+class AsyncMatchesIndexRepository(Protocol):
+    """Async counterpart of :class:`MatchesIndexRepository`."""
+
+    async def upsert_match_index(self, *, record: dict[str, Any]) -> None:  # pragma: no cover - protocol
+        ...
+
+    async def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:  # pragma: no cover - protocol
+        ...
+
+    async def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:  # pragma: no cover - protocol
+        ...
+
 
 class ShotsPayloadValidationError(ValueError):
     """Raised when the publication request payload fails validation rules."""
 
 
-class TransientStorageError(RuntimeError):
-    """Raised when the storage backend reports a recoverable error."""
+class SupersededPublicationError(ShotsPayloadValidationError):
+    """Reported for a batch item whose match id appears again later in the same batch."""
 
 
 Clock = Callable[[], datetime]
+# (match_id, storage_path, checksum): un mismo partido con otro contenido es otra publicación.
+PublicationKey = tuple[str, str, str]
 
 
 @dataclass(frozen=True)
@@ -55,52 +128,282 @@ class PublishResult:
     checksum: str
     size_bytes: int
     uploaded_at: datetime
+    skipped: bool = False
+    content_encoding: str | None = None
 
 
-class ShotsPublisher:
-    """Application service that handles validation, upload and indexing workflow."""
+@dataclass(frozen=True)
+class PublishItemResult:
+    """Per-item outcome of a batch publication; exactly one of result/error is set."""
+
+    match_id: str
+    storage_path: str
+    result: PublishResult | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class _PreparedPublication:
+    request: ShotsPublicationRequest
+    payload_bytes: bytes
+    content: bytes
+    checksum: str
+    record: dict[str, Any]
+
+    @property
+    def key(self) -> "PublicationKey":
+        return (self.request.match_id, self.request.storage_path, self.checksum)
+
+
+class PublishedMatchesCache:
+    """Thread-safe, bounded LRU of the last known publication per match id.
+
+    Lets a long-lived process skip unchanged re-publications without asking the index.
+    """
+
+    DEFAULT_MAX_ENTRIES = 50_000
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, PublishResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, match_id: str) -> PublishResult | None:
+        with self._lock:
+            result = self._entries.get(match_id)
+            if result is not None:
+                self._entries.move_to_end(match_id)
+            return result
+
+    def put(self, result: PublishResult) -> None:
+        with self._lock:
+            self._entries[result.match_id] = result
+            self._entries.move_to_end(result.match_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class _BaseShotsPublisher:
+    """Validation, serialization and indexing steps shared by the sync and async publishers."""
 
     DEFAULT_BUCKET = "shots"
+    DEFAULT_MAX_WORKERS = 8
 
     def __init__(
         self,
         *,
-        storage: ShotsStorage,
-        database: MatchesIndexRepository,
         bucket: str | None = None,
         max_retries: int = 3,
+        max_workers: int | None = None,
         clock: Clock | None = None,
+        skip_unchanged: bool = False,
+        published_cache: PublishedMatchesCache | None = None,
+        serializer: ShotsSerializer | None = None,
+        content_encoding: str | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: PublishMetrics | None = None,
     ) -> None:
-        self._storage = storage
-        self._database = database
         self._bucket = bucket or self.DEFAULT_BUCKET
-        self._max_retries = max(1, max_retries)
+        # max_retries se mantiene por compatibilidad: es el número total de intentos.
+        self._retry_policy = retry_policy or RetryPolicy(max_attempts=max(1, max_retries))
+        self._max_workers = max(1, max_workers or self.DEFAULT_MAX_WORKERS)
         self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._skip_unchanged = skip_unchanged
+        if published_cache is None and skip_unchanged:
+            published_cache = PublishedMatchesCache()
+        self._published_cache = published_cache
+        self._serializer = serializer or DEFAULT_SERIALIZER
+        self._content_encoding = resolve_content_encoding(content_encoding)
+        self._upload_options: dict[str, str] = {"content_type": "application/json"}
+        if self._content_encoding is not None:
+            # Solo se pasa al puerto si se comprime: los adaptadores antiguos no lo aceptan.
+            self._upload_options["content_encoding"] = self._content_encoding
+        self._metrics = metrics or DEFAULT_PUBLISH_METRICS
+        self._on_upload_retry = partial(self._record_retry, "upload")
+        self._on_index_retry = partial(self._record_retry, "index")
+
+    def _prepare(self, request: ShotsPublicationRequest) -> _PreparedPublication:
+        with self._stage("validate"):
+            self._validate_request(request)
+        with self._stage("serialize"):
+            payload_bytes = self._serialize(request.shots, self._serializer)
+        with self._stage("hash"):
+            checksum = sha256(payload_bytes).hexdigest()
+        content = payload_bytes
+        record = self._build_index_record(request=request, checksum=checksum, size_bytes=len(payload_bytes))
+        if self._content_encoding is not None:
+            with self._stage("compress"):
+                content = compress(payload_bytes, self._content_encoding)
+            record.update(
+                size_bytes=len(content),
+                raw_size_bytes=len(payload_bytes),
+                content_encoding=self._content_encoding,
+            )
+        self._metrics.payload_bytes.observe(len(payload_bytes), kind="raw")
+        self._metrics.payload_bytes.observe(len(content), kind="stored")
+        self._metrics.shots_per_match.observe(len(request.shots.disparos))
+        return _PreparedPublication(
+            request=request,
+            payload_bytes=payload_bytes,
+            content=content,
+            checksum=checksum,
+            record=record,
+        )
 
-    def publish(self, request: ShotsPublicationRequest) -> PublishResult:
-        self._validate_request(request)
-        payload_bytes = self._serialize(request.shots)
-        checksum = sha256(payload_bytes).hexdigest()
-        size_bytes = len(payload_bytes)
+    def _unchanged_from_cache(
+        self,
+        items: list[_PreparedPublication],
+    ) -> tuple[dict[PublicationKey, PublishResult], list[_PreparedPublication]]:
+        """Split ``items`` into cached unchanged results and those that need an index lookup."""
+
+        found: dict[PublicationKey, PublishResult] = {}
+        missing: list[_PreparedPublication] = []
+        for item in items:
+            cached = self._published_cache.get(item.request.match_id) if self._published_cache else None
+            if cached is not None and self._is_same_publication(
+                item, cached.storage_path, cached.checksum, cached.content_encoding
+            ):
+                found[item.key] = replace(cached, skipped=True)
+            else:
+                missing.append(item)
+        return found, missing
+
+    def _unchanged_from_records(
+        self,
+        items: list[_PreparedPublication],
+        records: dict[str, dict[str, Any]],
+    ) -> dict[PublicationKey, PublishResult]:
+        found: dict[PublicationKey, PublishResult] = {}
+        for item in items:
+            record = records.get(item.request.match_id)
+            if record is None or not self._is_same_publication(
+                item, record.get("storage_path"), record.get("checksum"), record.get("content_encoding")
+            ):
+                continue
+            # El índice no guarda la hora de subida: se informa la de la comprobación.
+            result = PublishResult(
+                match_id=item.request.match_id,
+                storage_path=item.request.storage_path,
+                checksum=item.checksum,
+                size_bytes=int(record.get("size_bytes") or len(item.content)),
+                uploaded_at=self._clock(),
+                content_encoding=self._content_encoding,
+            )
+            self._remember(result)
+            found[item.key] = replace(result, skipped=True)
+        return found
 
-        self._upload_with_retry(path=request.storage_path, content=payload_bytes)
-        uploaded_at = self._clock()
+    def _is_same_publication(
+        self,
+        item: _PreparedPublication,
+        storage_path: Any,
+        checksum: Any,
+        content_encoding: Any,
+    ) -> bool:
+        # El checksum no cambia al comprimir: sin comparar la codificación, los partidos
+        # publicados antes de activar la compresión nunca se volverían a subir.
+        return (
+            storage_path == item.request.storage_path
+            and checksum == item.checksum
+            and (content_encoding or None) == self._content_encoding
+        )
 
-        record = self._build_index_record(
-            request=request,
-            checksum=checksum,
-            size_bytes=size_bytes,
+    @contextmanager
+    def _stage(self, stage: str, *, count_failures: bool = True) -> Iterator[None]:
+        """Time one publish stage and count its failures by exception type.
+
+        Stages that wrap other stages pass ``count_failures=False``, so each failure is
+        counted once, in the stage where it happened.
+        """
+
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            if count_failures:
+                self._metrics.failures.inc(stage=stage, error=type(exc).__name__)
+            raise
+        finally:
+            self._metrics.stage_seconds.observe(time.perf_counter() - started, stage=stage)
+
+    def _record_retry(self, operation: str, attempt: int, error: BaseException, delay: float) -> None:
+        self._metrics.retries.inc(operation=operation, error=type(error).__name__)
+        logger.warning(
+            "Error temporal en el backend; se reintenta",
+            extra={"operation": operation, "attempt": attempt, "delay_seconds": round(delay, 3), "error": str(error)},
         )
-        self._database.upsert_match_index(record=record)
 
+    def _record_outcome(self, result: PublishResult | None) -> None:
+        if result is None:
+            self._metrics.results.inc(outcome="failed")
+        else:
+            self._metrics.results.inc(outcome="skipped" if result.skipped else "published")
+
+    def _record_outcomes(self, outcomes: list[PublishItemResult]) -> list[PublishItemResult]:
+        for outcome in outcomes:
+            self._record_outcome(outcome.result)
+        return outcomes
+
+    def _remember(self, result: PublishResult) -> None:
+        if self._published_cache is not None:
+            self._published_cache.put(result)
+
+    @staticmethod
+    def _result(prepared: _PreparedPublication, uploaded_at: datetime) -> PublishResult:
         return PublishResult(
+            match_id=prepared.request.match_id,
+            storage_path=prepared.request.storage_path,
+            checksum=prepared.checksum,
+            size_bytes=len(prepared.content),
+            uploaded_at=uploaded_at,
+            content_encoding=prepared.record.get("content_encoding"),
+        )
+
+    def _published_item(self, prepared: _PreparedPublication, uploaded_at: datetime) -> PublishItemResult:
+        result = self._result(prepared, uploaded_at)
+        self._remember(result)
+        return PublishItemResult(
+            match_id=prepared.request.match_id,
+            storage_path=prepared.request.storage_path,
+            result=result,
+        )
+
+    @staticmethod
+    def _skipped_item(result: PublishResult) -> PublishItemResult:
+        return PublishItemResult(match_id=result.match_id, storage_path=result.storage_path, result=result)
+
+    @staticmethod
+    def _failed_item(request: ShotsPublicationRequest, error: Exception) -> PublishItemResult:
+        return PublishItemResult(
             match_id=request.match_id,
             storage_path=request.storage_path,
-            checksum=checksum,
-            size_bytes=size_bytes,
-            uploaded_at=uploaded_at,
+            error=error,
         )
 
+    def _drop_superseded(
+        self,
+        prepared: dict[int, _PreparedPublication],
+        outcomes: list[PublishItemResult | None],
+    ) -> None:
+        """Keep only the last item of each match id in the batch; the earlier ones are superseded.
+
+        Uploading them all would race on the same storage path, and the index could end up
+        pointing at a different version than the one stored.
+        """
+
+        last_position = {item.request.match_id: position for position, item in prepared.items()}
+        for position in [p for p, item in prepared.items() if last_position[item.request.match_id] != p]:
+            request = prepared.pop(position).request
+            error = SupersededPublicationError(
+                f"El partido se repite en la posición {last_position[request.match_id]} del lote; "
+                "solo se publica su última aparición"
+            )
+            outcomes[position] = self._failed_item(request, error)
+
     def _validate_request(self, request: ShotsPublicationRequest) -> None:
         if request.match_id != request.shots.partido.idPartido:
             raise ShotsPayloadValidationError(
@@ -111,30 +414,12 @@ class ShotsPublisher:
             raise ShotsPayloadValidationError("La ruta de almacenamiento no es válida")
 
     @staticmethod
-    def _serialize(shots: ShotsResponse) -> bytes:
+    def _serialize(shots: ShotsResponse, serializer: ShotsSerializer = DEFAULT_SERIALIZER) -> bytes:
         try:
-            payload = shots.model_dump(exclude_none=True)
+            return serializer.serialize(shots)
         except ValidationError as exc:  # pragma: no cover - defensive; ShotsResponse ya valida
             raise ShotsPayloadValidationError("El payload de disparos es inválido") from exc
 
-        return json.dumps(payload, sort_keys=True).encode("utf-8")
-
-    def _upload_with_retry(self, *, path: str, content: bytes) -> None:
-        attempts = 0
-        while True:
-            try:
-                self._storage.upload(
-                    bucket=self._bucket,
-                    path=path,
-                    content=content,
-                    content_type="application/json",
-                )
-                return
-            except TransientStorageError:
-                attempts += 1
-                if attempts >= self._max_retries:
-                    raise
-
     @staticmethod
     def _build_index_record(
         *,
@@ -144,7 +429,7 @@ class ShotsPublisher:
     ) -> dict[str, Any]:
         return {
             "id": request.match_id,
-            "date": ShotsPublisher._parse_match_date(request.shots.partido.fechaISO),
+            "date": _BaseShotsPublisher._parse_match_date(request.shots.partido.fechaISO),
             "home": request.shots.partido.local,
             "away": request.shots.partido.visitante,
             "storage_path": request.storage_path,
@@ -169,3 +454,293 @@ class ShotsPublisher:
         if ".." in path.split("/"):
             return False
         return path.endswith(".json")
+
+
+class ShotsPublisher(_BaseShotsPublisher):
+    """Application service that handles validation, upload and indexing workflow."""
+
+    def __init__(
+        self,
+        *,
+        storage: ShotsStorage,
+        database: MatchesIndexRepository,
+        bucket: str | None = None,
+        max_retries: int = 3,
+        max_workers: int | None = None,
+        clock: Clock | None = None,
+        skip_unchanged: bool = False,
+        published_cache: PublishedMatchesCache | None = None,
+        serializer: ShotsSerializer | None = None,
+        content_encoding: str | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: PublishMetrics | None = None,
+    ) -> None:
+        super().__init__(
+            bucket=bucket,
+            max_retries=max_retries,
+            max_workers=max_workers,
+            clock=clock,
+            skip_unchanged=skip_unchanged,
+            published_cache=published_cache,
+            serializer=serializer,
+            content_encoding=content_encoding,
+            retry_policy=retry_policy,
+            metrics=metrics,
+        )
+        self._storage = storage
+        self._database = database
+
+    def publish(self, request: ShotsPublicationRequest) -> PublishResult:
+        result = None
+        try:
+            with self._stage("publish", count_failures=False):
+                result = self._publish(request)
+        finally:
+            self._record_outcome(result)
+        return result
+
+    def _publish(self, request: ShotsPublicationRequest) -> PublishResult:
+        prepared = self._prepare(request)
+
+        unchanged = self._find_unchanged([prepared]).get(prepared.key)
+        if unchanged is not None:
+            return unchanged
+
+        self._upload_with_retry(path=request.storage_path, content=prepared.content)
+        uploaded_at = self._clock()
+
+        with self._stage("index"):
+            self._retry_policy.call(
+                lambda: self._database.upsert_match_index(record=prepared.record),
+                on_retry=self._on_index_retry,
+            )
+
+        result = self._result(prepared, uploaded_at)
+        self._remember(result)
+        return result
+
+    def publish_many(self, requests: Sequence[ShotsPublicationRequest]) -> list[PublishItemResult]:
+        """Publish several matches: uploads run concurrently, the index is written once.
+
+        Every request is validated and serialized before any upload starts. Failures are
+        reported per item in the returned list (same order as ``requests``) instead of
+        aborting the batch. When a match id is repeated only its last item is published;
+        the earlier ones fail with :class:`SupersededPublicationError`.
+        """
+
+        outcomes: list[PublishItemResult | None] = [None] * len(requests)
+        prepared: dict[int, _PreparedPublication] = {}
+
+        for position, request in enumerate(requests):
+            try:
+                prepared[position] = self._prepare(request)
+            except ShotsPayloadValidationError as exc:
+                outcomes[position] = self._failed_item(request, exc)
+        self._drop_superseded(prepared, outcomes)
+
+        unchanged = self._find_unchanged(list(prepared.values()))
+        for position in [p for p, item in prepared.items() if item.key in unchanged]:
+            outcomes[position] = self._skipped_item(unchanged[prepared.pop(position).key])
+
+        uploaded: dict[int, datetime] = {}
+        if prepared:
+            workers = min(self._max_workers, len(prepared))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shots-upload") as executor:
+                futures = {
+                    position: executor.submit(
+                        self._upload_with_retry,
+                        path=item.request.storage_path,
+                        content=item.content,
+                    )
+                    for position, item in prepared.items()
+                }
+                for position, future in futures.items():
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        outcomes[position] = self._failed_item(prepared[position].request, exc)
+                    else:
+                        uploaded[position] = self._clock()
+
+        if uploaded:
+            try:
+                records = [prepared[position].record for position in uploaded]
+                with self._stage("index"):
+                    self._retry_policy.call(
+                        lambda: self._database.upsert_match_indexes(records=records),
+                        on_retry=self._on_index_retry,
+                    )
+            except Exception as exc:
+                for position in uploaded:
+                    outcomes[position] = self._failed_item(prepared[position].request, exc)
+            else:
+                for position, uploaded_at in uploaded.items():
+                    outcomes[position] = self._published_item(prepared[position], uploaded_at)
+
+        return self._record_outcomes([outcome for outcome in outcomes if outcome is not None])
+
+    def _find_unchanged(self, items: list[_PreparedPublication]) -> dict[PublicationKey, PublishResult]:
+        if not self._skip_unchanged or not items:
+            return {}
+        found, missing = self._unchanged_from_cache(items)
+        if missing:
+            try:
+                with self._stage("lookup"):
+                    records = self._database.get_match_indexes(
+                        match_ids=sorted({item.request.match_id for item in missing}),
+                    )
+            except Exception:
+                logger.warning("No se pudo consultar matches_index; se publica sin deduplicar", exc_info=True)
+                records = {}
+            found.update(self._unchanged_from_records(missing, records))
+        return found
+
+    def _upload_with_retry(self, *, path: str, content: bytes) -> None:
+        with self._stage("upload"):
+            self._retry_policy.call(
+                lambda: self._storage.upload(bucket=self._bucket, path=path, content=content, **self._upload_options),
+                on_retry=self._on_upload_retry,
+            )
+
+
+class AsyncShotsPublisher(_BaseShotsPublisher):
+    """Non-blocking variant of :class:`ShotsPublisher` for async adapters and endpoints."""
+
+    def __init__(
+        self,
+        *,
+        storage: AsyncShotsStorage,
+        database: AsyncMatchesIndexRepository,
+        bucket: str | None = None,
+        max_retries: int = 3,
+        max_workers: int | None = None,
+        clock: Clock | None = None,
+        skip_unchanged: bool = False,
+        published_cache: PublishedMatchesCache | None = None,
+        serializer: ShotsSerializer | None = None,
+        content_encoding: str | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: PublishMetrics | None = None,
+    ) -> None:
+        super().__init__(
+            bucket=bucket,
+            max_retries=max_retries,
+            max_workers=max_workers,
+            clock=clock,
+            skip_unchanged=skip_unchanged,
+            published_cache=published_cache,
+            serializer=serializer,
+            content_encoding=content_encoding,
+            retry_policy=retry_policy,
+            metrics=metrics,
+        )
+        self._storage = storage
+        self._database = database
+
+    async def publish(self, request: ShotsPublicationRequest) -> PublishResult:
+        result = None
+        try:
+            with self._stage("publish", count_failures=False):
+                result = await self._publish(request)
+        finally:
+            self._record_outcome(result)
+        return result
+
+    async def _publish(self, request: ShotsPublicationRequest) -> PublishResult:
+        prepared = self._prepare(request)
+
+        unchanged = (await self._find_unchanged([prepared])).get(prepared.key)
+        if unchanged is not None:
+            return unchanged
+
+        await self._upload_with_retry(path=request.storage_path, content=prepared.content)
+        uploaded_at = self._clock()
+
+        with self._stage("index"):
+            await self._retry_policy.acall(
+                lambda: self._database.upsert_match_index(record=prepared.record),
+                on_retry=self._on_index_retry,
+            )
+
+        result = self._result(prepared, uploaded_at)
+        self._remember(result)
+        return result
+
+    async def publish_many(self, requests: Sequence[ShotsPublicationRequest]) -> list[PublishItemResult]:
+        """Async counterpart of :meth:`ShotsPublisher.publish_many`; ``max_workers`` caps in-flight uploads."""
+
+        outcomes: list[PublishItemResult | None] = [None] * len(requests)
+        prepared: dict[int, _PreparedPublication] = {}
+
+        for position, request in enumerate(requests):
+            try:
+                prepared[position] = self._prepare(request)
+            except ShotsPayloadValidationError as exc:
+                outcomes[position] = self._failed_item(request, exc)
+        self._drop_superseded(prepared, outcomes)
+
+        unchanged = await self._find_unchanged(list(prepared.values()))
+        for position in [p for p, item in prepared.items() if item.key in unchanged]:
+            outcomes[position] = self._skipped_item(unchanged[prepared.pop(position).key])
+
+        semaphore = asyncio.Semaphore(self._max_workers)
+
+        async def _upload(item: _PreparedPublication) -> datetime:
+            async with semaphore:
+                await self._upload_with_retry(path=item.request.storage_path, content=item.content)
+                return self._clock()
+
+        positions = list(prepared)
+        results = await asyncio.gather(
+            *(_upload(prepared[position]) for position in positions),
+            return_exceptions=True,
+        )
+
+        uploaded: dict[int, datetime] = {}
+        for position, result in zip(positions, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):  # pragma: no cover - cancelaciones
+                    raise result
+                outcomes[position] = self._failed_item(prepared[position].request, result)
+            else:
+                uploaded[position] = result
+
+        if uploaded:
+            try:
+                records = [prepared[position].record for position in uploaded]
+                with self._stage("index"):
+                    await self._retry_policy.acall(
+                        lambda: self._database.upsert_match_indexes(records=records),
+                        on_retry=self._on_index_retry,
+                    )
+            except Exception as exc:
+                for position in uploaded:
+                    outcomes[position] = self._failed_item(prepared[position].request, exc)
+            else:
+                for position, uploaded_at in uploaded.items():
+                    outcomes[position] = self._published_item(prepared[position], uploaded_at)
+
+        return self._record_outcomes([outcome for outcome in outcomes if outcome is not None])
+
+    async def _find_unchanged(self, items: list[_PreparedPublication]) -> dict[PublicationKey, PublishResult]:
+        if not self._skip_unchanged or not items:
+            return {}
+        found, missing = self._unchanged_from_cache(items)
+        if missing:
+            try:
+                with self._stage("lookup"):
+                    records = await self._database.get_match_indexes(
+                        match_ids=sorted({item.request.match_id for item in missing}),
+                    )
+            except Exception:
+                logger.warning("No se pudo consultar matches_index; se publica sin deduplicar", exc_info=True)
+                records = {}
+            found.update(self._unchanged_from_records(missing, records))
+        return found
+
+    async def _upload_with_retry(self, *, path: str, content: bytes) -> None:
+        with self._stage("upload"):
+            await self._retry_policy.acall(
+                lambda: self._storage.upload(bucket=self._bucket, path=path, content=content, **self._upload_options),
+                on_retry=self._on_upload_retry,
+            )
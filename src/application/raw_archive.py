@@ -0,0 +1,254 @@
+"""Packed archive of raw SofaScore dumps: append-only segments plus an offset index.
+
+An archive is a directory::
+
+    segment-000001.jsonl   compact JSON records, one per line, only ever appended to
+    segment-000002.jsonl   a new segment starts once the current one passes ``max_segment_bytes``
+    index.jsonl            one line per record: kind, match id, segment, offset, length
+
+Each record is one raw document (``event`` or ``shots``) of one match. Writing the same
+``(kind, match_id)`` again appends a new record. The index line written last wins, and the
+old bytes stay in the segment as garbage. A record is written to its segment before its
+index line, so a crash leaves at worst unreferenced bytes. Index lines that are truncated
+or that point past the end of a segment are ignored when the archive is opened.
+
+Readers map the segments with :mod:`mmap`. Reading a match is a dict lookup plus one slice
+of an already mapped file, so there is no per-file ``open``. Only one process may write to an
+archive at a time, but any number of processes may read it.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+
+EVENT = "event"
+SHOTS = "shots"
+RECORD_KINDS = (EVENT, SHOTS)
+
+INDEX_FILENAME = "index.jsonl"
+DEFAULT_MAX_SEGMENT_BYTES = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class RecordLocation:
+    """Where the bytes of one record live inside the archive."""
+
+    segment: int
+    offset: int
+    length: int
+
+
+class RawArchive:
+    """Reader and single writer of a packed raw archive directory."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+        durable: bool = False,
+    ) -> None:
+        self.root = Path(root)
+        self._max_segment_bytes = max(1, max_segment_bytes)
+        self._durable = durable
+        self._lock = threading.Lock()
+        self._index: dict[tuple[str, str], RecordLocation] = {}
+        self._index_position = 0
+        self._maps: dict[int, mmap.mmap] = {}
+        self._writer: Any = None
+        self._index_writer: Any = None
+        self._segment = 0
+        self._segment_size = 0
+        with self._lock:
+            self._load_index()
+
+    # -- escritura --------------------------------------------------------------------
+
+    def append(self, kind: str, match_id: str, data: Any) -> RecordLocation:
+        """Store ``data`` as compact JSON; returns where the record was written."""
+
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return self.append_bytes(kind, match_id, payload)
+
+    def append_bytes(self, kind: str, match_id: str, payload: bytes) -> RecordLocation:
+        if kind not in RECORD_KINDS:
+            raise ValueError(f"Tipo de registro desconocido: {kind!r} (usa {', '.join(RECORD_KINDS)})")
+        if not payload or b"\n" in payload:
+            raise ValueError("El registro debe ser JSON compacto en una sola línea")
+        match_id = str(match_id)
+        with self._lock:
+            self._open_writer(len(payload) + 1)
+            location = RecordLocation(segment=self._segment, offset=self._segment_size, length=len(payload))
+            self._writer.write(payload + b"\n")
+            self._writer.flush()
+            if self._durable:
+                os.fsync(self._writer.fileno())
+            self._segment_size += len(payload) + 1
+
+            # El índice va después del segmento: nunca apunta a bytes que no existen.
+            entry = {
+                "kind": kind,
+                "id": match_id,
+                "segment": location.segment,
+                "offset": location.offset,
+                "length": location.length,
+            }
+            line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+            self._index_writer.write(line)
+            self._index_writer.flush()
+            if self._durable:
+                os.fsync(self._index_writer.fileno())
+            self._index_position += len(line)
+            self._index[(kind, match_id)] = location
+        return location
+
+    # -- lectura ----------------------------------------------------------------------
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def refresh(self) -> None:
+        """Pick up records another process appended since the archive was opened."""
+
+        with self._lock:
+            self._load_index()
+
+    def location(self, kind: str, match_id: str) -> RecordLocation | None:
+        key = (kind, str(match_id))
+        location = self._index.get(key)
+        if location is None:
+            # Otro proceso puede haber escrito desde que se abrió el archivo.
+            self.refresh()
+            location = self._index.get(key)
+        return location
+
+    def get_bytes(self, kind: str, match_id: str) -> bytes:
+        """Raw JSON bytes of a record; ``KeyError`` if the archive does not have it."""
+
+        location = self.location(kind, match_id)
+        if location is None:
+            raise KeyError(f"{kind}_{match_id} no está en el archivo {self.root}")
+        return self.read(location)
+
+    def get(self, kind: str, match_id: str) -> Any:
+        return json.loads(self.get_bytes(kind, match_id))
+
+    def read(self, location: RecordLocation) -> bytes:
+        with self._lock:
+            mapped = self._map(location.segment, location.offset + location.length)
+            return mapped[location.offset:location.offset + location.length]
+
+    def match_ids(self, kind: str = EVENT) -> list[str]:
+        """Ids with a ``kind`` record, in the order they were written (segment, offset)."""
+
+        with self._lock:
+            items = list(self._index.items())
+        keys = [(location, match_id) for (record_kind, match_id), location in items if record_kind == kind]
+        keys.sort(key=lambda item: (item[0].segment, item[0].offset))
+        return [match_id for _, match_id in keys]
+
+    def iter_records(self, kind: str = EVENT) -> Iterator[tuple[str, bytes]]:
+        """Stream ``(match_id, raw_bytes)`` of every ``kind`` record sequentially."""
+
+        for match_id in self.match_ids(kind):
+            location = self._index.get((kind, match_id))
+            if location is not None:
+                yield match_id, self.read(location)
+
+    # -- ciclo de vida ----------------------------------------------------------------
+
+    def close(self) -> None:
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            for handle in (self._writer, self._index_writer):
+                if handle is not None:
+                    handle.close()
+            self._writer = self._index_writer = None
+
+    def __enter__(self) -> "RawArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # -- internos (con self._lock tomado) ----------------------------------------------
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"segment-{segment:06d}.jsonl"
+
+    def _load_index(self) -> None:
+        path = self.root / INDEX_FILENAME
+        try:
+            with path.open("rb") as handle:
+                handle.seek(self._index_position)
+                tail = handle.read()
+        except FileNotFoundError:
+            return
+        consumed = 0
+        sizes: dict[int, int] = {}
+        for line in tail.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # Línea a medio escribir: se relee en la próxima carga.
+            consumed += len(line)
+            try:
+                entry = json.loads(line)
+                location = RecordLocation(int(entry["segment"]), int(entry["offset"]), int(entry["length"]))
+                key = (str(entry["kind"]), str(entry["id"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+            if location.segment not in sizes:
+                try:
+                    sizes[location.segment] = self._segment_path(location.segment).stat().st_size
+                except FileNotFoundError:
+                    sizes[location.segment] = -1
+            if location.offset + location.length <= sizes[location.segment]:
+                self._index[key] = location
+        self._index_position += consumed
+
+    def _open_writer(self, incoming: int) -> None:
+        if self._writer is not None and self._segment_size + incoming <= self._max_segment_bytes:
+            return
+        if self._writer is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+            existing = sorted(self.root.glob("segment-*.jsonl"))
+            self._segment = int(existing[-1].stem.split("-")[1]) if existing else 1
+            self._index_writer = (self.root / INDEX_FILENAME).open("ab")
+            index_size = self._index_writer.tell()
+            if index_size != self._index_position:
+                # Cola del índice truncada por un corte: se deja en una línea nueva.
+                self._index_writer.write(b"\n")
+                self._index_position = index_size + 1
+        else:
+            self._writer.close()
+            self._segment += 1
+        self._writer = self._segment_path(self._segment).open("ab")
+        self._segment_size = self._writer.tell()
+        if self._segment_size and self._segment_size + incoming > self._max_segment_bytes:
+            self._writer.close()
+            self._segment += 1
+            self._writer = self._segment_path(self._segment).open("ab")
+            self._segment_size = 0
+
+    def _map(self, segment: int, needed: int) -> mmap.mmap:
+        mapped = self._maps.get(segment)
+        if mapped is not None and len(mapped) >= needed:
+            return mapped
+        if mapped is not None:
+            # El segmento creció tras mapearlo (el escritor sigue añadiendo): se remapea.
+            mapped.close()
+        with self._segment_path(segment).open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[segment] = mapped
+        return mapped
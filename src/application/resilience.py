@@ -0,0 +1,191 @@
+"""Retry and circuit-breaker primitives for calls to remote backends."""
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+
+T = TypeVar("T")
+
+
+class TransientStorageError(RuntimeError):
+    """Raised when the storage backend reports a recoverable error."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the backend while its circuit breaker is open; never retried."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and an overall deadline.
+
+    The delay before retry ``n`` (1-based) is drawn uniformly from
+    ``[0, min(max_delay, base_delay * multiplier ** (n - 1))]``. No retry is scheduled if it
+    would start after ``deadline`` seconds from the first attempt.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    multiplier: float = 2.0
+    deadline: float | None = 10.0
+    retry_on: tuple[type[BaseException], ...] = (TransientStorageError,)
+
+    def backoff(self, retry: int, rng: random.Random | None = None) -> float:
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        return (rng or random).uniform(0, ceiling) if ceiling > 0 else 0.0
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        on_retry: Callable[[int, BaseException, float], None] | None = None,
+    ) -> T:
+        started = clock()
+        attempt = 1
+        while True:
+            try:
+                return fn()
+            except self.retry_on as exc:
+                delay = self._next_delay(attempt, exc, clock() - started)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, exc, delay)
+                sleep(delay)
+                attempt += 1
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        on_retry: Callable[[int, BaseException, float], None] | None = None,
+    ) -> T:
+        started = clock()
+        attempt = 1
+        while True:
+            try:
+                return await fn()
+            except self.retry_on as exc:
+                delay = self._next_delay(attempt, exc, clock() - started)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, exc, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _next_delay(self, attempt: int, exc: BaseException, elapsed: float) -> float | None:
+        if isinstance(exc, CircuitOpenError) or attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """Thread-safe breaker: opens after ``failure_threshold`` consecutive transient failures.
+
+    While open every call fails fast with :class:`CircuitOpenError`. After ``reset_timeout``
+    seconds a single probe call is let through (half-open); its outcome closes the circuit
+    or opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        *,
+        name: str = "default",
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self._reset_timeout:
+                    raise CircuitOpenError(f"Circuito '{self.name}' abierto: backend no disponible")
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"Circuito '{self.name}' abierto: backend no disponible")
+                self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Wrap one backend call; only :class:`TransientStorageError` counts as a failure."""
+
+        self.before_call()
+        try:
+            yield
+        except TransientStorageError:
+            self.record_failure()
+            raise
+        except BaseException:
+            # El backend respondió (p. ej. 4xx) o la llamada se canceló: no cuenta como fallo.
+            self._release()
+            raise
+        else:
+            self.record_success()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(name: str, **options: float) -> CircuitBreaker:
+    """Process-wide breaker registered under ``name``; ``options`` only apply on creation."""
+
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name=name, **options)  # type: ignore[arg-type]
+        return breaker
@@ -0,0 +1,303 @@
+"""Use case that builds per-competition/season rollups from normalized shots files.
+
+For every ``(competition, season)`` two objects are kept in the shots bucket:
+
+``rollups/<competition>/<season>.json``
+    The artifact the frontend reads: per-team and per-player totals of shots, goals, xG
+    and xGOT, each with a breakdown by ``situacion``.
+``rollups/<competition>/<season>.matches.json``
+    The contribution of every match to those totals, keyed by ``idPartido``.
+
+Updating a rollup downloads the contributions, replaces those of the given matches and
+re-sums the totals from the contributions. No other per-match file is read, and the sums
+do not drift because no contribution is ever subtracted. Run a single updater per
+competition at a time: two concurrent updates of the same season would overwrite each
+other's contributions.
+
+Rollups are only updated by ``rollup_cli``. Publishing a match through
+:class:`~src.application.publish_shots.ShotsPublisher` or the API does not touch them, since
+a publication request does not say which competition the match belongs to.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from src.application.publish_shots import Clock, ShotsStorage
+from src.application.resilience import RetryPolicy
+from src.models.schemas import ShotsResponse
+
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_VERSION = 1
+GOAL_RESULT = "Gol"
+DEFAULT_ROLLUP_PREFIX = "rollups"
+# Los rollups se reescriben en el sitio: caché corta, a diferencia de los ficheros por partido.
+ROLLUP_CACHE_CONTROL = "max-age=300"
+SEASON_START_MONTH = 7
+
+
+@dataclass(frozen=True)
+class RollupResult:
+    """Outcome of updating one season rollup."""
+
+    competition: str
+    season: str
+    storage_path: str
+    matches: int
+    updated_matches: int
+    skipped: bool = False
+
+
+def load_matches(paths: Iterable[Path]) -> Iterator[ShotsResponse]:
+    """Yield normalized ``match_<id>.json`` files one at a time."""
+
+    for path in paths:
+        yield ShotsResponse.model_validate_json(Path(path).read_bytes())
+
+
+def season_of(fecha_iso: str, *, start_month: int = SEASON_START_MONTH) -> str:
+    """``"2024-2025"`` for a match played between July 2024 and June 2025 (by default)."""
+
+    played = datetime.fromisoformat(fecha_iso.replace("Z", "+00:00"))
+    first_year = played.year if played.month >= start_month else played.year - 1
+    return f"{first_year}-{first_year + 1}"
+
+
+def match_contribution(shots: ShotsResponse) -> dict[str, Any]:
+    """Per-team and per-player stats of one match, plus a checksum of its inputs."""
+
+    teams: dict[str, dict[str, Any]] = defaultdict(_empty_stats)
+    players: dict[tuple[str, str], dict[str, Any]] = defaultdict(_empty_stats)
+    for disparo in shots.disparos:
+        for stats in (teams[disparo.equipo], players[(disparo.equipo, disparo.jugador)]):
+            _add_shot(stats, disparo.situacion, disparo.resultado == GOAL_RESULT, disparo.xG, disparo.xGOT)
+
+    payload = shots.model_dump_json(exclude_none=True).encode("utf-8")
+    return {
+        "checksum": sha256(payload).hexdigest(),
+        "fechaISO": shots.partido.fechaISO,
+        "equipos": dict(sorted(teams.items())),
+        "jugadores": [
+            {"equipo": equipo, "jugador": jugador, **stats}
+            for (equipo, jugador), stats in sorted(players.items())
+        ],
+    }
+
+
+def build_rollup(competition: str, season: str, contributions: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Sum the contributions into the frontend artifact (deterministic order and rounding)."""
+
+    teams: dict[str, dict[str, Any]] = defaultdict(_empty_stats)
+    players: dict[tuple[str, str], dict[str, Any]] = defaultdict(_empty_stats)
+    team_matches: dict[str, int] = defaultdict(int)
+    player_matches: dict[tuple[str, str], int] = defaultdict(int)
+
+    for match_id in sorted(contributions):
+        contribution = contributions[match_id]
+        for equipo, stats in contribution["equipos"].items():
+            _merge_stats(teams[equipo], stats)
+            team_matches[equipo] += 1
+        for entry in contribution["jugadores"]:
+            key = (entry["equipo"], entry["jugador"])
+            _merge_stats(players[key], entry)
+            player_matches[key] += 1
+
+    return {
+        "version": ROLLUP_VERSION,
+        "competicion": competition,
+        "temporada": season,
+        "partidos": len(contributions),
+        "equipos": _ranked(
+            {"equipo": equipo, "partidos": team_matches[equipo], **_rounded(stats)}
+            for equipo, stats in teams.items()
+        ),
+        "jugadores": _ranked(
+            {"jugador": jugador, "equipo": equipo, "partidos": player_matches[(equipo, jugador)], **_rounded(stats)}
+            for (equipo, jugador), stats in players.items()
+        ),
+    }
+
+
+class SeasonRollupPublisher:
+    """Maintain season rollups in the shots bucket through the :class:`ShotsStorage` port."""
+
+    DEFAULT_BUCKET = "shots"
+
+    def __init__(
+        self,
+        *,
+        storage: ShotsStorage,
+        bucket: str | None = None,
+        prefix: str = DEFAULT_ROLLUP_PREFIX,
+        retry_policy: RetryPolicy | None = None,
+        clock: Clock | None = None,
+        season_start_month: int = SEASON_START_MONTH,
+    ) -> None:
+        self._storage = storage
+        self._bucket = bucket or self.DEFAULT_BUCKET
+        self._prefix = prefix.strip("/")
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._season_start_month = season_start_month
+
+    def rollup_path(self, competition: str, season: str) -> str:
+        return f"{self._prefix}/{_path_segment(competition)}/{_path_segment(season)}.json"
+
+    def contributions_path(self, competition: str, season: str) -> str:
+        return f"{self._prefix}/{_path_segment(competition)}/{_path_segment(season)}.matches.json"
+
+    def update(
+        self,
+        competition: str,
+        matches: Iterable[ShotsResponse],
+        *,
+        season: str | None = None,
+        rebuild: bool = False,
+    ) -> list[RollupResult]:
+        """Fold ``matches`` into their season rollups and upload the ones that changed.
+
+        The season comes from each match date unless ``season`` is given. With ``rebuild``
+        the stored contributions are ignored, so the rollup holds exactly ``matches``.
+        """
+
+        by_season: dict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+        for shots in matches:
+            match_season = season or season_of(shots.partido.fechaISO, start_month=self._season_start_month)
+            by_season[match_season][shots.partido.idPartido] = match_contribution(shots)
+
+        return [
+            self._update_season(competition, match_season, contributions, rebuild=rebuild)
+            for match_season, contributions in sorted(by_season.items())
+        ]
+
+    def _update_season(
+        self,
+        competition: str,
+        season: str,
+        new_contributions: dict[str, dict[str, Any]],
+        *,
+        rebuild: bool,
+    ) -> RollupResult:
+        rollup_path = self.rollup_path(competition, season)
+        contributions = {} if rebuild else self._load_contributions(competition, season)
+        changed = sorted(
+            match_id
+            for match_id, contribution in new_contributions.items()
+            if contributions.get(match_id, {}).get("checksum") != contribution["checksum"]
+        )
+        if not changed and not rebuild:
+            return RollupResult(
+                competition=competition,
+                season=season,
+                storage_path=rollup_path,
+                matches=len(contributions),
+                updated_matches=0,
+                skipped=True,
+            )
+
+        contributions.update(new_contributions)
+        rollup = build_rollup(competition, season, contributions)
+        rollup["actualizado"] = self._clock().isoformat()
+
+        # Primero el rollup: mientras no se guarden las contribuciones, la próxima ejecución
+        # sigue viendo estos partidos como cambiados y vuelve a subir el rollup.
+        self._upload(rollup_path, rollup)
+        self._upload(
+            self.contributions_path(competition, season),
+            {"version": ROLLUP_VERSION, "partidos": dict(sorted(contributions.items()))},
+        )
+        logger.info(
+            "Rollup de temporada actualizado",
+            extra={"competition": competition, "season": season, "updated_matches": len(changed)},
+        )
+        return RollupResult(
+            competition=competition,
+            season=season,
+            storage_path=rollup_path,
+            matches=len(contributions),
+            updated_matches=len(changed),
+        )
+
+    def _load_contributions(self, competition: str, season: str) -> dict[str, dict[str, Any]]:
+        path = self.contributions_path(competition, season)
+        content = self._retry_policy.call(lambda: self._storage.download(bucket=self._bucket, path=path))
+        if content is None:
+            return {}
+        try:
+            document = json.loads(content)
+        except ValueError:
+            logger.warning("Contribuciones del rollup ilegibles; se reconstruye", extra={"path": path})
+            return {}
+        if not isinstance(document, dict) or document.get("version") != ROLLUP_VERSION:
+            # Otra versión del formato: se reconstruye con los partidos recibidos.
+            return {}
+        return dict(document.get("partidos") or {})
+
+    def _upload(self, path: str, document: dict[str, Any]) -> None:
+        content = json.dumps(document, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        self._retry_policy.call(
+            lambda: self._storage.upload(
+                bucket=self._bucket,
+                path=path,
+                content=content,
+                content_type="application/json",
+                cache_control=ROLLUP_CACHE_CONTROL,
+            )
+        )
+
+
+def _empty_stats() -> dict[str, Any]:
+    return {"disparos": 0, "goles": 0, "xG": 0.0, "xGOT": 0.0, "situaciones": {}}
+
+
+def _add_shot(stats: dict[str, Any], situacion: str | None, goal: bool, xg: float, xgot: float | None) -> None:
+    stats["disparos"] += 1
+    stats["goles"] += int(goal)
+    stats["xG"] += xg
+    stats["xGOT"] += xgot or 0.0
+    breakdown = stats["situaciones"].setdefault(situacion or "Desconocida", {"disparos": 0, "goles": 0, "xG": 0.0})
+    breakdown["disparos"] += 1
+    breakdown["goles"] += int(goal)
+    breakdown["xG"] += xg
+
+
+def _merge_stats(total: dict[str, Any], stats: dict[str, Any]) -> None:
+    for key in ("disparos", "goles", "xG", "xGOT"):
+        total[key] += stats[key]
+    for situacion, breakdown in stats["situaciones"].items():
+        target = total["situaciones"].setdefault(situacion, {"disparos": 0, "goles": 0, "xG": 0.0})
+        for key in ("disparos", "goles", "xG"):
+            target[key] += breakdown[key]
+
+
+def _rounded(stats: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "disparos": stats["disparos"],
+        "goles": stats["goles"],
+        "xG": round(stats["xG"], 4),
+        "xGOT": round(stats["xGOT"], 4),
+        "situaciones": {
+            situacion: {**breakdown, "xG": round(breakdown["xG"], 4)}
+            for situacion, breakdown in sorted(stats["situaciones"].items())
+        },
+    }
+
+
+def _ranked(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    return sorted(rows, key=lambda row: (-row["xG"], row.get("equipo", ""), row.get("jugador", "")))
+
+
+def _path_segment(value: str) -> str:
+    segment = value.strip().replace("/", "-")
+    if not segment or segment in (".", ".."):
+        raise ValueError(f"Segmento de ruta inválido para el rollup: {value!r}")
+    return segment
+
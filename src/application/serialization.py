@@ -0,0 +1,149 @@
+"""Canonical JSON serialization engines for :class:`ShotsResponse` payloads.
+
+The canonical format is the one the publisher has always hashed: ``json.dumps`` of
+``model_dump(exclude_none=True)`` with ``sort_keys=True`` and default separators and
+``ensure_ascii``. ``matches_index.checksum`` values depend on it, so every engine here
+must produce exactly those bytes.
+"""
+from __future__ import annotations
+
+import json
+import math
+from json.encoder import encode_basestring_ascii
+from typing import Any, Protocol
+
+from src.models.schemas import Disparo, Marcador, Partido, ShotsResponse
+
+
+class ShotsSerializer(Protocol):
+    """Engine turning a validated ShotsResponse into canonical JSON bytes."""
+
+    def serialize(self, shots: ShotsResponse) -> bytes:  # pragma: no cover - protocol
+        ...
+
+
+class StdlibShotsSerializer:
+    """Reference engine: pydantic ``model_dump`` followed by stdlib ``json.dumps``."""
+
+    def serialize(self, shots: ShotsResponse) -> bytes:
+        return json.dumps(shots.model_dump(exclude_none=True), sort_keys=True).encode("utf-8")
+
+
+class CanonicalShotsSerializer:
+    """Single-pass engine that encodes straight from the model attributes.
+
+    It skips the intermediate ``model_dump`` dict tree and the per-object key sort: the
+    field order is fixed by the schema, so the sorted layout is precomputed. Values go
+    through the same primitives the stdlib C encoder uses (``encode_basestring_ascii``,
+    ``float.__repr__``, ``int.__repr__``), which keeps the output byte-identical.
+    Payloads built from subclasses or with unexpected value types fall back to
+    :class:`StdlibShotsSerializer`.
+    """
+
+    def __init__(self) -> None:
+        self._fallback = StdlibShotsSerializer()
+        self._shot_templates: dict[tuple[bool, bool, bool], str] = {}
+
+    def serialize(self, shots: ShotsResponse) -> bytes:
+        try:
+            return self._encode(shots).encode("ascii")
+        except _Unsupported:
+            return self._fallback.serialize(shots)
+
+    def _encode(self, shots: ShotsResponse) -> str:
+        if type(shots) is not ShotsResponse:
+            raise _Unsupported
+        partido = shots.partido
+        marcador = partido.marcadorFinal
+        if type(partido) is not Partido or type(marcador) is not Marcador:
+            raise _Unsupported
+
+        encode_shot = self._encode_shot
+        return (
+            '{"disparos": ['
+            + ", ".join([encode_shot(shot) for shot in shots.disparos])
+            + '], "partido": {"fechaISO": '
+            + _string(partido.fechaISO)
+            + ', "idPartido": '
+            + _string(partido.idPartido)
+            + ', "local": '
+            + _string(partido.local)
+            + ', "marcadorFinal": {"local": '
+            + _number(marcador.local)
+            + ', "visitante": '
+            + _number(marcador.visitante)
+            + '}, "visitante": '
+            + _string(partido.visitante)
+            + "}}"
+        )
+
+    def _encode_shot(self, shot: Disparo) -> str:
+        if type(shot) is not Disparo:
+            raise _Unsupported
+        values = shot.__dict__
+        situacion = values["situacion"]
+        tipo_disparo = values["tipo_disparo"]
+        xgot = values["xGOT"]
+
+        args = [
+            _string(values["equipo"]),
+            _string(values["jugador"]),
+            _number(values["minuto"]),
+            _string(values["resultado"]),
+        ]
+        if situacion is not None:
+            args.append(_string(situacion))
+        if tipo_disparo is not None:
+            args.append(_string(tipo_disparo))
+        args.append(_number(values["xG"]))
+        if xgot is not None:
+            args.append(_number(xgot))
+
+        return self._shot_template(situacion is not None, tipo_disparo is not None, xgot is not None) % tuple(args)
+
+    def _shot_template(self, has_situacion: bool, has_tipo: bool, has_xgot: bool) -> str:
+        key = (has_situacion, has_tipo, has_xgot)
+        template = self._shot_templates.get(key)
+        if template is None:
+            # Claves en el orden de sort_keys=True (comparación por code point)
+            members = ['"equipo": %s', '"jugador": %s', '"minuto": %s', '"resultado": %s']
+            if has_situacion:
+                members.append('"situacion": %s')
+            if has_tipo:
+                members.append('"tipo_disparo": %s')
+            members.append('"xG": %s')
+            if has_xgot:
+                members.append('"xGOT": %s')
+            template = self._shot_templates[key] = "{" + ", ".join(members) + "}"
+        return template
+
+
+class _Unsupported(Exception):
+    """Internal signal: the payload needs the reference engine."""
+
+
+_float_repr = float.__repr__
+_int_repr = int.__repr__
+_isfinite = math.isfinite
+
+
+def _string(value: Any) -> str:
+    if type(value) is not str:
+        raise _Unsupported
+    return encode_basestring_ascii(value)
+
+
+def _number(value: Any) -> str:
+    kind = type(value)
+    if kind is float:
+        if _isfinite(value):
+            return _float_repr(value)
+        if value != value:
+            return "NaN"
+        return "Infinity" if value > 0 else "-Infinity"
+    if kind is int:
+        return _int_repr(value)
+    raise _Unsupported
+
+
+DEFAULT_SERIALIZER: ShotsSerializer = CanonicalShotsSerializer()
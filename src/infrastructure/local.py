@@ -0,0 +1,163 @@
+"""Local adapters: shots files on disk and matches_index in SQLite (benchmarks, CI, offline runs)."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.application.resilience import TransientStorageError
+
+
+_INDEX_COLUMNS = (
+    "id",
+    "date",
+    "home",
+    "away",
+    "storage_path",
+    "size_bytes",
+    "checksum",
+    "raw_size_bytes",
+    "content_encoding",
+)
+_LOOKUP_COLUMNS = ("id", "storage_path", "checksum", "size_bytes", "content_encoding")
+
+
+class LocalFileStorageAdapter:
+    """Writes objects under ``root/<bucket>/<path>``; readers never see partial files.
+
+    Each upload goes to a temporary file in the destination directory and is moved into
+    place with ``os.replace``. ``durable=True`` also fsyncs the file before the rename.
+    """
+
+    def __init__(self, *, root: str | Path, durable: bool = False) -> None:
+        self._root = Path(root).resolve()
+        self._durable = durable
+
+    def upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        target = self.object_path(bucket=bucket, path=path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+                if self._durable:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            os.replace(tmp_name, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def download(self, *, bucket: str, path: str) -> bytes | None:
+        try:
+            return self.object_path(bucket=bucket, path=path).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def object_path(self, *, bucket: str, path: str) -> Path:
+        target = (self._root / bucket / path).resolve()
+        if not target.is_relative_to(self._root / bucket):
+            raise ValueError("La ruta de almacenamiento sale del directorio local")
+        return target
+
+
+class SqliteMatchesIndexRepository:
+    """Keeps matches_index rows in a SQLite file with the same upsert-by-id semantics."""
+
+    def __init__(self, *, path: str | Path) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS matches_index (
+                    id TEXT PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    home TEXT NOT NULL,
+                    away TEXT NOT NULL,
+                    storage_path TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    checksum TEXT NOT NULL,
+                    raw_size_bytes INTEGER,
+                    content_encoding TEXT
+                )
+                """
+            )
+
+    def upsert_match_index(self, *, record: dict[str, Any]) -> None:
+        self.upsert_match_indexes(records=[record])
+
+    def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        columns = ", ".join(_INDEX_COLUMNS)
+        placeholders = ", ".join("?" for _ in _INDEX_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in _INDEX_COLUMNS[1:])
+        rows = [tuple(_sqlite_value(record.get(column)) for column in _INDEX_COLUMNS) for record in records]
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    f"INSERT INTO matches_index ({columns}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                    rows,
+                )
+            except sqlite3.OperationalError as exc:
+                self._connection.execute("ROLLBACK")
+                # Otro proceso tiene la base bloqueada: se puede reintentar.
+                if "locked" in str(exc) or "busy" in str(exc):
+                    raise TransientStorageError("SQLite de matches_index ocupado") from exc
+                raise
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:
+        if not match_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in match_ids)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_LOOKUP_COLUMNS)} FROM matches_index WHERE id IN ({placeholders})",
+                [str(match_id) for match_id in match_ids],
+            ).fetchall()
+        return {row[0]: dict(zip(_LOOKUP_COLUMNS, row)) for row in rows}
+
+    def list_match_indexes(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_INDEX_COLUMNS)} FROM matches_index ORDER BY id"
+            ).fetchall()
+        return [dict(zip(_INDEX_COLUMNS, row)) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _sqlite_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -0,0 +1,99 @@
+"""In-memory adapters for the storage and matches index ports (tests, benchmarks, dry runs)."""
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+
+class InMemoryShotsStorage:
+    """Keeps uploaded objects in a dict keyed by ``(bucket, path)``."""
+
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.content_types: dict[tuple[str, str], str] = {}
+        self.content_encodings: dict[tuple[str, str], str | None] = {}
+        self.cache_controls: dict[tuple[str, str], str | None] = {}
+        self._lock = threading.Lock()
+
+    def upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        with self._lock:
+            self.objects[(bucket, path)] = content
+            self.content_types[(bucket, path)] = content_type
+            self.content_encodings[(bucket, path)] = content_encoding
+            self.cache_controls[(bucket, path)] = cache_control
+
+    def download(self, *, bucket: str, path: str) -> bytes | None:
+        with self._lock:
+            return self.objects.get((bucket, path))
+
+
+class InMemoryMatchesIndexRepository:
+    """Keeps matches_index rows in a dict keyed by ``id`` with upsert semantics."""
+
+    def __init__(self) -> None:
+        self.records: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def upsert_match_index(self, *, record: dict[str, Any]) -> None:
+        self.upsert_match_indexes(records=[record])
+
+    def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for record in records:
+                self.records[str(record["id"])] = dict(record)
+
+    def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {match_id: dict(self.records[match_id]) for match_id in match_ids if match_id in self.records}
+
+    def list_match_indexes(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dict(record) for record in self.records.values()]
+
+
+class AsyncInMemoryShotsStorage(InMemoryShotsStorage):
+    """Async facade over :class:`InMemoryShotsStorage`."""
+
+    async def upload(  # type: ignore[override]
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        super().upload(
+            bucket=bucket,
+            path=path,
+            content=content,
+            content_type=content_type,
+            content_encoding=content_encoding,
+            cache_control=cache_control,
+        )
+
+    async def download(self, *, bucket: str, path: str) -> bytes | None:  # type: ignore[override]
+        return super().download(bucket=bucket, path=path)
+
+
+class AsyncInMemoryMatchesIndexRepository(InMemoryMatchesIndexRepository):
+    """Async facade over :class:`InMemoryMatchesIndexRepository`."""
+
+    async def upsert_match_index(self, *, record: dict[str, Any]) -> None:  # type: ignore[override]
+        super().upsert_match_indexes(records=[record])
+
+    async def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:  # type: ignore[override]
+        super().upsert_match_indexes(records=records)
+
+    async def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:  # type: ignore[override]
+        return super().get_match_indexes(match_ids=match_ids)
@@ -5,41 +5,117 @@ import logging
 from typing import Any
 
 import httpx
+from postgrest.exceptions import APIError
+from storage3.exceptions import StorageApiError
 from supabase import Client
 
-try:  # pragma: no cover - supabase puede no exponer StorageException
-    from supabase.storage import StorageException
-except ImportError:  # pragma: no cover
-    StorageException = Exception  # type: ignore[assignment]
-
-from src.application.publish_shots import TransientStorageError
+from src.application.compression import stored_content_type
+from src.application.resilience import CircuitBreaker, TransientStorageError, circuit_breaker
+from src.infrastructure.supabase_common import DEFAULT_CACHE_CONTROL, SUPABASE_BREAKER, is_transient_status
 
 
 logger = logging.getLogger(__name__)
 
+_LOOKUP_COLUMNS = "id,storage_path,checksum,size_bytes,content_encoding"
+# PostgREST limita las filas por respuesta (1000 por defecto): el listado se pide por páginas.
+_LIST_PAGE_SIZE = 1000
+# Errores de PostgREST/Postgres que se resuelven solos: sin conexión a la base de datos,
+# caché de esquema recargándose, timeout de sentencia, conflicto de serialización o deadlock.
+_TRANSIENT_POSTGREST_CODES = frozenset({"PGRST000", "PGRST001", "PGRST002", "PGRST003", "57014", "53300", "40001", "40P01"})
+
 
 class SupabaseStorageAdapter:
     """Adapter that uploads binary objects to Supabase Storage."""
 
-    def __init__(self, *, client: Client, bucket: str) -> None:
+    def __init__(
+        self,
+        *,
+        client: Client,
+        bucket: str,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
         self._client = client
         self._bucket = bucket
+        self._breaker = breaker or circuit_breaker(SUPABASE_BREAKER)
+
+    def upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        with self._breaker.guard():
+            self._upload(
+                bucket=bucket,
+                path=path,
+                content=content,
+                content_type=content_type,
+                content_encoding=content_encoding,
+                cache_control=cache_control,
+            )
 
-    def upload(self, *, bucket: str, path: str, content: bytes, content_type: str) -> None:
+    def download(self, *, bucket: str, path: str) -> bytes | None:
         if bucket != self._bucket:
             raise ValueError("El bucket solicitado no coincide con la configuración del adaptador")
+        with self._breaker.guard():
+            try:
+                return self._client.storage.from_(self._bucket).download(path)
+            except StorageApiError as exc:
+                if is_transient_status(exc.status):
+                    raise TransientStorageError("Fallo temporal al descargar de Supabase Storage") from exc
+                if _is_not_found(exc):
+                    return None
+                logger.error(
+                    "Supabase Storage rechazó la descarga",
+                    extra={"bucket": bucket, "path": path, "status_code": exc.status},
+                )
+                raise RuntimeError("Supabase Storage rechazó la descarga del fichero") from exc
+            except (httpx.RequestError, TimeoutError) as exc:  # pragma: no cover - depende de supabase
+                logger.exception("Error descargando fichero de Supabase Storage", extra={"bucket": bucket, "path": path})
+                raise TransientStorageError("Fallo temporal al descargar de Supabase Storage") from exc
 
+    def _upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        if bucket != self._bucket:
+            raise ValueError("El bucket solicitado no coincide con la configuración del adaptador")
+
+        file_options = {
+            "content-type": stored_content_type(content_type, content_encoding),
+            "cache-control": cache_control or DEFAULT_CACHE_CONTROL,
+            "upsert": "true",  # el SDK espera valores string en cabeceras
+        }
         try:
             self._client.storage.from_(self._bucket).upload(
                 path=path,
                 file=content,
-                file_options={
-                    "content-type": content_type,
-                    "cache-control": "max-age=31536000",
-                    "upsert": "true",  # el SDK espera valores string en cabeceras
-                },
+                file_options=file_options,
             )
-        except (StorageException, httpx.RequestError, TimeoutError) as exc:  # pragma: no cover - depende de supabase
+        except StorageApiError as exc:
+            # Como en el adaptador asíncrono: solo 408, 429 y 5xx se reintentan.
+            if is_transient_status(exc.status):
+                logger.error(
+                    "Supabase Storage respondió con un error temporal",
+                    extra={"bucket": bucket, "path": path, "status_code": exc.status},
+                )
+                raise TransientStorageError("Fallo temporal al subir a Supabase Storage") from exc
+            logger.error(
+                "Supabase Storage rechazó la subida",
+                extra={"bucket": bucket, "path": path, "status_code": exc.status},
+            )
+            raise RuntimeError("Supabase Storage rechazó la subida del fichero") from exc
+        except (httpx.RequestError, TimeoutError) as exc:  # pragma: no cover - depende de supabase
             logger.exception(
                 "Error subiendo fichero a Supabase Storage",
                 extra={
@@ -50,32 +126,133 @@ class SupabaseStorageAdapter:
             raise TransientStorageError("Fallo temporal al subir a Supabase Storage") from exc
 
 
+def _is_not_found(exc: StorageApiError) -> bool:
+    # Storage responde 400/404 "Object not found" según la versión.
+    return str(exc.status) == "404" or "not found" in str(exc.message).lower()
+
+
+def _is_transient_api_error(exc: APIError) -> bool:
+    # Sin cuerpo JSON (p.ej. un 503 del gateway) postgrest deja el estado HTTP en ``code``;
+    # con cuerpo JSON trae el código de PostgREST o de Postgres.
+    return is_transient_status(exc.code) or str(exc.code) in _TRANSIENT_POSTGREST_CODES
+
+
 class SupabaseMatchesIndexRepository:
     """Adapter that persists metadata in the matches_index table."""
 
-    def __init__(self, *, client: Client) -> None:
+    def __init__(self, *, client: Client, breaker: CircuitBreaker | None = None) -> None:
         self._client = client
+        self._breaker = breaker or circuit_breaker(SUPABASE_BREAKER)
 
     def upsert_match_index(self, *, record: dict[str, Any]) -> None:
+        self._upsert([record], log_extra={"match_id": record.get("id")})
+
+    def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        self._upsert(records, log_extra={"match_ids": [record.get("id") for record in records]})
+
+    def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:
+        if not match_ids:
+            return {}
+        with self._breaker.guard():
+            return self._select(match_ids)
+
+    def list_match_indexes(self) -> list[dict[str, Any]]:
+        """Every row of matches_index, read in pages ordered by ``id``."""
+
+        rows: list[dict[str, Any]] = []
+        while True:
+            with self._breaker.guard():
+                page = self._select_page(len(rows))
+            rows.extend(page)
+            if len(page) < _LIST_PAGE_SIZE:
+                return rows
+
+    def _select_page(self, offset: int) -> list[dict[str, Any]]:
+        try:
+            response = (
+                self._client.table("matches_index")
+                .select("*")
+                .order("id")
+                .range(offset, offset + _LIST_PAGE_SIZE - 1)
+                .execute()
+            )
+        except httpx.RequestError as exc:  # pragma: no cover - depende de supabase
+            logger.exception("Error temporal al listar matches_index", extra={"offset": offset})
+            raise TransientStorageError("Fallo temporal al acceder a Supabase Database") from exc
+        except APIError as exc:
+            if not _is_transient_api_error(exc):
+                raise
+            logger.error("Supabase Database respondió con un error temporal", extra={"offset": offset, "code": exc.code})
+            raise TransientStorageError("Fallo temporal al acceder a Supabase Database") from exc
+        return list(response.data or [])
+
+    def _select(self, match_ids: list[str]) -> dict[str, dict[str, Any]]:
         try:
-            serializable_record = {
-                **record,
-                "date": record["date"].isoformat(),
-            }
+            response = (
+                self._client.table("matches_index")
+                .select(_LOOKUP_COLUMNS)
+                .in_("id", match_ids)
+                .execute()
+            )
+        except httpx.RequestError as exc:  # pragma: no cover - depende de supabase
+            logger.exception(
+                "Error temporal al acceder a matches_index",
+                extra={"match_ids": match_ids},
+            )
+            raise TransientStorageError("Fallo temporal al acceder a Supabase Database") from exc
+        except APIError as exc:
+            if not _is_transient_api_error(exc):
+                raise
+            logger.error(
+                "Supabase Database respondió con un error temporal",
+                extra={"match_ids": match_ids, "code": exc.code},
+            )
+            raise TransientStorageError("Fallo temporal al acceder a Supabase Database") from exc
+        return {str(row["id"]): row for row in response.data or []}
+
+    def _upsert(self, records: list[dict[str, Any]], *, log_extra: dict[str, Any]) -> None:
+        with self._breaker.guard():
+            self._send_upsert(records, log_extra=log_extra)
+
+    def _send_upsert(self, records: list[dict[str, Any]], *, log_extra: dict[str, Any]) -> None:
+        try:
+            serializable_records = [
+                {
+                    **record,
+                    "date": record["date"].isoformat(),
+                }
+                for record in records
+            ]
+            payload = serializable_records[0] if len(serializable_records) == 1 else serializable_records
             (
                 self._client.table("matches_index")
-                .upsert(serializable_record, on_conflict="id")
+                .upsert(payload, on_conflict="id")
                 .execute()
             )
         except httpx.RequestError as exc:  # pragma: no cover - depende de supabase
             logger.exception(
                 "Error temporal al acceder a matches_index",
-                extra={"match_id": record.get("id")},
+                extra=log_extra,
             )
             raise TransientStorageError("Fallo temporal al acceder a Supabase Database") from exc
+        except APIError as exc:
+            # Como en el adaptador asíncrono: 408, 429 y 5xx se reintentan y cuentan para el circuito.
+            if _is_transient_api_error(exc):
+                logger.error(
+                    "Supabase Database respondió con un error temporal",
+                    extra={**log_extra, "code": exc.code},
+                )
+                raise TransientStorageError("Fallo temporal al acceder a Supabase Database") from exc
+            logger.error(
+                "Supabase Database rechazó el índice",
+                extra={**log_extra, "code": exc.code},
+            )
+            raise RuntimeError("No se pudo registrar el índice de partido") from exc
         except Exception as exc:  # pragma: no cover - defensivo
             logger.exception(
                 "Fallo no recuperable al registrar el índice",
-                extra={"match_id": record.get("id")},
+                extra=log_extra,
             )
             raise RuntimeError("No se pudo registrar el índice de partido") from exc
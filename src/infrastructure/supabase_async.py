@@ -0,0 +1,231 @@
+"""Async infrastructure adapters talking to Supabase over a shared pooled ``httpx.AsyncClient``.
+
+The supabase-py SDK is blocking, so these adapters call the Storage and PostgREST HTTP APIs
+directly. A single client (and therefore a single connection pool) is meant to be shared by
+every adapter in the process.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+
+from src.application.compression import stored_content_type
+from src.application.resilience import CircuitBreaker, TransientStorageError, circuit_breaker
+from src.infrastructure.supabase_common import DEFAULT_CACHE_CONTROL, SUPABASE_BREAKER, is_transient_status
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+
+
+def create_supabase_http_client(
+    *,
+    url: str,
+    service_key: str,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+) -> httpx.AsyncClient:
+    """Build the pooled async client authenticated with the service role key."""
+
+    return httpx.AsyncClient(
+        base_url=url.rstrip("/"),
+        headers={
+            "apikey": service_key,
+            "Authorization": f"Bearer {service_key}",
+        },
+        timeout=httpx.Timeout(timeout),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+    )
+
+
+class AsyncSupabaseStorageAdapter:
+    """Async adapter that uploads binary objects to Supabase Storage."""
+
+    def __init__(
+        self,
+        *,
+        client: httpx.AsyncClient,
+        bucket: str,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self._client = client
+        self._bucket = bucket
+        self._breaker = breaker or circuit_breaker(SUPABASE_BREAKER)
+
+    async def upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        with self._breaker.guard():
+            await self._upload(
+                bucket=bucket,
+                path=path,
+                content=content,
+                content_type=content_type,
+                content_encoding=content_encoding,
+                cache_control=cache_control,
+            )
+
+    async def download(self, *, bucket: str, path: str) -> bytes | None:
+        if bucket != self._bucket:
+            raise ValueError("El bucket solicitado no coincide con la configuración del adaptador")
+        with self._breaker.guard():
+            return await self._download(path)
+
+    async def _download(self, path: str) -> bytes | None:
+        try:
+            # aiter_raw: los bytes tal y como se subieron, sin deshacer su Content-Encoding.
+            async with self._client.stream("GET", f"/storage/v1/object/{quote(self._bucket)}/{quote(path)}") as response:
+                if is_transient_status(response.status_code):
+                    raise TransientStorageError("Fallo temporal al descargar de Supabase Storage")
+                # Storage responde 400 "Object not found" en algunas versiones.
+                if response.status_code in (400, 404):
+                    return None
+                if response.is_error:
+                    raise RuntimeError("Supabase Storage rechazó la descarga del fichero")
+                return b"".join([chunk async for chunk in response.aiter_raw()])
+        except httpx.RequestError as exc:
+            logger.exception("Error descargando fichero de Supabase Storage", extra={"path": path})
+            raise TransientStorageError("Fallo temporal al descargar de Supabase Storage") from exc
+
+    async def _upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        if bucket != self._bucket:
+            raise ValueError("El bucket solicitado no coincide con la configuración del adaptador")
+
+        headers = {
+            "content-type": stored_content_type(content_type, content_encoding),
+            "cache-control": cache_control or DEFAULT_CACHE_CONTROL,
+            "x-upsert": "true",
+        }
+        try:
+            response = await self._client.post(
+                f"/storage/v1/object/{quote(self._bucket)}/{quote(path)}",
+                content=content,
+                headers=headers,
+            )
+        except httpx.RequestError as exc:
+            logger.exception(
+                "Error subiendo fichero a Supabase Storage",
+                extra={
+                    "bucket": bucket,
+                    "path": path,
+                },
+            )
+            raise TransientStorageError("Fallo temporal al subir a Supabase Storage") from exc
+
+        if is_transient_status(response.status_code):
+            logger.error(
+                "Supabase Storage respondió con un error temporal",
+                extra={"bucket": bucket, "path": path, "status_code": response.status_code},
+            )
+            raise TransientStorageError("Fallo temporal al subir a Supabase Storage")
+        if response.is_error:
+            logger.error(
+                "Supabase Storage rechazó la subida",
+                extra={"bucket": bucket, "path": path, "status_code": response.status_code},
+            )
+            raise RuntimeError("Supabase Storage rechazó la subida del fichero")
+
+
+class AsyncSupabaseMatchesIndexRepository:
+    """Async adapter that persists metadata in the matches_index table through PostgREST."""
+
+    TABLE = "matches_index"
+
+    def __init__(self, *, client: httpx.AsyncClient, breaker: CircuitBreaker | None = None) -> None:
+        self._client = client
+        self._breaker = breaker or circuit_breaker(SUPABASE_BREAKER)
+
+    async def upsert_match_index(self, *, record: dict[str, Any]) -> None:
+        await self._upsert([record], log_extra={"match_id": record.get("id")})
+
+    async def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        await self._upsert(records, log_extra={"match_ids": [record.get("id") for record in records]})
+
+    async def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:
+        if not match_ids:
+            return {}
+        with self._breaker.guard():
+            return await self._select(match_ids)
+
+    async def _select(self, match_ids: list[str]) -> dict[str, dict[str, Any]]:
+        quoted_ids = ",".join('"{}"'.format(match_id.replace('"', '\\"')) for match_id in match_ids)
+        try:
+            response = await self._client.get(
+                f"/rest/v1/{self.TABLE}",
+                params={"select": "id,storage_path,checksum,size_bytes,content_encoding", "id": f"in.({quoted_ids})"},
+            )
+        except httpx.RequestError as exc:
+            logger.exception(
+                "Error temporal al acceder a matches_index",
+                extra={"match_ids": match_ids},
+            )
+            raise TransientStorageError("Fallo temporal al acceder a Supabase Database") from exc
+
+        if is_transient_status(response.status_code):
+            raise TransientStorageError("Fallo temporal al acceder a Supabase Database")
+        response.raise_for_status()
+        return {str(row["id"]): row for row in response.json()}
+
+    async def _upsert(self, records: list[dict[str, Any]], *, log_extra: dict[str, Any]) -> None:
+        with self._breaker.guard():
+            await self._send_upsert(records, log_extra=log_extra)
+
+    async def _send_upsert(self, records: list[dict[str, Any]], *, log_extra: dict[str, Any]) -> None:
+        serializable_records = [
+            {
+                **record,
+                "date": record["date"].isoformat(),
+            }
+            for record in records
+        ]
+        try:
+            response = await self._client.post(
+                f"/rest/v1/{self.TABLE}",
+                params={"on_conflict": "id"},
+                json=serializable_records,
+                headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+            )
+        except httpx.RequestError as exc:
+            logger.exception(
+                "Error temporal al acceder a matches_index",
+                extra=log_extra,
+            )
+            raise TransientStorageError("Fallo temporal al acceder a Supabase Database") from exc
+
+        if is_transient_status(response.status_code):
+            logger.error("Error temporal al acceder a matches_index", extra=log_extra)
+            raise TransientStorageError("Fallo temporal al acceder a Supabase Database")
+        if response.is_error:
+            logger.error(
+                "Fallo no recuperable al registrar el índice",
+                extra={**log_extra, "status_code": response.status_code},
+            )
+            raise RuntimeError("No se pudo registrar el índice de partido")
@@ -0,0 +1,22 @@
+"""Settings shared by the sync and async Supabase adapters."""
+from __future__ import annotations
+
+from typing import Any
+
+
+# Un Supabase caído abre el circuito para todos los adaptadores, síncronos y asíncronos.
+SUPABASE_BREAKER = "supabase"
+
+# Los ficheros por partido son inmutables salvo republicación: caché larga por defecto.
+DEFAULT_CACHE_CONTROL = "max-age=31536000"
+
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_transient_status(status: Any) -> bool:
+    """True for HTTP statuses worth retrying; the SDK reports some of them as strings."""
+
+    try:
+        return int(status) in TRANSIENT_STATUS_CODES
+    except (TypeError, ValueError):
+        return False
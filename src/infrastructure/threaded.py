@@ -0,0 +1,54 @@
+"""Async facades that run blocking storage/index adapters in worker threads.
+
+They let the async publisher and endpoints use the local and in-memory backends, which
+share their state with the sync publisher when wrapped around the same instances.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from src.application.publish_shots import MatchesIndexRepository, ShotsStorage
+
+
+class ThreadedShotsStorage:
+    """:class:`AsyncShotsStorage` over a blocking :class:`ShotsStorage`."""
+
+    def __init__(self, storage: ShotsStorage) -> None:
+        self._storage = storage
+
+    async def upload(
+        self,
+        *,
+        bucket: str,
+        path: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        options: dict[str, Any] = {"content_type": content_type}
+        if content_encoding is not None:
+            options["content_encoding"] = content_encoding
+        if cache_control is not None:
+            options["cache_control"] = cache_control
+        await asyncio.to_thread(self._storage.upload, bucket=bucket, path=path, content=content, **options)
+
+    async def download(self, *, bucket: str, path: str) -> bytes | None:
+        return await asyncio.to_thread(self._storage.download, bucket=bucket, path=path)
+
+
+class ThreadedMatchesIndexRepository:
+    """:class:`AsyncMatchesIndexRepository` over a blocking :class:`MatchesIndexRepository`."""
+
+    def __init__(self, repository: MatchesIndexRepository) -> None:
+        self._repository = repository
+
+    async def upsert_match_index(self, *, record: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._repository.upsert_match_index, record=record)
+
+    async def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:
+        await asyncio.to_thread(self._repository.upsert_match_indexes, records=records)
+
+    async def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return await asyncio.to_thread(self._repository.get_match_indexes, match_ids=match_ids)
@@ -0,0 +1,425 @@
+"""Write-behind decorator for the matches index port.
+
+Publishers hand their index records to :class:`WriteBehindMatchesIndex`, which returns
+immediately. A background thread coalesces records by ``id`` and flushes them to the
+wrapped repository as multi-row upserts once ``max_batch`` records are pending or the
+oldest one has waited ``max_delay`` seconds. Transient failures (``TransientStorageError``,
+``CircuitOpenError``) are retried with exponential backoff, and with a ``journal_path``
+pending records survive a crash or a failed shutdown flush: they are replayed on the next
+start. Any other failure is permanent: the batch is split in halves until the records that
+fail on their own are isolated. Those are logged, dropped and, with a ``journal_path``,
+appended to ``<journal_path>.dead`` so they can be inspected and replayed by hand.
+
+Several processes (e.g. uvicorn workers) may share one ``journal_path``. Each writer keeps
+its own journal next to it, ``<stem>.<pid>-<token><suffix>``, guarded by an exclusive
+``flock`` on a ``.lock`` file held for the writer's lifetime. On start, a writer adopts
+every sibling journal whose lock it can take, because its owner has exited: it replays the
+records into its own journal and then deletes the orphan. Without ``fcntl`` (Windows) the
+writer uses ``journal_path`` directly, and only one process may use it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable
+
+from src.application.publish_shots import MatchesIndexRepository
+from src.application.resilience import CircuitOpenError, TransientStorageError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindMatchesIndex:
+    """:class:`MatchesIndexRepository` that buffers upserts and flushes them in the background."""
+
+    DEFAULT_MAX_BATCH = 200
+    DEFAULT_MAX_DELAY_SECONDS = 1.0
+
+    def __init__(
+        self,
+        repository: MatchesIndexRepository,
+        *,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+        journal_path: str | Path | None = None,
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._repository = repository
+        self._max_batch = max(1, max_batch)
+        self._max_delay = max(0.0, max_delay)
+        self._initial_backoff = retry_backoff
+        self._max_backoff = max_retry_backoff
+        self._clock = clock
+
+        self._condition = threading.Condition()
+        self._pending: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._in_flight: dict[str, dict[str, Any]] = {}
+        self._oldest_at: float | None = None
+        self._retry_at = 0.0
+        self._backoff = retry_backoff
+        self._flush_requested = False
+        self._closed = False
+
+        self._journal_path: Path | None = None
+        self._dead_letter_path: Path | None = None
+        self._journal: IO[str] | None = None
+        self._journal_lock: int | None = None
+        self._journal_lines = 0
+        if journal_path is not None:
+            self._replay_journal(Path(journal_path))
+
+        self._thread = threading.Thread(target=self._run, name="matches-index-writer", daemon=True)
+        self._thread.start()
+
+    # -- MatchesIndexRepository -------------------------------------------------------
+
+    def upsert_match_index(self, *, record: dict[str, Any]) -> None:
+        self.upsert_match_indexes(records=[record])
+
+    def upsert_match_indexes(self, *, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("El indexador diferido está cerrado")
+            self._append_journal(records)
+            for record in records:
+                match_id = str(record["id"])
+                self._pending.pop(match_id, None)
+                self._pending[match_id] = dict(record)
+            if self._oldest_at is None:
+                self._oldest_at = self._clock()
+            self._condition.notify_all()
+
+    def get_match_indexes(self, *, match_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Pending and in-flight records win over the wrapped repository (read-your-writes)."""
+
+        found: dict[str, dict[str, Any]] = {}
+        with self._condition:
+            for match_id in match_ids:
+                record = self._pending.get(match_id) or self._in_flight.get(match_id)
+                if record is not None:
+                    found[match_id] = dict(record)
+        missing = [match_id for match_id in match_ids if match_id not in found]
+        if missing:
+            found.update(self._repository.get_match_indexes(match_ids=missing))
+        return found
+
+    def list_match_indexes(self) -> list[dict[str, Any]]:
+        """Rows of the wrapped repository overlaid with the pending and in-flight records."""
+
+        # Primero lo pendiente: un lote que termina de volcarse entretanto aparece en ambos lados.
+        with self._condition:
+            overlay = {**self._in_flight, **self._pending}
+            overlay = {match_id: dict(record) for match_id, record in overlay.items()}
+        rows = {str(row["id"]): row for row in self._repository.list_match_indexes()}  # type: ignore[attr-defined]
+        rows.update(overlay)
+        return list(rows.values())
+
+    # -- lifecycle --------------------------------------------------------------------
+
+    @property
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending) + len(self._in_flight)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Ask the worker to flush everything now; True once nothing is pending."""
+
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending or self._in_flight:
+                if not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(0.1 if remaining is None else min(remaining, 0.1))
+            return True
+
+    def close(self, timeout: float | None = 10.0) -> bool:
+        """Flush what is pending and stop the worker; unflushed records stay in the journal."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        with self._condition:
+            drained = not self._pending and not self._in_flight
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+                if drained and self._journal_lock is not None:
+                    # Journal vacío: se borra mientras se tiene el cerrojo para no dejar restos.
+                    _remove_journal(self._journal_path)
+            if self._journal_lock is not None:
+                os.close(self._journal_lock)
+                self._journal_lock = None
+        if not drained:
+            logger.warning(
+                "El indexador diferido se cerró con registros pendientes",
+                extra={"pending": self.pending_count, "journal": str(self._journal_path)},
+            )
+        return drained
+
+    # -- worker -----------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._ready():
+                    if self._closed and not self._pending:
+                        return
+                    self._condition.wait(self._wait_timeout())
+                batch: dict[str, dict[str, Any]] = {}
+                while self._pending and len(batch) < self._max_batch:
+                    match_id, record = self._pending.popitem(last=False)
+                    batch[match_id] = record
+                self._in_flight = batch
+                self._oldest_at = self._clock() if self._pending else None
+
+            try:
+                rejected = self._upsert_isolating(list(batch.values()))
+            except (TransientStorageError, CircuitOpenError):
+                logger.warning(
+                    "Falló el volcado diferido de matches_index; se reintentará",
+                    exc_info=True,
+                    extra={"records": len(batch), "retry_in": self._backoff},
+                )
+                with self._condition:
+                    self._requeue(batch)
+                    self._retry_at = self._clock() + self._backoff
+                    self._backoff = min(self._backoff * 2, self._max_backoff)
+                    self._condition.notify_all()
+                    if self._closed:
+                        return
+                continue
+
+            if rejected:
+                self._dead_letter(rejected)
+            with self._condition:
+                self._in_flight = {}
+                self._backoff = self._initial_backoff
+                self._retry_at = 0.0
+                if not self._pending:
+                    self._flush_requested = False
+                if self._journal is not None and (not self._pending or self._journal_lines > 4 * self._max_batch):
+                    self._rewrite_journal()
+                self._condition.notify_all()
+
+    def _upsert_isolating(self, records: list[dict[str, Any]]) -> list[tuple[dict[str, Any], Exception]]:
+        """Upsert ``records``; return the ones that fail permanently on their own.
+
+        Transient errors propagate so the caller requeues the whole batch. Records already
+        written by then are written again on the retry, which is harmless for an upsert.
+        """
+
+        try:
+            self._repository.upsert_match_indexes(records=records)
+        except (TransientStorageError, CircuitOpenError):
+            raise
+        except Exception as exc:
+            if len(records) == 1:
+                return [(records[0], exc)]
+            middle = len(records) // 2
+            return self._upsert_isolating(records[:middle]) + self._upsert_isolating(records[middle:])
+        return []
+
+    def _dead_letter(self, rejected: list[tuple[dict[str, Any], Exception]]) -> None:
+        for record, error in rejected:
+            logger.error(
+                "Registro de matches_index rechazado; se descarta sin reintentar",
+                exc_info=error,
+                extra={"match_id": record.get("id"), "dead_letter": str(self._dead_letter_path)},
+            )
+        if self._dead_letter_path is None:
+            return
+        lines = "".join(_dead_letter_line(record, error) + "\n" for record, error in rejected)
+        try:
+            with self._dead_letter_path.open("a", encoding="utf-8") as handle:
+                if fcntl is not None:
+                    # Varios procesos comparten el fichero: una escritura completa cada vez.
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                handle.write(lines)
+                handle.flush()
+        except OSError:
+            logger.exception("No se pudo escribir la dead-letter de matches_index", extra={"records": len(rejected)})
+
+    def _ready(self) -> bool:
+        if not self._pending or self._clock() < self._retry_at:
+            return False
+        if self._closed or self._flush_requested or len(self._pending) >= self._max_batch:
+            return True
+        return self._oldest_at is not None and self._clock() - self._oldest_at >= self._max_delay
+
+    def _wait_timeout(self) -> float | None:
+        if not self._pending:
+            return None
+        now = self._clock()
+        if now < self._retry_at:
+            return self._retry_at - now
+        if self._oldest_at is None:
+            return self._max_delay
+        return max(0.0, self._oldest_at + self._max_delay - now)
+
+    def _requeue(self, batch: dict[str, dict[str, Any]]) -> None:
+        # Lo que llegó durante el volcado es más reciente: no se pisa.
+        for match_id in reversed(list(batch)):
+            if match_id not in self._pending:
+                self._pending[match_id] = batch[match_id]
+                self._pending.move_to_end(match_id, last=False)
+        self._in_flight = {}
+        self._oldest_at = self._oldest_at if self._oldest_at is not None else self._clock()
+
+    # -- journal ----------------------------------------------------------------------
+
+    def _replay_journal(self, base_path: Path) -> None:
+        base_path.parent.mkdir(parents=True, exist_ok=True)
+        self._dead_letter_path = base_path.with_name(base_path.name + ".dead")
+        if fcntl is None:  # pragma: no cover - Windows
+            self._journal_path = base_path
+            self._load_journal(base_path)
+            self._rewrite_journal()
+            return
+
+        own_path = base_path.with_name(f"{base_path.stem}.{os.getpid()}-{uuid.uuid4().hex[:8]}{base_path.suffix}")
+        self._journal_lock = _try_lock(own_path)
+        if self._journal_lock is None:
+            raise RuntimeError(f"No se pudo bloquear el journal de matches_index {own_path}")
+        self._journal_path = own_path
+
+        adopted: list[tuple[Path, int]] = []
+        for path in _sibling_journals(base_path):
+            if path == own_path:
+                continue
+            lock = _try_lock(path)
+            if lock is None:
+                continue  # Su proceso sigue vivo y lo está usando.
+            self._load_journal(path)
+            adopted.append((path, lock))
+        # Primero se guardan los registros en el journal propio y luego se borran los huérfanos.
+        self._rewrite_journal()
+        for path, lock in adopted:
+            _remove_journal(path)
+            os.close(lock)
+
+    def _load_journal(self, path: Path) -> None:
+        if not path.exists():
+            return
+        loaded = 0
+        with path.open("r", encoding="utf-8") as handle:
+            for number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = _decode_record(line)
+                except (ValueError, KeyError):
+                    # Una última línea a medias tras un corte de luz no invalida el resto.
+                    logger.warning(
+                        "Línea inválida en el journal de matches_index",
+                        extra={"journal": str(path), "line": number},
+                    )
+                    continue
+                self._pending.pop(str(record["id"]), None)
+                self._pending[str(record["id"])] = record
+                loaded += 1
+        if loaded:
+            self._oldest_at = self._clock()
+            logger.info(
+                "Recuperados registros pendientes de matches_index",
+                extra={"journal": str(path), "records": loaded},
+            )
+
+    def _append_journal(self, records: list[dict[str, Any]]) -> None:
+        if self._journal is None:
+            return
+        self._journal.write("".join(_encode_record(record) + "\n" for record in records))
+        self._journal.flush()
+        self._journal_lines += len(records)
+
+    def _rewrite_journal(self) -> None:
+        """Compact the journal down to the records still pending."""
+
+        assert self._journal_path is not None
+        if self._journal is not None:
+            self._journal.close()
+        tmp_path = self._journal_path.with_name(self._journal_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            handle.write("".join(_encode_record(record) + "\n" for record in self._pending.values()))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self._journal_path)
+        self._journal = self._journal_path.open("a", encoding="utf-8")
+        self._journal_lines = len(self._pending)
+
+
+def _sibling_journals(base_path: Path) -> list[Path]:
+    """``base_path`` itself (single-process layout) plus the per-process journals next to it."""
+
+    siblings = base_path.parent.glob(f"{base_path.stem}.*{base_path.suffix}")
+    return [base_path] + sorted(path for path in siblings if not path.name.endswith((".lock", ".tmp", ".dead")))
+
+
+def _try_lock(journal_path: Path) -> int | None:
+    """Exclusive ``flock`` on the journal's lock file, or ``None`` if another process holds it."""
+
+    lock_path = journal_path.with_name(journal_path.name + ".lock")
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        # Quien lo adoptó antes pudo borrarlo entre el open y el flock: el cerrojo sería de un fichero huérfano.
+        if os.fstat(fd).st_ino != os.stat(lock_path).st_ino:
+            raise FileNotFoundError(lock_path)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _remove_journal(journal_path: Path) -> None:
+    for path in (journal_path, journal_path.with_name(journal_path.name + ".lock")):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _encode_record(record: dict[str, Any]) -> str:
+    datetimes = sorted(key for key, value in record.items() if isinstance(value, datetime))
+    values = {key: value.isoformat() if key in datetimes else value for key, value in record.items()}
+    return json.dumps({"record": values, "datetimes": datetimes}, ensure_ascii=False, separators=(",", ":"))
+
+
+def _dead_letter_line(record: dict[str, Any], error: Exception) -> str:
+    try:
+        entry = json.loads(_encode_record(record))
+    except (TypeError, ValueError):
+        # El propio registro puede ser lo que no se serializa.
+        entry = {"record": repr(record)}
+    entry["error"] = f"{type(error).__name__}: {error}"
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode_record(line: str) -> dict[str, Any]:
+    entry = json.loads(line)
+    record = dict(entry["record"])
+    for key in entry.get("datetimes", []):
+        record[key] = datetime.fromisoformat(record[key])
+    return record
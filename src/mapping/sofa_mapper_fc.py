@@ -1,8 +1,12 @@
 # src/mapping/sofa_mapper_fc.py
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Union
 import math
-from src.scraper.sofascore_fc import SofaClient
+from src.scraper import sofascore_event
+
+# Súbelo cuando cambie la salida del mapper: invalida la normalización incremental.
+MAPPER_VERSION = "1"
 
 def _safe_float(v: Any, default: float = 0.0) -> float:
     try:
@@ -44,24 +48,74 @@ _BODY_MAP = {
     "head": "Cabeza",
 }
 
+# Hay unas decenas de valores distintos por temporada y miles de jugadores: las cachés
+# acotadas cubren un lote entero sin crecer sin límite en procesos largos.
+NORMALIZER_CACHE_SIZE = 1024
+NAME_CACHE_SIZE = 16384
+
+def _memoized(maxsize: int) -> Callable[[Callable[[Any], str]], Callable[[Any], str]]:
+    """
+    lru_cache para normalizadores de un argumento. Los valores repetidos devuelven el mismo
+    objeto str; los no hashables (p.ej. un dict inesperado) se normalizan sin caché.
+    """
+    def decorator(func: Callable[[Any], str]) -> Callable[[Any], str]:
+        # typed: 1, 1.0 y True no deben compartir entrada (str() los distingue)
+        cached = lru_cache(maxsize=maxsize, typed=True)(func)
+
+        @wraps(func)
+        def wrapper(value: Any) -> str:
+            try:
+                return cached(value)
+            except TypeError:
+                return func(value)
+
+        wrapper.cache_info = cached.cache_info  # type: ignore[attr-defined]
+        wrapper.cache_clear = cached.cache_clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+@_memoized(NORMALIZER_CACHE_SIZE)
 def _norm_situation(s: Optional[str]) -> str:
     if not s:
         return "Desconocida"
     s = str(s).strip().lower()
     return _SITUATION_MAP.get(s, s.capitalize())
 
+@_memoized(NORMALIZER_CACHE_SIZE)
 def _norm_resultado(s: Optional[str]) -> str:
     if not s:
         return "Desconocido"
     s = str(s).strip().lower()
     return _RESULTADO_MAP.get(s, s.capitalize())
 
+@_memoized(NORMALIZER_CACHE_SIZE)
 def _norm_bodypart(s: Optional[str]) -> str:
     if not s:
         return "Otro"
     s = str(s).strip().lower()
     return _BODY_MAP.get(s, "Otro")
 
+@_memoized(NAME_CACHE_SIZE)
+def _intern_name(name: str) -> str:
+    # Identidad cacheada: el primer objeto visto se reutiliza para todas las copias iguales
+    # (json.loads crea un str nuevo por aparición).
+    return name
+
+def clear_normalization_caches() -> None:
+    """Vacía las cachés de normalizadores y nombres (p.ej. entre lotes independientes)."""
+    for func in (_norm_situation, _norm_resultado, _norm_bodypart, _intern_name):
+        func.cache_clear()  # type: ignore[attr-defined]
+
+def normalization_cache_info() -> Dict[str, Any]:
+    """Aciertos/fallos por caché, para perfilar lotes grandes."""
+    return {
+        "situacion": _norm_situation.cache_info(),  # type: ignore[attr-defined]
+        "resultado": _norm_resultado.cache_info(),  # type: ignore[attr-defined]
+        "tipo_disparo": _norm_bodypart.cache_info(),  # type: ignore[attr-defined]
+        "nombres": _intern_name.cache_info(),  # type: ignore[attr-defined]
+    }
+
 def _minute(time_val: Any, added_time_val: Any) -> int:
     base = _safe_int(time_val, 0)
     # addedTime puede ser float/NaN; solo sumar si es número válido
@@ -89,9 +143,14 @@ def _shots_array(shots: Union[List[Dict[str, Any]], Dict[str, Any]]) -> List[Dic
                 return v
     return []
 
+def _player_name(player: Any) -> str:
+    # En DataFrames de ScraperFC un jugador ausente llega como NaN, no como dict
+    if not isinstance(player, dict):
+        return "Anónimo"
+    return _intern_name(player.get("name") or player.get("shortName") or "Anónimo")
+
 def _map_one_shot(raw: Dict[str, Any], home_name: str, away_name: str) -> Dict[str, Any]:
-    player = raw.get("player") or {}
-    jugador = player.get("name") or player.get("shortName") or "Anónimo"
+    jugador = _player_name(raw.get("player"))
 
     is_home = bool(raw.get("isHome"))
     equipo = home_name if is_home else away_name
@@ -115,6 +174,95 @@ def _map_one_shot(raw: Dict[str, Any], home_name: str, away_name: str) -> Dict[s
         "tipo_disparo": tipo_disparo,
     }
 
+def _is_frame(shots: Any) -> bool:
+    # Duck typing para no importar pandas en la ruta por filas
+    return hasattr(shots, "columns") and hasattr(shots, "to_numpy")
+
+def _numeric_column(df: Any, name: str) -> Any:
+    """Columna como float64 con NaN/inf/no numéricos a 0.0 (equivale a _safe_float por fila)."""
+    import numpy as np
+    import pandas as pd
+
+    if name not in df.columns:
+        return np.zeros(len(df), dtype=float)
+    values = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isfinite(values), values, 0.0)
+
+def _translated_column(df: Any, name: str, normalizer: Any) -> List[str]:
+    """Aplica un normalizador una vez por valor distinto y lo expande por códigos."""
+    import numpy as np
+    import pandas as pd
+
+    if name not in df.columns:
+        return [normalizer(None)] * len(df)
+    values = df[name].to_numpy(dtype=object)
+    try:
+        codes, uniques = pd.factorize(values)
+    except TypeError:  # valores no hashables: ruta por fila
+        return [normalizer(v) for v in values]
+    translated = np.array([normalizer(u) for u in uniques] + [None], dtype=object)[codes]
+    # Los nulos (código -1) se resuelven uno a uno: None y NaN no normalizan igual
+    for position in np.flatnonzero(codes == -1):
+        translated[position] = normalizer(values[position])
+    return translated.tolist()
+
+def map_shots_frame(df: Any, home_name: str, away_name: str) -> List[Dict[str, Any]]:
+    """
+    Versión columnar de _map_one_shot para el DataFrame de ScraperFC.
+
+    La limpieza numérica y el redondeo de minuto + tiempo añadido se hacen sobre arrays
+    y las traducciones de situación/resultado/parte del cuerpo como mapas por columna;
+    los dicts solo se construyen al final. La salida es idéntica a la ruta por filas.
+    """
+    import numpy as np
+
+    n = len(df)
+    if n == 0:
+        return []
+
+    if "time" in df.columns:
+        import pandas as pd
+
+        raw_time = pd.to_numeric(df["time"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        base = np.where(np.isfinite(raw_time), np.round(raw_time), 0.0)
+    else:
+        base = np.zeros(n, dtype=float)
+    minutos = np.round(base + _numeric_column(df, "addedTime")).astype(np.int64).tolist()
+
+    if "isHome" in df.columns:
+        is_home = np.array([bool(v) for v in df["isHome"].to_numpy(dtype=object)], dtype=bool)
+    else:
+        is_home = np.zeros(n, dtype=bool)
+    # Lista de Python y no np.where(...).tolist(): así cada fila comparte el objeto del nombre
+    equipos = [home_name if home else away_name for home in is_home.tolist()]
+
+    if "player" in df.columns:
+        jugadores = [_player_name(p) for p in df["player"].to_numpy(dtype=object)]
+    else:
+        jugadores = ["Anónimo"] * n
+
+    xgs = _numeric_column(df, "xg").tolist()
+    xgots = _numeric_column(df, "xgot").tolist()
+    situaciones = _translated_column(df, "situation", _norm_situation)
+    resultados = _translated_column(df, "shotType", _norm_resultado)
+    tipos = _translated_column(df, "bodyPart", _norm_bodypart)
+
+    return [
+        {
+            "minuto": minuto,
+            "equipo": equipo,
+            "jugador": jugador,
+            "xG": xg,
+            "xGOT": xgot,
+            "situacion": situacion,
+            "resultado": resultado,
+            "tipo_disparo": tipo_disparo,
+        }
+        for minuto, equipo, jugador, xg, xgot, situacion, resultado, tipo_disparo in zip(
+            minutos, equipos, jugadores, xgs, xgots, situaciones, resultados, tipos
+        )
+    ]
+
 def _to_iso8601(v: str) -> str:
     if v is None:
         return "1970-01-01T00:00:00Z"
@@ -128,23 +276,27 @@ def _to_iso8601(v: str) -> str:
 
 def map_event_to_contract(
     event: Dict[str, Any],
-    shots: Union[List[Dict[str, Any]], Dict[str, Any], None] = None,
+    shots: Union[List[Dict[str, Any]], Dict[str, Any], "pandas.DataFrame", None] = None,
 ) -> Dict[str, Any]:
     """
     Normaliza datos del partido y los disparos al contrato ShotsResponse.
+    ``shots`` puede ser la lista/dict bruto o directamente el DataFrame de
+    ScraperFC (ruta columnar, ver map_shots_frame).
     """
-    c = SofaClient()
-
     # ---- Partido
-    home, away = c.teams(event)
-    event_id = str(c.event_id(event))
-    date_iso_raw = c.start_iso(event) or "1970-01-01T00:00:00Z"
+    home, away = sofascore_event.teams(event)
+    home, away = _intern_name(home), _intern_name(away)
+    event_id = str(sofascore_event.event_id(event))
+    date_iso_raw = sofascore_event.start_iso(event) or "1970-01-01T00:00:00Z"
     date_iso = _to_iso8601(date_iso_raw)
-    home_score, away_score = c.final_score(event)
+    home_score, away_score = sofascore_event.final_score(event)
 
     # ---- Disparos
-    arr = _shots_array(shots or [])
-    disparos = [_map_one_shot(s, home, away) for s in arr]
+    if _is_frame(shots):
+        disparos = map_shots_frame(shots, home, away)
+    else:
+        arr = _shots_array(shots or [])
+        disparos = [_map_one_shot(s, home, away) for s in arr]
 
     return {
         "partido": {
@@ -1,34 +1,52 @@
 # src/match_cli.py
 from pathlib import Path
+from typing import Optional
 import json
 import typer
 from rich import print
-from src.scraper.sofascore_fc import SofaClient
+from src.application.raw_archive import EVENT, RawArchive
+from src.observability.profiling import PROFILE_ENV_VAR, profile_run, stage
+from src.scraper.sofascore_event import match_id_from
+from src.scraper.sofascore_fc import ResponseCache, SofaClient
 
 def main(
     match: str = typer.Argument(..., help="Id del partido o URL canónica con '#id:<num>'"),
     out: Path = typer.Option("data/raw_event.json", "--out", "-o", help="Ruta del JSON bruto"),
+    cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", envvar="SOFA_CACHE_DIR", help="Caché en disco de respuestas de SofaScore (partidos terminados no caducan)"),
+    archive: Optional[Path] = typer.Option(None, "--archive", file_okay=False, help="Añade el evento a un archivo empaquetado en lugar de escribir --out"),
+    profile: bool = typer.Option(False, "--profile", envvar=PROFILE_ENV_VAR, help="Guarda un perfil cProfile y los tiempos por etapa en <salida>/profiles"),
 ):
     """
     D01 — Obtener evento bruto desde Sofascore (ScraperFC.get_match_dict) y guardarlo.
     Ejemplos:
       py -m src.match_cli 14566650 --out "data\\raw\\event_14566650.json"
       python -m src.match_cli "https://.../UHsrgb#id:14566650" -o "data\\raw\\event_14566650.json"
+      python -m src.match_cli 14566650 -o "data/raw/event_14566650.json" --profile
+      python -m src.match_cli 14566650 --archive "data/raw.archive"
     """
-    c = SofaClient()
+    # Los perfiles nunca van dentro del archivo empaquetado: solo contiene segmentos e índice.
+    with profile_run("match", archive.parent if archive is not None else out.parent, enabled=profile) as run:
+        c = SofaClient(cache=ResponseCache(cache_dir) if cache_dir else None)
 
-    # Wrapper FASE 0: acepta id numérico o URL con '#id:'
-    get_event = getattr(c, "event_from_match", None) or getattr(c, "event_from_url", None)
-    if not callable(get_event):
-        raise RuntimeError("SofaClient necesita event_from_match o event_from_url.")
+        # Wrapper FASE 0: acepta id numérico o URL con '#id:'
+        get_event = getattr(c, "event_from_match", None) or getattr(c, "event_from_url", None)
+        if not callable(get_event):
+            raise RuntimeError("SofaClient necesita event_from_match o event_from_url.")
 
-    event = get_event(match)
+        event = get_event(match)
 
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(event, ensure_ascii=False, indent=2), encoding="utf-8")
+        with stage("write_json"):
+            if archive is not None:
+                with RawArchive(archive) as raw_archive:
+                    raw_archive.append(EVENT, match_id_from(match), event)
+            else:
+                out.parent.mkdir(parents=True, exist_ok=True)
+                out.write_text(json.dumps(event, ensure_ascii=False, indent=2), encoding="utf-8")
 
     # Nota DX: si vienes con URL sin '#id:', ScraperFC 3.3.4 no extrae el id.
-    print(f"[green]OK[/green] - Evento guardado en {out}")
+    print(f"[green]OK[/green] - Evento guardado en {archive or out}")
+    if run is not None:
+        print(f"Perfil guardado en {run.json_path}")
 
 if __name__ == "__main__":
     # Modo comando único (evita el problema de subcomandos)
@@ -1,40 +1,95 @@
 # src/match_normalize_cli.py
 from pathlib import Path
-import json
+from typing import Optional
 import typer
 from rich import print
-from src.mapping.sofa_mapper_fc import map_event_to_contract
-from src.models.schemas import ShotsResponse
+from src.application.normalize_matches import (
+    MatchInputPair,
+    NormalizationReport,
+    archive_pair,
+    discover_archive_pairs,
+    discover_pairs,
+    load_manifest,
+    normalize_many,
+    normalize_pair,
+)
+from src.observability.profiling import PROFILE_ENV_VAR, ProfileRun, profile_run
 
 def main(
-    event_raw_file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Ruta al JSON bruto del evento"),
-    shots_raw_file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Ruta al JSON bruto de los disparos"),
+    event_raw_file: Optional[Path] = typer.Argument(None, exists=True, dir_okay=False, help="Ruta al JSON bruto del evento"),
+    shots_raw_file: Optional[Path] = typer.Argument(None, exists=True, dir_okay=False, help="Ruta al JSON bruto de los disparos"),
     out_dir: Path = typer.Option(Path("data/matches"), "--out-dir", "-o", help="Directorio de salida"),
+    raw_dir: Optional[Path] = typer.Option(None, "--raw-dir", exists=True, file_okay=False, help="Modo lote: directorio con event_<id>.json + shots_<id>.json"),
+    manifest: Optional[Path] = typer.Option(None, "--manifest", exists=True, dir_okay=False, help="Modo lote: JSON con una lista de {'event': ..., 'shots': ...}"),
+    archive: Optional[Path] = typer.Option(None, "--archive", exists=True, file_okay=False, help="Lee de un archivo empaquetado (scrape_cli --archive); todos los partidos o solo --match"),
+    match_id: Optional[str] = typer.Option(None, "--match", help="Con --archive: normaliza solo este id de partido"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", min=1, help="Procesos en modo lote (por defecto, nº de CPUs)"),
+    incremental: bool = typer.Option(False, "--incremental", help="Modo lote: omite partidos cuyas entradas y versión del mapper no han cambiado"),
+    state_file: Optional[Path] = typer.Option(None, "--state-file", dir_okay=False, help="Estado incremental (por defecto <out-dir>/.normalize_state.json)"),
+    profile: bool = typer.Option(False, "--profile", envvar=PROFILE_ENV_VAR, help="Guarda un perfil cProfile y los tiempos por etapa en <salida>/profiles"),
 ):
     """
     D02 — Normaliza un evento bruto al contrato ShotsResponse (FASE 0: partido + disparos = []).
     Ejemplos:
       py -m src.match_normalize_cli data\\raw\\event_14566650.json data\\raw\\shots_14566650.json -o data\\matches
       python -m src.match_normalize_cli "data/raw/event_14566650.json" "data/raw/shots_14566650.json" --out-dir "data/matches"
+      python -m src.match_normalize_cli --raw-dir "data/raw" --out-dir "data/matches" --workers 8
+      python -m src.match_normalize_cli --raw-dir "data/raw" --out-dir "data/matches" --incremental
+      python -m src.match_normalize_cli --raw-dir "data/raw" --out-dir "data/matches" --profile
+      python -m src.match_normalize_cli --archive "data/raw.archive" --out-dir "data/matches" --incremental
+      python -m src.match_normalize_cli --archive "data/raw.archive" --match 14566650
     """
-    # 1) Cargar evento bruto
-    event = json.loads(event_raw_file.read_text(encoding="utf-8"))
-    shots = json.loads(shots_raw_file.read_text(encoding="utf-8"))
+    batch_modes = [m for m in (raw_dir, manifest, archive) if m is not None]
+    single_mode = event_raw_file is not None or shots_raw_file is not None
 
+    if len(batch_modes) > 1 or (batch_modes and single_mode):
+        raise typer.BadParameter("Usa ficheros sueltos, --raw-dir, --manifest o --archive, pero solo uno de ellos.")
+    if match_id is not None and archive is None:
+        raise typer.BadParameter("--match solo se usa junto con --archive.")
+    if (incremental or state_file is not None) and (not batch_modes or match_id is not None):
+        raise typer.BadParameter("--incremental y --state-file solo se usan en modo lote (--raw-dir, --manifest o --archive sin --match).")
 
+    if match_id is not None:
+        with profile_run("normalize", out_dir, enabled=profile) as run:
+            out_path = normalize_pair(archive_pair(archive, match_id), out_dir)
+        print(f"[green]OK[/green] - Normalizado guardado en [bold]{out_path}[/bold]")
+        _print_profile(run)
+        return
 
-    # 2) Mapear -> dict con {partido, disparos: []}
-    normalized = map_event_to_contract(event, shots)
+    if not batch_modes:
+        if event_raw_file is None or shots_raw_file is None:
+            raise typer.BadParameter("Indica el JSON del evento y el de disparos, o usa --raw-dir/--manifest.")
+        # Un solo partido: cargar, mapear, validar y persistir por idPartido
+        with profile_run("normalize", out_dir, enabled=profile) as run:
+            out_path = normalize_pair(MatchInputPair(event_path=event_raw_file, shots_path=shots_raw_file), out_dir)
+        print(f"[green]OK[/green] - Normalizado guardado en [bold]{out_path}[/bold]")
+        _print_profile(run)
+        return
 
-    # 3) Validar con Pydantic
-    model = ShotsResponse.model_validate(normalized)
+    with profile_run("normalize", out_dir, enabled=profile) as run:
+        if archive is not None:
+            pairs = discover_archive_pairs(archive)
+        else:
+            pairs = discover_pairs(raw_dir) if raw_dir is not None else load_manifest(manifest)
+        report = normalize_many(pairs, out_dir, workers=workers, incremental=incremental, state_path=state_file)
+    _print_report(report)
+    _print_profile(run)
+    if report.failed:
+        raise typer.Exit(code=1)
 
-    # 4) Persistir con nombre por idPartido
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"match_{model.partido.idPartido}.json"
-    out_path.write_text(json.dumps(normalized, ensure_ascii=False, indent=2), encoding="utf-8")
+def _print_report(report: NormalizationReport) -> None:
+    for outcome in report.failed:
+        print(f"[red]ERROR[/red] - {outcome.pair.event_path} / {outcome.pair.shots_path}: {outcome.error}")
+    print(
+        f"[green]{len(report.succeeded) - len(report.skipped)}[/green] normalizados, "
+        f"{len(report.skipped)} sin cambios, "
+        f"[red]{len(report.failed)}[/red] fallidos en {report.elapsed_seconds:.2f}s "
+        f"({report.throughput:.1f} partidos/s)"
+    )
 
-    print(f"[green]OK[/green] - Normalizado guardado en [bold]{out_path}[/bold]")
+def _print_profile(run: Optional[ProfileRun]) -> None:
+    if run is not None:
+        print(f"Perfil guardado en {run.json_path} (cProfile solo cubre el proceso principal; usa --workers 1 para verlo todo)")
 
 if __name__ == "__main__":
     # Modo comando único (funciona igual que tu match_cli.py)
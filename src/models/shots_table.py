@@ -0,0 +1,183 @@
+"""Columnar in-memory representation of the shots of one or many matches.
+
+:class:`ShotsTable` stores every :class:`Disparo` field as one column: ``minuto`` in a
+64-bit integer array, ``xG`` / ``xGOT`` in float64 arrays (with a null mask for ``xGOT``)
+and the string fields as 32-bit codes into shared :class:`StringPool` instances. A season
+of matches then costs a few dozen bytes per shot instead of a pydantic object plus its
+strings, and each team or player name is stored once.
+
+Matches are kept in order; ``offsets[i]:offsets[i + 1]`` is the slice of rows of match
+``i``. Conversion to and from :class:`ShotsResponse` is lossless (floats keep their exact
+bits, ``None`` stays ``None``).
+"""
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+from src.models.schemas import Disparo, Partido, ShotsResponse
+
+
+STRING_FIELDS = ("equipo", "jugador", "situacion", "resultado", "tipo_disparo")
+
+
+class StringPool:
+    """Interned strings addressed by dense integer codes; code 0 is ``None``."""
+
+    __slots__ = ("_values", "_codes")
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self._values: list[str | None] = [None]
+        self._codes: dict[str, int] = {}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value: str | None) -> int:
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def decode(self, code: int) -> str | None:
+        return self._values[code]
+
+    @property
+    def values(self) -> Sequence[str | None]:
+        return self._values
+
+    def __len__(self) -> int:
+        return len(self._values) - 1
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._codes
+
+
+class ShotsTable:
+    """Column-oriented container of the shots of several matches."""
+
+    def __init__(self) -> None:
+        self.partidos: list[Partido] = []
+        self.offsets = array("q", [0])
+        self.minuto = array("q")
+        self.xG = array("d")
+        self.xGOT = array("d")
+        self.xGOT_present = bytearray()
+        # Un pool compartido por columna: los equipos no se mezclan con los jugadores.
+        self.pools: dict[str, StringPool] = {name: StringPool() for name in STRING_FIELDS}
+        self.codes: dict[str, array] = {name: array("I") for name in STRING_FIELDS}
+
+    # -- construcción -----------------------------------------------------------------
+
+    @classmethod
+    def from_response(cls, response: ShotsResponse) -> "ShotsTable":
+        table = cls()
+        table.append(response)
+        return table
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[ShotsResponse]) -> "ShotsTable":
+        table = cls()
+        for response in responses:
+            table.append(response)
+        return table
+
+    @classmethod
+    def from_json_files(cls, paths: Iterable[Path]) -> "ShotsTable":
+        """Load normalized ``match_<id>.json`` files one at a time (one match in memory at once)."""
+
+        table = cls()
+        for path in paths:
+            table.append(ShotsResponse.model_validate_json(Path(path).read_bytes()))
+        return table
+
+    def append(self, response: ShotsResponse) -> None:
+        """Add one match at the end of the table."""
+
+        pools = self.pools
+        codes = self.codes
+        for disparo in response.disparos:
+            self.minuto.append(disparo.minuto)
+            self.xG.append(disparo.xG)
+            if disparo.xGOT is None:
+                self.xGOT.append(0.0)
+                self.xGOT_present.append(0)
+            else:
+                self.xGOT.append(disparo.xGOT)
+                self.xGOT_present.append(1)
+            for name in STRING_FIELDS:
+                codes[name].append(pools[name].encode(getattr(disparo, name)))
+        self.partidos.append(response.partido)
+        self.offsets.append(len(self.minuto))
+
+    # -- lectura ----------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        """Number of shots (rows) across every match."""
+
+        return len(self.minuto)
+
+    @property
+    def match_count(self) -> int:
+        return len(self.partidos)
+
+    def match_rows(self, index: int) -> range:
+        return range(self.offsets[index], self.offsets[index + 1])
+
+    def row(self, position: int) -> dict[str, Any]:
+        """Field values of one shot, as accepted by :class:`Disparo`."""
+
+        values: dict[str, Any] = {
+            "minuto": self.minuto[position],
+            "xG": self.xG[position],
+            "xGOT": self.xGOT[position] if self.xGOT_present[position] else None,
+        }
+        for name in STRING_FIELDS:
+            values[name] = self.pools[name].decode(self.codes[name][position])
+        return values
+
+    def column(self, name: str) -> list[Any]:
+        """Decoded values of one column (``None`` where a value is missing)."""
+
+        if name in self.pools:
+            decode = self.pools[name].values
+            return [decode[code] for code in self.codes[name]]
+        if name == "xGOT":
+            return [value if present else None for value, present in zip(self.xGOT, self.xGOT_present)]
+        if name in ("minuto", "xG"):
+            return list(getattr(self, name))
+        raise KeyError(name)
+
+    def to_columns(self) -> dict[str, list[Any]]:
+        """Plain columns plus ``idPartido`` per row, e.g. for ``pandas.DataFrame(...)``."""
+
+        match_ids: list[str] = []
+        for index, partido in enumerate(self.partidos):
+            match_ids.extend([partido.idPartido] * len(self.match_rows(index)))
+        columns: dict[str, list[Any]] = {"idPartido": match_ids}
+        for name in Disparo.model_fields:
+            columns[name] = self.column(name)
+        return columns
+
+    def iter_disparos(self, index: int) -> Iterator[Disparo]:
+        for position in self.match_rows(index):
+            values = self.row(position)
+            # Los datos ya se validaron al construir la tabla: no se revalidan.
+            yield Disparo.model_construct(**{key: value for key, value in values.items() if value is not None})
+
+    def to_response(self, index: int) -> ShotsResponse:
+        return ShotsResponse.model_construct(partido=self.partidos[index], disparos=list(self.iter_disparos(index)))
+
+    def to_responses(self) -> Iterator[ShotsResponse]:
+        for index in range(self.match_count):
+            yield self.to_response(index)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the column buffers (the string pools are not counted)."""
+
+        arrays = [self.offsets, self.minuto, self.xG, self.xGOT, *self.codes.values()]
+        return sum(column.itemsize * len(column) for column in arrays) + len(self.xGOT_present)
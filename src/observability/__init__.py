@@ -0,0 +1,5 @@
+"""In-process metrics for the publish path, exposed in Prometheus text format."""
+
+from .metrics import REGISTRY, Counter, Histogram, MetricsRegistry
+
+__all__ = ["REGISTRY", "Counter", "Histogram", "MetricsRegistry"]
@@ -0,0 +1,205 @@
+"""Opt-in profiling of CLI and batch runs.
+
+:func:`profile_run` wraps a whole command: it runs it under :mod:`cProfile` and collects
+per-stage wall-clock timings recorded with :func:`stage`. On exit it writes, next to the
+command outputs::
+
+    <out_dir>/profiles/<command>_<UTC timestamp>.prof   # pstats, e.g. snakeviz / python -m pstats
+    <out_dir>/profiles/<command>_<UTC timestamp>.json   # stages + top functions, for comparisons
+
+:func:`stage` is a no-op (a single global lookup) when no run is being profiled, so the
+instrumented code paths cost nothing in normal runs. Stages are recorded from any thread;
+work done in other processes is merged with :func:`merge_stages`.
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, ContextManager, Iterator, Mapping
+
+
+PROFILE_ENV_VAR = "SHOTS_PROFILE"  # activa --profile en los CLI sin tocar la línea de comandos
+PROFILE_DIRNAME = "profiles"
+TOP_FUNCTIONS = 40
+
+
+class StageTimer:
+    """Thread-safe accumulator of wall-clock seconds per named stage."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # nombre -> [llamadas, segundos totales, máximo]
+        self._stages: dict[str, list[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            entry = self._stages.get(name)
+            if entry is None:
+                entry = self._stages[name] = [0, 0.0, 0.0]
+            entry[0] += count
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds / count if count else seconds)
+
+    def merge(self, timings: Mapping[str, float]) -> None:
+        """Add one sample per stage, e.g. the timings a worker process sent back."""
+
+        for name, seconds in timings.items():
+            self.add(name, seconds)
+
+    def totals(self) -> dict[str, float]:
+        with self._lock:
+            return {name: entry[1] for name, entry in self._stages.items()}
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            items = sorted(self._stages.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            name: {
+                "count": int(count),
+                "total_seconds": round(total, 6),
+                "mean_ms": round(1000 * total / count, 3) if count else 0.0,
+                "max_ms": round(1000 * longest, 3),
+            }
+            for name, (count, total, longest) in items
+        }
+
+
+_active: StageTimer | None = None
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time ``name`` into the run being profiled; does nothing otherwise."""
+
+    timer = _active
+    if timer is None:
+        return nullcontext()
+    return timer.stage(name)
+
+
+def merge_stages(timings: Mapping[str, float]) -> None:
+    """Merge stage timings measured elsewhere (another process) into the active run."""
+
+    timer = _active
+    if timer is not None:
+        timer.merge(timings)
+
+
+def profiling_enabled() -> bool:
+    """True while a :func:`profile_run` is active in this process."""
+
+    return _active is not None
+
+
+@contextmanager
+def collect_stages() -> Iterator[StageTimer]:
+    """Record stages into a fresh timer, e.g. in a worker process of a profiled batch."""
+
+    global _active
+    previous = _active
+    timer = _active = StageTimer()
+    try:
+        yield timer
+    finally:
+        _active = previous
+
+
+class ProfileRun:
+    """Handle on one profiled command; the output paths are set once it finishes."""
+
+    def __init__(self, command: str, out_dir: Path) -> None:
+        self.command = command
+        self.out_dir = Path(out_dir)
+        self.timer = StageTimer()
+        self.profiler = cProfile.Profile()
+        self.started_at = datetime.now(timezone.utc)
+        self.json_path: Path | None = None
+        self.stats_path: Path | None = None
+
+    def write(self, wall_seconds: float, **extra: Any) -> Path:
+        directory = self.out_dir / PROFILE_DIRNAME
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.command}_{self.started_at.strftime('%Y%m%dT%H%M%S%fZ')}"
+        self.stats_path = directory / f"{stem}.prof"
+        self.json_path = directory / f"{stem}.json"
+
+        self.profiler.dump_stats(self.stats_path)
+        report = {
+            "command": self.command,
+            "argv": sys.argv,
+            "started_at": self.started_at.isoformat(),
+            "wall_seconds": round(wall_seconds, 6),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pid": os.getpid(),
+            "stages": self.timer.as_dict(),
+            "top_functions": _top_functions(self.profiler),
+            "cprofile_file": self.stats_path.name,
+            **extra,
+        }
+        self.json_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        return self.json_path
+
+
+@contextmanager
+def profile_run(command: str, out_dir: Path, *, enabled: bool = True) -> Iterator[ProfileRun | None]:
+    """Profile the wrapped block when ``enabled``; yields ``None`` otherwise.
+
+    The files are written even if the block raises, so a failing run can be inspected too.
+    Only one run can be active per process. cProfile only sees the calling thread; stage
+    timings also cover worker threads and, through :func:`collect_stages`, processes.
+    """
+
+    global _active
+    if not enabled:
+        yield None
+        return
+    if _active is not None:
+        raise RuntimeError("Ya hay una ejecución perfilándose en este proceso")
+
+    run = ProfileRun(command, out_dir)
+    _active = run.timer
+    started = time.perf_counter()
+    failed = True
+    run.profiler.enable()
+    try:
+        yield run
+        failed = False
+    finally:
+        run.profiler.disable()
+        _active = None
+        run.write(time.perf_counter() - started, failed=failed)
+
+
+def _top_functions(profiler: cProfile.Profile, limit: int = TOP_FUNCTIONS) -> list[dict[str, Any]]:
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():  # type: ignore[attr-defined]
+        rows.append(
+            {
+                "function": function,
+                "file": filename,
+                "line": line,
+                "calls": ncalls,
+                "self_seconds": round(tottime, 6),
+                "cumulative_seconds": round(cumtime, 6),
+            }
+        )
+    rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+    return rows[:limit]
@@ -0,0 +1,57 @@
+"""Metric families recorded by the shots publishers."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .metrics import COUNT_BUCKETS, REGISTRY, SIZE_BUCKETS, Counter, Histogram, MetricsRegistry
+
+
+@dataclass(frozen=True)
+class PublishMetrics:
+    """Handles on the publish-path metrics of one registry."""
+
+    stage_seconds: Histogram
+    retries: Counter
+    failures: Counter
+    results: Counter
+    payload_bytes: Histogram
+    shots_per_match: Histogram
+
+    @classmethod
+    def create(cls, registry: MetricsRegistry = REGISTRY) -> "PublishMetrics":
+        return cls(
+            stage_seconds=registry.histogram(
+                "shots_publish_stage_seconds",
+                "Duración de cada etapa de la publicación de disparos.",
+                ("stage",),
+            ),
+            retries=registry.counter(
+                "shots_publish_retries_total",
+                "Reintentos por error temporal del backend, por operación y tipo de error.",
+                ("operation", "error"),
+            ),
+            failures=registry.counter(
+                "shots_publish_failures_total",
+                "Publicaciones fallidas por etapa y tipo de error.",
+                ("stage", "error"),
+            ),
+            results=registry.counter(
+                "shots_publish_results_total",
+                "Partidos procesados por resultado (published, skipped, failed).",
+                ("outcome",),
+            ),
+            payload_bytes=registry.histogram(
+                "shots_publish_payload_bytes",
+                "Tamaño del fichero de disparos: JSON canónico (raw) y objeto almacenado (stored).",
+                ("kind",),
+                buckets=SIZE_BUCKETS,
+            ),
+            shots_per_match=registry.histogram(
+                "shots_publish_shots_per_match",
+                "Número de disparos por partido publicado.",
+                buckets=COUNT_BUCKETS,
+            ),
+        )
+
+
+DEFAULT_PUBLISH_METRICS = PublishMetrics.create()
@@ -0,0 +1,45 @@
+# src/parquet_cli.py
+from pathlib import Path
+from typing import List, Optional
+import typer
+from rich import print
+from src.application.parquet_export import export_shots_parquet
+from src.application.season_rollups import load_matches
+
+def main(
+    match_files: Optional[List[Path]] = typer.Argument(None, exists=True, dir_okay=False, help="Ficheros match_<id>.json normalizados a exportar"),
+    competition: str = typer.Option(..., "--competition", "-c", help="Competición de los partidos (p.ej. laliga)"),
+    matches_dir: Optional[Path] = typer.Option(None, "--matches-dir", exists=True, file_okay=False, help="Directorio con ficheros match_<id>.json"),
+    out_dir: Path = typer.Option(Path("data/parquet"), "--out", "-o", help="Raíz del dataset Parquet particionado"),
+    season: Optional[str] = typer.Option(None, "--season", help="Temporada (p.ej. 2024-2025); por defecto se deduce de la fecha de cada partido"),
+):
+    """
+    Exporta disparos normalizados a Parquet particionado por competición y temporada (una fila por disparo).
+    Los partidos ya exportados se reemplazan por idPartido; las particiones sin partidos nuevos no se tocan.
+    Requiere el paquete opcional pyarrow.
+    Ejemplos:
+      python -m src.parquet_cli --competition laliga --matches-dir "data/matches" --out "data/parquet"
+      python -m src.parquet_cli "data/matches/match_14566650.json" --competition laliga
+    """
+    paths = list(match_files or [])
+    if matches_dir is not None:
+        paths.extend(sorted(matches_dir.glob("match_*.json")))
+    if not paths:
+        raise typer.BadParameter("Indica ficheros match_<id>.json o --matches-dir.")
+
+    try:
+        results = export_shots_parquet(load_matches(paths), out_dir, competition=competition, season=season)
+    except RuntimeError as e:
+        print(f"[red]ERROR[/red] {e}")
+        raise typer.Exit(code=1)
+    for result in results:
+        if result.skipped:
+            print(f"[yellow]SIN CAMBIOS[/yellow] - {result.path} ({result.matches} partidos)")
+        else:
+            print(
+                f"[green]OK[/green] - {result.path}: {result.updated_matches} partidos actualizados, "
+                f"{result.matches} partidos y {result.rows} disparos en total"
+            )
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,46 @@
+# src/rollup_cli.py
+from pathlib import Path
+from typing import List, Optional
+import typer
+from rich import print
+from src.application.season_rollups import SeasonRollupPublisher, load_matches
+
+def main(
+    match_files: Optional[List[Path]] = typer.Argument(None, exists=True, dir_okay=False, help="Ficheros match_<id>.json normalizados a incorporar"),
+    competition: str = typer.Option(..., "--competition", "-c", help="Competición del rollup (p.ej. laliga)"),
+    matches_dir: Optional[Path] = typer.Option(None, "--matches-dir", exists=True, file_okay=False, help="Directorio con todos los match_<id>.json de la competición"),
+    season: Optional[str] = typer.Option(None, "--season", help="Temporada (p.ej. 2024-2025); por defecto se deduce de la fecha de cada partido"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Ignora las contribuciones guardadas y reconstruye el rollup solo con estos partidos"),
+):
+    """
+    Actualiza los rollups por competición/temporada (totales por jugador y equipo) en el bucket de disparos.
+    Ejemplos:
+      python -m src.rollup_cli --competition laliga --matches-dir "data/matches" --rebuild
+      python -m src.rollup_cli "data/matches/match_14566650.json" --competition laliga
+    """
+    paths = list(match_files or [])
+    if matches_dir is not None:
+        paths.extend(sorted(matches_dir.glob("match_*.json")))
+    if not paths:
+        raise typer.BadParameter("Indica ficheros match_<id>.json o --matches-dir.")
+
+    # La configuración del backend (Supabase, local o memoria) es la misma que la de la API.
+    from src.api.dependencies import get_settings, get_shots_storage
+
+    settings = get_settings()
+    publisher = SeasonRollupPublisher(
+        storage=get_shots_storage(),
+        bucket=settings.supabase_bucket,
+        retry_policy=settings.retry_policy,
+    )
+    for result in publisher.update(competition, load_matches(paths), season=season, rebuild=rebuild):
+        if result.skipped:
+            print(f"[yellow]SIN CAMBIOS[/yellow] - {result.storage_path} ({result.matches} partidos)")
+        else:
+            print(
+                f"[green]OK[/green] - {result.storage_path}: {result.updated_matches} partidos actualizados, "
+                f"{result.matches} en total"
+            )
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,63 @@
+# src/scrape_cli.py
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import List, Optional
+import typer
+from rich import print
+from src.application.raw_archive import RawArchive
+from src.scraper.batch import FetchReport, fetch_matches, read_match_list
+from src.observability.profiling import PROFILE_ENV_VAR, profile_run
+from src.scraper.sofascore_fc import ResponseCache, SofaClient
+
+def main(
+    matches: Optional[List[str]] = typer.Argument(None, help="Ids o URLs canónicas con '#id:<num>'; usa '-' para leer de stdin"),
+    matches_file: Optional[Path] = typer.Option(None, "--file", "-f", exists=True, dir_okay=False, help="Fichero con un partido por línea"),
+    out_dir: Path = typer.Option(Path("data/raw"), "--out-dir", "-o", help="Directorio de salida para event_<id>.json y shots_<id>.json"),
+    workers: int = typer.Option(4, "--workers", "-w", min=1, help="Descargas en paralelo"),
+    rate: float = typer.Option(2.0, "--rate", min=0.0, help="Máximo de peticiones por segundo a SofaScore (0 = sin límite)"),
+    cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", envvar="SOFA_CACHE_DIR", help="Caché en disco de respuestas de SofaScore (partidos terminados no caducan)"),
+    archive: Optional[Path] = typer.Option(None, "--archive", file_okay=False, help="Escribe en un archivo empaquetado (segmentos + índice) en lugar de ficheros sueltos"),
+    profile: bool = typer.Option(False, "--profile", envvar=PROFILE_ENV_VAR, help="Guarda un perfil cProfile y los tiempos por etapa en <salida>/profiles"),
+):
+    """
+    D01+D03 — Descarga evento y disparos de varios partidos con un único SofaClient.
+    Ejemplos:
+      python -m src.scrape_cli 14566650 14566651 --out-dir "data/raw"
+      python -m src.scrape_cli --file "data/matches.txt" --workers 8 --rate 4
+      type ids.txt | py -m src.scrape_cli -
+      python -m src.scrape_cli --file "data/matches.txt" --profile   # perfil en data/raw/profiles
+      python -m src.scrape_cli --file "data/matches.txt" --archive "data/raw.archive"
+    """
+    requested = list(matches or [])
+    if requested == ["-"]:
+        requested = read_match_list(sys.stdin)
+    if matches_file is not None:
+        requested.extend(read_match_list(matches_file.read_text(encoding="utf-8").splitlines()))
+    if not requested:
+        raise typer.BadParameter("Indica al menos un partido (argumentos, --file o '-' para stdin).")
+
+    # Los perfiles nunca van dentro del archivo empaquetado: solo contiene segmentos e índice.
+    with profile_run("scrape", archive.parent if archive is not None else out_dir, enabled=profile) as run:
+        client = SofaClient(cache=ResponseCache(cache_dir) if cache_dir else None)
+        with RawArchive(archive) if archive is not None else nullcontext() as raw_archive:
+            report = fetch_matches(client, requested, out_dir, workers=workers, rate=rate or None, archive=raw_archive)
+    _print_report(report, archive or out_dir)
+    if run is not None:
+        print(f"Perfil guardado en {run.json_path}")
+    if report.failed:
+        raise typer.Exit(code=1)
+
+def _print_report(report: FetchReport, out_dir: Path) -> None:
+    for outcome in report.outcomes:
+        if outcome.ok:
+            print(f"[green]OK[/green] - {outcome.match_id}: evento + {outcome.shots_count} disparos")
+        else:
+            print(f"[red]ERROR[/red] - {outcome.match}: {outcome.error}")
+    print(
+        f"[green]{len(report.succeeded)}[/green] partidos descargados, "
+        f"[red]{len(report.failed)}[/red] fallidos en {report.elapsed_seconds:.2f}s -> {out_dir}"
+    )
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,169 @@
+# src/scraper/batch.py
+"""
+Descarga concurrente de evento + disparos para varios partidos con un único SofaClient.
+
+Las peticiones se reparten en un pool de hilos acotado y pasan por un limitador de
+tasa compartido, de modo que el número de workers no multiplica la carga sobre SofaScore.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from src.application.raw_archive import EVENT, SHOTS, RawArchive
+from src.observability.profiling import stage
+from src.scraper.sofascore_event import match_id_from
+
+
+class RateLimiter:
+    """Limitador thread-safe: como mucho ``rate`` llamadas a ``acquire`` por segundo."""
+
+    def __init__(
+        self,
+        rate: Optional[float],
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            self._sleep(slot - now)
+
+
+def read_match_list(lines: Iterable[str]) -> List[str]:
+    """Partidos de un fichero/stdin: uno por línea, ignora vacías y comentarios '#'."""
+    matches = []
+    for line in lines:
+        value = line.strip()
+        if value and not value.startswith("#"):
+            matches.append(value)
+    return matches
+
+
+@dataclass(frozen=True)
+class FetchOutcome:
+    match: str
+    match_id: Optional[str] = None
+    event_path: Optional[Path] = None
+    shots_path: Optional[Path] = None
+    shots_count: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class FetchReport:
+    outcomes: List[FetchOutcome] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> List[FetchOutcome]:
+        return [o for o in self.outcomes if o.ok]
+
+    @property
+    def failed(self) -> List[FetchOutcome]:
+        return [o for o in self.outcomes if not o.ok]
+
+
+def fetch_matches(
+    client: Any,
+    matches: Sequence[str],
+    out_dir: Path,
+    *,
+    workers: int = 4,
+    rate: Optional[float] = None,
+    archive: Optional[RawArchive] = None,
+) -> FetchReport:
+    """
+    Descarga evento y disparos de cada partido en ``out_dir`` como
+    ``event_<id>.json`` / ``shots_<id>.json`` (mismo formato que match_cli/shots_cli).
+    Con ``archive`` ambos se añaden como registros a ese RawArchive en lugar de ficheros
+    sueltos (``event_path``/``shots_path`` quedan a None).
+    ``client`` es un SofaClient (o cualquier objeto con event_from_url/shots_df).
+    Si el cliente expone un atributo ``limiter`` (SofaClient), el limitador se le cede
+    para que solo las peticiones de red esperen turno y los aciertos de caché no.
+    """
+    limiter = RateLimiter(rate)
+    client_throttles = hasattr(client, "limiter")
+    if archive is None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    def _throttle() -> None:
+        # El cliente limita por su cuenta sus peticiones de red reales
+        if client_throttles:
+            return
+        with stage("rate_limit_wait"):
+            limiter.acquire()
+
+    def _fetch(match: str) -> FetchOutcome:
+        try:
+            match_id = match_id_from(match)
+        except ValueError as exc:
+            return FetchOutcome(match=match, error=str(exc))
+        try:
+            _throttle()
+            event = client.event_from_url(match)
+            event_path = None if archive is not None else out_dir / f"event_{match_id}.json"
+            with stage("write_json"):
+                _store(archive, EVENT, match_id, event_path, event)
+
+            _throttle()
+            df = client.shots_df(match)
+            with stage("dataframe_to_records"):
+                records = df.to_dict(orient="records")
+            shots_path = None if archive is not None else out_dir / f"shots_{match_id}.json"
+            with stage("write_json"):
+                _store(archive, SHOTS, match_id, shots_path, records)
+        except Exception as exc:
+            return FetchOutcome(match=match, match_id=match_id, error=f"{type(exc).__name__}: {exc}")
+        return FetchOutcome(
+            match=match,
+            match_id=match_id,
+            event_path=event_path,
+            shots_path=shots_path,
+            shots_count=len(records),
+        )
+
+    if not matches:
+        return FetchReport()
+    previous_limiter = client.limiter if client_throttles else None
+    if client_throttles:
+        client.limiter = limiter
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(matches))), thread_name_prefix="sofa-fetch") as executor:
+            outcomes = list(executor.map(_fetch, matches))
+    finally:
+        if client_throttles:
+            client.limiter = previous_limiter
+
+    return FetchReport(outcomes=outcomes, elapsed_seconds=time.perf_counter() - started)
+
+
+def _store(archive: Optional[RawArchive], kind: str, match_id: str, path: Optional[Path], data: Any) -> None:
+    if archive is not None:
+        archive.append(kind, match_id, data)
+    else:
+        _write_json(path, data)
+
+
+def _write_json(path: Path, data: Any) -> None:
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -0,0 +1,109 @@
+# src/scraper/sofascore_event.py
+"""
+Helpers puros para leer el dict de evento de SofaScore.
+
+No dependen de ScraperFC ni de pandas: se pueden usar en los workers de
+normalización sin instanciar ningún cliente.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_URL_ID_RE = re.compile(r"#id:(\d+)")
+
+
+def match_id_from(match: str) -> str:
+    """Id numérico de un argumento de partido (id o URL canónica con '#id:<num>')."""
+    value = str(match).strip()
+    if value.isdigit():
+        return value
+    found = _URL_ID_RE.search(value)
+    if found:
+        return found.group(1)
+    raise ValueError(
+        "La URL no contiene '#id:<numero>'. "
+        "Pasa el id del partido (p.ej. 1234567) o una URL canónica con '#id:'."
+    )
+
+
+def is_finished(event: Dict[str, Any]) -> bool:
+    """True si SofaScore marca el partido como terminado (status.type == 'finished')."""
+    status = event.get("status") or {}
+    return isinstance(status, dict) and status.get("type") == "finished"
+
+
+def shots_from_event(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extrae una lista de 'intentos/disparos' desde el dict del evento.
+    El nombre de la clave puede diferir ('shots', 'shotmap', 'attempts', etc.).
+    """
+    # Heurística: busca listas con campos tipo minute/player/xg/outcome
+    candidates = []
+    for key in ("shots", "shotmap", "attempts", "events", "attacks"):
+        v = event.get(key)
+        if isinstance(v, list):
+            candidates = v
+            break
+    return candidates
+
+
+def event_id(event: Dict[str, Any]) -> str:
+    for k in ("id", "eventId", "matchId"):
+        v = event.get(k)
+        if v:
+            return str(v)
+    return "unknown-id"
+
+
+def teams(event: Dict[str, Any]) -> Tuple[str, str]:
+    home = (event.get("homeTeam") or {}).get("name") or event.get("home", {}).get("name") or "Local"
+    away = (event.get("awayTeam") or {}).get("name") or event.get("away", {}).get("name") or "Visitante"
+    return home, away
+
+
+def start_iso(event: Dict[str, Any]) -> Optional[str]:
+    for k in ("startDate", "startTime", "startTimestamp", "startIso", "kickoff"):
+        v = event.get(k)
+        if v:
+            return str(v)
+    return None
+
+
+def final_score(event: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Extrae el marcador final del dict del evento.
+    Orden de preferencia:
+    1) homeScore.current / awayScore.current
+    2) scores.home / scores.away
+    3) estructuras alternativas comunes (home/away con 'score', 'display', etc.)
+    Si no se puede resolver, devuelve (0, 0).
+    """
+    # 1) Estructura Sofascore típica
+    try:
+        hs = (event.get("homeScore") or {}).get("current")
+        as_ = (event.get("awayScore") or {}).get("current")
+        if hs is not None and as_ is not None:
+            return int(hs), int(as_)
+    except Exception:
+        pass
+
+    # 2) Variante con dict 'scores'
+    try:
+        scores = event.get("scores") or {}
+        hs = scores.get("home")
+        as_ = scores.get("away")
+        if hs is not None and as_ is not None:
+            return int(hs), int(as_)
+    except Exception:
+        pass
+
+    # 3) Variantes con 'display' o 'score' anidados
+    try:
+        hs = (event.get("homeScore") or {}).get("display") or (event.get("home") or {}).get("score")
+        as_ = (event.get("awayScore") or {}).get("display") or (event.get("away") or {}).get("score")
+        if hs is not None and as_ is not None:
+            return int(hs), int(as_)
+    except Exception:
+        pass
+
+    # 4) Por defecto, 0-0 si no se encuentra nada confiable
+    return 0, 0
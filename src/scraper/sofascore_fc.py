@@ -1,20 +1,160 @@
 # src/scraper/sofascore_fc.py
-from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
-import pandas
+from src.observability.profiling import stage
+from src.scraper import sofascore_event
+
+if TYPE_CHECKING:
+    import pandas
+
+    from src.scraper.batch import RateLimiter
+
+# ScraperFC y pandas tardan cientos de ms en importarse: solo se cargan al crear un
+# SofaClient o al reconstruir un DataFrame desde la caché, no al importar este módulo.
+
+def _load_sofascore() -> Any:
+    # Nota: los nombres/clases exactas de ScraperFC pueden variar por versión.
+    # Este wrapper está diseñado para aislar cambios y facilitar tests.
+    try:
+        from ScraperFC.sofascore import Sofascore  # ← clase principal de ScraperFC para SofaScore
+    except ImportError:
+        return None  # para que los tests unitarios no fallen si no está instalado
+    return Sofascore
+
+class ResponseCache:
+    """
+    Caché persistente en disco de respuestas de SofaScore, una entrada por (tipo, id de partido).
+
+    - Partidos terminados: ``finished_ttl`` (None = no caducan nunca).
+    - Partidos en juego / sin estado: ``live_ttl`` segundos.
+    - Si el directorio supera ``max_bytes`` se expulsan las entradas usadas hace más
+      tiempo (LRU por mtime: cada acierto "toca" el fichero).
+    """
+
+    DEFAULT_LIVE_TTL = 60.0
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        live_ttl: float = DEFAULT_LIVE_TTL,
+        finished_ttl: Optional[float] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._live_ttl = live_ttl
+        self._finished_ttl = finished_ttl
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._size: Optional[int] = None
+
+    def get(self, kind: str, match_id: str) -> Optional[Any]:
+        entry = self._read(kind, match_id)
+        if entry is None:
+            return None
+        path = self._path(kind, match_id)
+        ttl = self._finished_ttl if entry.get("finished") else self._live_ttl
+        if ttl is not None and self._clock() - float(entry.get("stored_at", 0)) > ttl:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # marca de uso para la expulsión LRU
+        except OSError:
+            pass
+        return entry.get("data")
+
+    def put(self, kind: str, match_id: str, data: Any, *, finished: bool) -> None:
+        path = self._path(kind, match_id)
+        payload = json.dumps(
+            {"stored_at": self._clock(), "finished": finished, "data": data},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with self._lock:
+            current = self._current_size()
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+            self._size = current - previous + len(payload)
+            if self._size > self._max_bytes:
+                self._evict(keep=path)
+
+    def is_finished(self, match_id: str) -> bool:
+        """True si el evento cacheado del partido indica que ya terminó."""
+        entry = self._read("event", match_id)
+        return bool(entry and entry.get("finished"))
+
+    def _read(self, kind: str, match_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._path(kind, match_id).read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Entrada corrupta (p.ej. escritura interrumpida): se descarta
+            self._remove(self._path(kind, match_id))
+            return None
+
+    def _path(self, kind: str, match_id: str) -> Path:
+        return self.directory / f"{kind}_{match_id}.json"
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self.directory.glob("*.json"))
+        return self._size
+
+    def _evict(self, *, keep: Path) -> None:
+        entries = []
+        for p in self.directory.glob("*.json"):
+            try:
+                stat = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort(key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if total <= self._max_bytes:
+                break
+            if p == keep:
+                continue
+            self._remove(p)
+            total -= size
+        self._size = total
+
+    def _remove(self, path: Path) -> None:
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                return
+            if self._size is not None:
+                self._size -= size
 
-# Nota: los nombres/clases exactas de ScraperFC pueden variar por versión.
-# Este wrapper está diseñado para aislar cambios y facilitar tests.
-try:
-    from ScraperFC.sofascore import Sofascore  # ← clase principal de ScraperFC para SofaScore
-except ImportError as e:
-    Sofascore = None  # para que los tests unitarios no fallen en import si no está instalado
 
 class SofaClient:
-    def __init__(self) -> None:
-        if Sofascore is None:
+    # Caché opcional de respuestas; ver ResponseCache
+    cache: Optional[ResponseCache] = None
+    # Limitador opcional de tasa; solo se consulta antes de peticiones reales a SofaScore,
+    # de modo que los aciertos de caché nunca esperan turno
+    limiter: Optional["RateLimiter"] = None
+
+    def __init__(self, cache: Optional[ResponseCache] = None, limiter: Optional["RateLimiter"] = None) -> None:
+        sofascore_class = _load_sofascore()
+        if sofascore_class is None:
             raise RuntimeError("ScraperFC (Sofascore) no está disponible. Revisa la instalación.")
-        self.client = Sofascore()
+        self.client = sofascore_class()
+        self.cache = cache
+        self.limiter = limiter
 
     def event_from_url(self, match: str) -> Dict[str, Any]:
         """
@@ -22,13 +162,59 @@ class SofaClient:
           - id numérico (str o int)
           - URL canónica de SofaScore con '#id:<numero>'
         """
+        if self.cache is None:
+            return self._event_from_url(match)
+
+        match_id = sofascore_event.match_id_from(match)
+        with stage("cache_read"):
+            cached = self.cache.get("event", match_id)
+        if cached is not None:
+            return cached
+        event = self._event_from_url(match)
+        with stage("cache_write"):
+            self.cache.put("event", match_id, event, finished=sofascore_event.is_finished(event))
+        return event
+
+    def shots_df(self, match: str) -> "pandas.DataFrame":
+        if self.cache is None:
+            return self._shots_df(match)
+
+        # Los disparos heredan el estado del evento cacheado (si no hay evento, TTL "en vivo")
+        match_id = sofascore_event.match_id_from(match)
+        with stage("cache_read"):
+            cached = self.cache.get("shots", match_id)
+        if cached is not None:
+            import pandas
+
+            with stage("records_to_dataframe"):
+                return pandas.DataFrame.from_records(cached)
+        df = self._shots_df(match)
+        with stage("cache_write"):
+            self.cache.put(
+                "shots",
+                match_id,
+                df.to_dict(orient="records"),
+                finished=self.cache.is_finished(match_id),
+            )
+        return df
+
+    def _throttle(self) -> None:
+        if self.limiter is not None:
+            with stage("rate_limit_wait"):
+                self.limiter.acquire()
+
+    def _event_from_url(self, match: str) -> Dict[str, Any]:
         # Caso 1: id numérico directo
         if str(match).isdigit():
-            return self.client.get_match_dict(int(match))
+            self._throttle()
+            with stage("sofascore_event"):
+                return self.client.get_match_dict(int(match))
 
         # Caso 2: URL canónica con '#id:'
         if "#id:" in match:
-            return self.client.get_match_dict(match)
+            self._throttle()
+            with stage("sofascore_event"):
+                return self.client.get_match_dict(match)
 
         # Caso 3: URL sin '#id:' -> no soportado por ScraperFC 3.3.4
         raise ValueError(
@@ -36,14 +222,18 @@ class SofaClient:
             "Pasa el id del partido (p.ej. 1234567) o una URL canónica con '#id:'."
         )        
 
-    def shots_df(self, match: str) -> "pandas.DataFrame":
+    def _shots_df(self, match: str) -> "pandas.DataFrame":
         # Caso 1: id numérico directo
         if str(match).isdigit():
-            return self.client.scrape_match_shots(int(match))
+            self._throttle()
+            with stage("sofascore_shots"):
+                return self.client.scrape_match_shots(int(match))
         
         # Caso 2: URL canónica con '#id:'
         if "#id:" in match:
-            return self.client.scrape_match_shots(match)
+            self._throttle()
+            with stage("sofascore_shots"):
+                return self.client.scrape_match_shots(match)
         
         # Caso 3: URL sin '#id:' -> no soportado por ScraperFC 3.3.4
         raise ValueError(
@@ -51,75 +241,19 @@ class SofaClient:
             "Pasa el id del partido (p.ej. 1234567) o una URL canónica con '#id:'."
         )   
  
+    # Los helpers de parsing viven en src.scraper.sofascore_event (sin ScraperFC);
+    # se mantienen aquí como delegados por compatibilidad.
     def shots_from_event(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Extrae una lista de 'intentos/disparos' desde el dict del evento.
-        El nombre de la clave puede diferir ('shots', 'shotmap', 'attempts', etc.).
-        """
-        # Heurística: busca listas con campos tipo minute/player/xg/outcome
-        candidates = []
-        for key in ("shots", "shotmap", "attempts", "events", "attacks"):
-            v = event.get(key)
-            if isinstance(v, list):
-                candidates = v
-                break
-        return candidates
+        return sofascore_event.shots_from_event(event)
 
     def event_id(self, event: Dict[str, Any]) -> str:
-        for k in ("id", "eventId", "matchId"):
-            v = event.get(k)
-            if v:
-                return str(v)
-        return "unknown-id"
+        return sofascore_event.event_id(event)
 
     def teams(self, event: Dict[str, Any]) -> Tuple[str, str]:
-        home = (event.get("homeTeam") or {}).get("name") or event.get("home", {}).get("name") or "Local"
-        away = (event.get("awayTeam") or {}).get("name") or event.get("away", {}).get("name") or "Visitante"
-        return home, away
+        return sofascore_event.teams(event)
 
     def start_iso(self, event: Dict[str, Any]) -> Optional[str]:
-        for k in ("startDate", "startTime", "startTimestamp", "startIso", "kickoff"):
-            v = event.get(k)
-            if v:
-                return str(v)
-        return None
+        return sofascore_event.start_iso(event)
 
     def final_score(self, event: Dict[str, Any]) -> Tuple[int, int]:
-        """
-        Extrae el marcador final del dict del evento.
-        Orden de preferencia:
-        1) homeScore.current / awayScore.current
-        2) scores.home / scores.away
-        3) estructuras alternativas comunes (home/away con 'score', 'display', etc.)
-        Si no se puede resolver, devuelve (0, 0).
-        """
-        # 1) Estructura Sofascore típica
-        try:
-            hs = (event.get("homeScore") or {}).get("current")
-            as_ = (event.get("awayScore") or {}).get("current")
-            if hs is not None and as_ is not None:
-                return int(hs), int(as_)
-        except Exception:
-            pass
-
-        # 2) Variante con dict 'scores'
-        try:
-            scores = event.get("scores") or {}
-            hs = scores.get("home")
-            as_ = scores.get("away")
-            if hs is not None and as_ is not None:
-                return int(hs), int(as_)
-        except Exception:
-            pass
-
-        # 3) Variantes con 'display' o 'score' anidados
-        try:
-            hs = (event.get("homeScore") or {}).get("display") or (event.get("home") or {}).get("score")
-            as_ = (event.get("awayScore") or {}).get("display") or (event.get("away") or {}).get("score")
-            if hs is not None and as_ is not None:
-                return int(hs), int(as_)
-        except Exception:
-            pass
-
-        # 4) Por defecto, 0-0 si no se encuentra nada confiable
-        return 0, 0    
\ No newline at end of file
+        return sofascore_event.final_score(event)
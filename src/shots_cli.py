@@ -1,24 +1,41 @@
 # src/shots_cli.py
 from pathlib import Path
+from typing import Optional
 import json
 import typer
 from rich import print
-from src.scraper.sofascore_fc import SofaClient
+from src.application.raw_archive import SHOTS, RawArchive
+from src.observability.profiling import PROFILE_ENV_VAR, profile_run, stage
+from src.scraper.sofascore_event import match_id_from
+from src.scraper.sofascore_fc import ResponseCache, SofaClient
 
 def main(
     match: str = typer.Argument(..., help="Id del partido o URL canónica con '#id:<num>'"),
     out: Path = typer.Option("data/raw_shots.json", "--out", "-o", help="Ruta del JSON de disparos"),
+    cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", envvar="SOFA_CACHE_DIR", help="Caché en disco de respuestas de SofaScore (partidos terminados no caducan)"),
+    archive: Optional[Path] = typer.Option(None, "--archive", file_okay=False, help="Añade los disparos a un archivo empaquetado en lugar de escribir --out"),
+    profile: bool = typer.Option(False, "--profile", envvar=PROFILE_ENV_VAR, help="Guarda un perfil cProfile y los tiempos por etapa en <salida>/profiles"),
 ):
     """
     D03 — Obtener disparos con ScraperFC.sofascore.scrape_match_shots(...) y guardarlos (lista de dicts).
     """
-    c = SofaClient()
-    df = c.shots_df(match)  # pandas.DataFrame (cuando implementes D03)
-    records = df.to_dict(orient="records")
+    # Los perfiles nunca van dentro del archivo empaquetado: solo contiene segmentos e índice.
+    with profile_run("shots", archive.parent if archive is not None else out.parent, enabled=profile) as run:
+        c = SofaClient(cache=ResponseCache(cache_dir) if cache_dir else None)
+        df = c.shots_df(match)  # pandas.DataFrame (cuando implementes D03)
+        with stage("dataframe_to_records"):
+            records = df.to_dict(orient="records")
 
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"[green]OK[/green] - Disparos guardados en {out} ({len(records)})")
+        with stage("write_json"):
+            if archive is not None:
+                with RawArchive(archive) as raw_archive:
+                    raw_archive.append(SHOTS, match_id_from(match), records)
+            else:
+                out.parent.mkdir(parents=True, exist_ok=True)
+                out.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[green]OK[/green] - Disparos guardados en {archive or out} ({len(records)})")
+    if run is not None:
+        print(f"Perfil guardado en {run.json_path}")
 
 if __name__ == "__main__":
     typer.run(main)
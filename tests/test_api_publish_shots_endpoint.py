@@ -1,13 +1,14 @@
 from datetime import datetime, timezone
 from typing import Any
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from fastapi.testclient import TestClient
 
 from src.api.app import create_app
-from src.api.dependencies import get_shots_publisher
+from src.api.dependencies import get_async_shots_publisher, get_shots_publisher
 from src.application.publish_shots import (
+    PublishItemResult,
     PublishResult,
     ShotsPayloadValidationError,
     ShotsPublicationRequest,
@@ -46,7 +47,7 @@ def _build_request_payload(match_id: str = "atl-mad-20240928") -> dict[str, Any]
 
 
 def test_publish_endpoint_returns_created(api_client: TestClient) -> None:
-    publisher = Mock()
+    publisher = AsyncMock()
     publish_result = PublishResult(
         match_id="atl-mad-20240928",
         storage_path="matches/atl-mad-20240928.json",
@@ -56,7 +57,7 @@ def test_publish_endpoint_returns_created(api_client: TestClient) -> None:
     )
     publisher.publish.return_value = publish_result
 
-    api_client.app.dependency_overrides[get_shots_publisher] = lambda: publisher
+    api_client.app.dependency_overrides[get_async_shots_publisher] = lambda: publisher
 
     response = api_client.post("/v1/shots/publish", json=_build_request_payload())
 
@@ -69,9 +70,10 @@ def test_publish_endpoint_returns_created(api_client: TestClient) -> None:
         "checksum": publish_result.checksum,
         "size_bytes": publish_result.size_bytes,
         "uploaded_at": expected_uploaded_at,
+        "skipped": False,
     }
 
-    publisher.publish.assert_called_once()
+    publisher.publish.assert_awaited_once()
     (request_obj,), _ = publisher.publish.call_args
     assert isinstance(request_obj, ShotsPublicationRequest)
 
@@ -79,10 +81,10 @@ def test_publish_endpoint_returns_created(api_client: TestClient) -> None:
 
 
 def test_publish_endpoint_returns_400_on_validation_error(api_client: TestClient) -> None:
-    def _raise_validation(_: Any) -> None:
+    async def _raise_validation(_: Any) -> None:
         raise ShotsPayloadValidationError("invalid payload")
 
-    api_client.app.dependency_overrides[get_shots_publisher] = lambda: Mock(publish=_raise_validation)
+    api_client.app.dependency_overrides[get_async_shots_publisher] = lambda: Mock(publish=_raise_validation)
 
     response = api_client.post("/v1/shots/publish", json=_build_request_payload(match_id="bad id"))
 
@@ -93,10 +95,10 @@ def test_publish_endpoint_returns_400_on_validation_error(api_client: TestClient
 
 
 def test_publish_endpoint_returns_502_on_unexpected_error(api_client: TestClient) -> None:
-    def _raise_error(_: Any) -> None:
+    async def _raise_error(_: Any) -> None:
         raise RuntimeError("supabase down")
 
-    api_client.app.dependency_overrides[get_shots_publisher] = lambda: Mock(publish=_raise_error)
+    api_client.app.dependency_overrides[get_async_shots_publisher] = lambda: Mock(publish=_raise_error)
 
     response = api_client.post("/v1/shots/publish", json=_build_request_payload())
 
@@ -114,3 +116,138 @@ def test_publish_endpoint_rejects_malformed_json(api_client: TestClient) -> None
     )
 
     assert response.status_code == 422
+
+
+def test_publish_batch_endpoint_returns_per_item_results(api_client: TestClient) -> None:
+    publisher = Mock()
+    published = PublishResult(
+        match_id="atl-mad-20240928",
+        storage_path="matches/atl-mad-20240928.json",
+        checksum="a" * 64,
+        size_bytes=1234,
+        uploaded_at=datetime(2024, 9, 28, 21, 0, tzinfo=timezone.utc),
+    )
+    publisher.publish_many.return_value = [
+        PublishItemResult(match_id=published.match_id, storage_path=published.storage_path, result=published),
+        PublishItemResult(
+            match_id="bad-id",
+            storage_path="matches/bad-id.json",
+            error=ShotsPayloadValidationError("invalid payload"),
+        ),
+        PublishItemResult(
+            match_id="down-id",
+            storage_path="matches/down-id.json",
+            error=RuntimeError("supabase down"),
+        ),
+    ]
+
+    api_client.app.dependency_overrides[get_shots_publisher] = lambda: publisher
+
+    response = api_client.post(
+        "/v1/shots/publish:batch",
+        json={
+            "items": [
+                _build_request_payload(),
+                _build_request_payload(match_id="bad-id"),
+                _build_request_payload(match_id="down-id"),
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["published"] == 1
+    assert body["failed"] == 2
+    assert [item["status_code"] for item in body["items"]] == [201, 400, 502]
+    assert body["items"][0]["result"]["checksum"] == published.checksum
+    assert body["items"][1]["detail"] == "invalid payload"
+    assert body["items"][2]["detail"] == "Falló la publicación en Supabase"
+
+    (requests,), _ = publisher.publish_many.call_args
+    assert [request.match_id for request in requests] == ["atl-mad-20240928", "bad-id", "down-id"]
+
+    api_client.app.dependency_overrides.clear()
+
+
+def test_publish_batch_endpoint_rejects_empty_batch(api_client: TestClient) -> None:
+    api_client.app.dependency_overrides[get_shots_publisher] = lambda: Mock()
+
+    response = api_client.post("/v1/shots/publish:batch", json={"items": []})
+
+    assert response.status_code == 422
+
+    api_client.app.dependency_overrides.clear()
+
+
+def test_publish_batch_endpoint_rejects_repeated_match_ids(api_client: TestClient) -> None:
+    publisher = Mock()
+    api_client.app.dependency_overrides[get_shots_publisher] = lambda: publisher
+    item = _build_request_payload()
+
+    response = api_client.post("/v1/shots/publish:batch", json={"items": [item, _build_request_payload("other"), item]})
+
+    assert response.status_code == 422
+    assert "atl-mad-20240928" in response.text
+    publisher.publish_many.assert_not_called()
+
+    api_client.app.dependency_overrides.clear()
+
+
+def test_publish_stream_endpoint_returns_one_result_per_line(api_client: TestClient, monkeypatch) -> None:
+    import json
+
+    from src.api import app as app_module
+    from src.application.publish_shots import AsyncShotsPublisher
+    from src.infrastructure.memory import AsyncInMemoryMatchesIndexRepository, AsyncInMemoryShotsStorage
+
+    storage = AsyncInMemoryShotsStorage()
+    publisher = AsyncShotsPublisher(storage=storage, database=AsyncInMemoryMatchesIndexRepository())
+    api_client.app.dependency_overrides[get_async_shots_publisher] = lambda: publisher
+    monkeypatch.setattr(app_module, "STREAM_MAX_LINE_BYTES", 2048)
+
+    mismatched = _build_request_payload("match-3")
+    mismatched["shots"]["partido"]["idPartido"] = "other"
+    lines = [
+        json.dumps(_build_request_payload("match-1")),
+        "",
+        "{not json",
+        json.dumps(mismatched),
+        json.dumps({"padding": "x" * 4096}),
+        json.dumps(_build_request_payload("match-2")),
+    ]
+    body = ("\n".join(lines) + "\n").encode("utf-8")
+
+    def chunks():
+        # Trozos pequeños para que las líneas lleguen partidas entre chunks
+        for start in range(0, len(body), 97):
+            yield body[start:start + 97]
+
+    response = api_client.post("/v1/shots/publish:stream?concurrency=2", content=chunks())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = {item["line"]: item for item in map(json.loads, response.text.splitlines())}
+    assert {line: item["status_code"] for line, item in results.items()} == {1: 201, 3: 422, 4: 400, 5: 413, 6: 201}
+    assert results[6]["result"]["match_id"] == "match-2"
+    assert sorted(path for _, path in storage.objects) == ["matches/match-1.json", "matches/match-2.json"]
+
+
+def test_iter_ndjson_lines_splits_across_chunks_and_flags_oversized_lines() -> None:
+    import asyncio
+
+    from src.api.ndjson import iter_ndjson_lines
+
+    async def collect(chunks: list[bytes]) -> list:
+        async def source():
+            for chunk in chunks:
+                yield chunk
+
+        return [item async for item in iter_ndjson_lines(source(), max_line_bytes=5)]
+
+    assert asyncio.run(collect([b"ab", b"c\nde", b"f\n\ntoo", b"-long\nxy"])) == [
+        (1, b"abc"),
+        (2, b"def"),
+        (3, b""),
+        (4, None),
+        (5, b"xy"),
+    ]
@@ -0,0 +1,30 @@
+import json
+
+from benchmarks.pipeline import StageStats, _percentile, main
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    samples = [float(n) for n in range(1, 101)]
+
+    assert _percentile(samples, 50) == 50.0
+    assert _percentile(samples, 95) == 95.0
+    assert _percentile(samples, 99) == 99.0
+    assert StageStats.from_samples([]).count == 0
+
+
+def test_benchmark_cli_writes_json_report(tmp_path) -> None:
+    out = tmp_path / "bench.json"
+
+    main(["--matches", "4", "--shots", "3", "--concurrency", "2", "--out", str(out)])
+
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert set(report["stages"]) == {
+        "map",
+        "validate",
+        "serialize_sha256",
+        "serialize_sha256_stdlib",
+        "publish",
+        "endpoint",
+    }
+    assert all(stage["count"] == 4 for stage in report["stages"].values())
+    assert report["meta"]["shots_per_match"] == 3
@@ -0,0 +1,65 @@
+"""Import-time budgets for the CLI and API entry points.
+
+Each entry point is imported in a fresh interpreter. The test fails if it pulls in a heavy
+dependency it does not need at import time, or if the import takes longer than its budget
+(``python -X importtime -c "import <module>"`` shows where the time goes). ``SHOTS_IMPORT_BUDGET_SCALE`` relaxes the budgets on slow
+machines (e.g. ``2`` doubles them).
+"""
+import os
+import subprocess
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ("ScraperFC", "pandas", "numpy", "pyarrow", "supabase", "httpx", "dotenv")
+
+# Presupuestos en segundos: ~3x lo medido en un portátil, para absorber el ruido de CI.
+ENTRY_POINTS = {
+    "src.match_cli": 0.4,
+    "src.shots_cli": 0.4,
+    "src.scrape_cli": 0.4,
+    "src.match_normalize_cli": 0.8,
+    "src.rollup_cli": 0.8,
+    "src.parquet_cli": 0.8,
+    "src.api.app": 1.5,
+}
+
+
+@lru_cache(maxsize=None)
+def _import_profile(module: str) -> tuple[float, set[str]]:
+    code = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - started)\n"
+        f"print(','.join(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    seconds, loaded = completed.stdout.splitlines()
+    return float(seconds), {name for name in loaded.split(",") if name}
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_imports_no_heavy_dependencies(module: str) -> None:
+    _, loaded = _import_profile(module)
+
+    assert loaded == set(), f"{module} importa al cargar: {sorted(loaded)}"
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_import_time_within_budget(module: str) -> None:
+    scale = float(os.getenv("SHOTS_IMPORT_BUDGET_SCALE") or 1)
+    seconds, _ = _import_profile(module)
+
+    assert 0 < seconds <= ENTRY_POINTS[module] * scale, f"{module}: {seconds:.3f}s"
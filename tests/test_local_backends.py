@@ -0,0 +1,150 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import dependencies
+from src.api.app import create_app
+from src.application.publish_shots import AsyncShotsPublisher, ShotsPublicationRequest, ShotsPublisher
+from src.infrastructure.local import LocalFileStorageAdapter, SqliteMatchesIndexRepository
+from src.infrastructure.threaded import ThreadedMatchesIndexRepository, ThreadedShotsStorage
+from src.models.schemas import Disparo, Marcador, Partido, ShotsResponse
+
+
+def _request(match_id: str = "14566650") -> ShotsPublicationRequest:
+    shots = ShotsResponse(
+        partido=Partido(
+            idPartido=match_id,
+            fechaISO="2025-08-16T19:30:00+00:00",
+            local="Real Oviedo",
+            visitante="FC Barcelona",
+            marcadorFinal=Marcador(local=0, visitante=3),
+        ),
+        disparos=[Disparo(minuto=10, equipo="FC Barcelona", jugador="Pedri", xG=0.12, resultado="save")],
+    )
+    return ShotsPublicationRequest(match_id=match_id, storage_path=f"matches/{match_id}.json", shots=shots)
+
+
+def _record(match_id: str, checksum: str) -> dict:
+    return {
+        "id": match_id,
+        "date": datetime(2025, 8, 16, 19, 30, tzinfo=timezone.utc),
+        "home": "A",
+        "away": "B",
+        "storage_path": f"matches/{match_id}.json",
+        "size_bytes": 10,
+        "checksum": checksum,
+    }
+
+
+def test_local_storage_writes_atomically_inside_root(tmp_path) -> None:
+    storage = LocalFileStorageAdapter(root=tmp_path, durable=True)
+
+    storage.upload(bucket="shots", path="matches/1.json", content=b"{}", content_type="application/json")
+    storage.upload(bucket="shots", path="matches/1.json", content=b"[]", content_type="application/json")
+
+    assert (tmp_path / "shots" / "matches" / "1.json").read_bytes() == b"[]"
+    assert [p.name for p in (tmp_path / "shots" / "matches").iterdir()] == ["1.json"]
+    with pytest.raises(ValueError):
+        storage.upload(bucket="shots", path="../../escape.json", content=b"{}", content_type="application/json")
+
+
+def test_sqlite_index_upserts_by_id_and_returns_lookup_columns(tmp_path) -> None:
+    path = tmp_path / "index" / "matches_index.sqlite3"
+    repository = SqliteMatchesIndexRepository(path=path)
+
+    repository.upsert_match_indexes(records=[_record("1", "a" * 64), _record("2", "b" * 64)])
+    repository.upsert_match_index(record=_record("1", "c" * 64))
+
+    assert repository.get_match_indexes(match_ids=["1", "3"]) == {
+        "1": {
+            "id": "1",
+            "storage_path": "matches/1.json",
+            "checksum": "c" * 64,
+            "size_bytes": 10,
+            "content_encoding": None,
+        },
+    }
+    repository.close()
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT date FROM matches_index WHERE id = '2'").fetchone() == (
+            "2025-08-16T19:30:00+00:00",
+        )
+
+
+def test_publisher_skips_unchanged_across_runs_with_local_backend(tmp_path) -> None:
+    def publisher() -> ShotsPublisher:
+        return ShotsPublisher(
+            storage=LocalFileStorageAdapter(root=tmp_path),
+            database=SqliteMatchesIndexRepository(path=tmp_path / "matches_index.sqlite3"),
+            skip_unchanged=True,
+        )
+
+    first = publisher().publish(_request())
+    second = publisher().publish(_request())
+
+    assert first.skipped is False
+    assert second.skipped is True
+    assert second.checksum == first.checksum
+    assert (tmp_path / "shots" / "matches" / "14566650.json").stat().st_size == first.size_bytes
+
+
+def test_async_publisher_uses_threaded_local_adapters(tmp_path) -> None:
+    storage = LocalFileStorageAdapter(root=tmp_path)
+    database = SqliteMatchesIndexRepository(path=":memory:")
+    publisher = AsyncShotsPublisher(
+        storage=ThreadedShotsStorage(storage),
+        database=ThreadedMatchesIndexRepository(database),
+        content_encoding="gzip",
+    )
+
+    outcomes = asyncio.run(publisher.publish_many([_request("1"), _request("2")]))
+
+    assert all(outcome.ok for outcome in outcomes)
+    assert set(database.get_match_indexes(match_ids=["1", "2"])) == {"1", "2"}
+
+
+def test_settings_select_backend_without_supabase_credentials(monkeypatch, tmp_path) -> None:
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("SUPABASE_SERVICE_KEY", raising=False)
+    monkeypatch.setenv("SHOTS_STORAGE_BACKEND", "local")
+    monkeypatch.setenv("SHOTS_LOCAL_DIR", str(tmp_path))
+
+    settings = dependencies.Settings.from_env()
+    assert settings.storage_backend == "local"
+    assert settings.sqlite_index_path == tmp_path / "matches_index.sqlite3"
+
+    monkeypatch.setenv("SHOTS_STORAGE_BACKEND", "supabase")
+    with pytest.raises(RuntimeError):
+        dependencies.Settings.from_env()
+    monkeypatch.setenv("SHOTS_STORAGE_BACKEND", "s3")
+    with pytest.raises(RuntimeError):
+        dependencies.Settings.from_env()
+
+
+def test_endpoints_share_memory_backend(monkeypatch) -> None:
+    monkeypatch.setenv("SHOTS_STORAGE_BACKEND", "memory")
+    dependencies.get_settings.cache_clear()
+    dependencies.get_local_backend.cache_clear()
+    request = _request()
+    body = {
+        "match_id": request.match_id,
+        "storage_path": request.storage_path,
+        "shots": request.shots.model_dump(exclude_none=True),
+    }
+
+    try:
+        with TestClient(create_app()) as client:
+            single = client.post("/v1/shots/publish", json=body)
+            batch = client.post("/v1/shots/publish:batch", json={"items": [body]})
+            storage, database = dependencies.get_local_backend()
+            assert set(database.records) == {request.match_id}
+            assert storage.objects[("shots", request.storage_path)]
+    finally:
+        dependencies.get_settings.cache_clear()
+        dependencies.get_local_backend.cache_clear()
+
+    assert single.status_code == 201
+    assert batch.json()["items"][0]["result"]["checksum"] == single.json()["checksum"]
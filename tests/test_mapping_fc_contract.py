@@ -18,4 +18,82 @@ def test_map_event_produces_valid_contract():
     assert model.partido.visitante == "Barcelona"
     assert model.partido.fechaISO == "2025-09-26T19:00:00Z"
     assert model.partido.marcadorFinal.local == 1
-    assert model.partido.marcadorFinal.visitante == 2
\ No newline at end of file
+    assert model.partido.marcadorFinal.visitante == 2
+
+def test_mapper_does_not_import_scraper_stack():
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys; import src.mapping.sofa_mapper_fc; "
+        "heavy = [m for m in ('src.scraper.sofascore_fc', 'ScraperFC', 'pandas') if m in sys.modules]; "
+        "print(','.join(heavy))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_frame_mapping_matches_row_mapping():
+    import math
+
+    import pytest
+
+    pd = pytest.importorskip("pandas")
+    from src.mapping.sofa_mapper_fc import _map_one_shot, map_shots_frame
+
+    df = pd.DataFrame(
+        [
+            {"player": {"name": "Lewandowski"}, "isHome": False, "time": 10, "addedTime": float("nan"),
+             "xg": 0.41, "xgot": 0.7, "situation": "assisted", "shotType": "goal", "bodyPart": "head"},
+            {"player": {"shortName": "Pedri"}, "isHome": True, "time": 45, "addedTime": 2.5,
+             "xg": float("inf"), "xgot": None, "situation": " Corner ", "shotType": "Save", "bodyPart": "left-foot"},
+            {"player": float("nan"), "isHome": None, "time": "90", "addedTime": 3,
+             "xg": "0.05", "xgot": float("nan"), "situation": None, "shotType": "", "bodyPart": "other"},
+            {"player": {}, "isHome": 1, "time": float("nan"), "addedTime": "x",
+             "xg": None, "xgot": 0.0, "situation": float("nan"), "shotType": "weird", "bodyPart": None},
+        ]
+    )
+
+    expected = [_map_one_shot(r, "Oviedo", "Barcelona") for r in df.to_dict(orient="records")]
+    got = map_shots_frame(df, "Oviedo", "Barcelona")
+
+    assert got == expected
+    assert all(type(s["minuto"]) is int and type(s["xG"]) is float for s in got)
+    assert not any(math.isnan(s["xGOT"]) for s in got)
+
+    event = {"id": 1, "homeTeam": {"name": "Oviedo"}, "awayTeam": {"name": "Barcelona"}}
+    assert map_event_to_contract(event, df)["disparos"] == expected
+    assert map_shots_frame(df.iloc[0:0], "Oviedo", "Barcelona") == []
+
+
+def test_repeated_names_and_labels_share_one_object_across_matches():
+    import json
+
+    from src.mapping.sofa_mapper_fc import _norm_situation, clear_normalization_caches, normalization_cache_info
+
+    clear_normalization_caches()
+    raw = json.dumps({
+        "event": {"id": 1, "homeTeam": {"name": "Oviedo"}, "awayTeam": {"name": "Barcelona"}},
+        "shots": [
+            {"player": {"name": "Lewandowski"}, "isHome": False, "situation": "regular", "shotType": "miss"},
+            {"player": {"name": "Lewandowski"}, "isHome": False, "situation": "Regular ", "shotType": "miss"},
+        ],
+    })
+    # Cada json.loads crea strings nuevos, como al leer dos partidos distintos
+    first, second = (json.loads(raw) for _ in range(2))
+    a = map_event_to_contract(first["event"], first["shots"])
+    b = map_event_to_contract(second["event"], second["shots"])
+
+    shots = a["disparos"] + b["disparos"]
+    assert len({id(s["jugador"]) for s in shots}) == 1
+    assert len({id(s["equipo"]) for s in shots}) == 1
+    assert a["partido"]["local"] is b["partido"]["local"]
+    assert len({id(s["situacion"]) for s in shots}) == 1 and shots[0]["situacion"] == "Juego abierto"
+    assert normalization_cache_info()["nombres"].hits >= 3
+    # Tipos distintos con el mismo hash no comparten entrada; los no hashables no rompen
+    assert (_norm_situation(1), _norm_situation(True)) == ("1", "True")
+    assert _norm_situation(["x"]) == "['x']"
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import create_app
+from src.api.dependencies import get_matches_replica
+from src.application.matches_replica import InvalidCursorError, MatchesIndexReplica
+from src.infrastructure.local import SqliteMatchesIndexRepository
+from src.infrastructure.memory import InMemoryMatchesIndexRepository
+from src.infrastructure.write_behind import WriteBehindMatchesIndex
+
+
+class _CountingRepository(InMemoryMatchesIndexRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.scans = 0
+        self.fail = False
+
+    def list_match_indexes(self):
+        self.scans += 1
+        if self.fail:
+            raise RuntimeError("PostgREST caído")
+        return super().list_match_indexes()
+
+
+def _record(match_id: str, day: int, home: str = "Real Oviedo", away: str = "FC Barcelona") -> dict:
+    return {
+        "id": match_id,
+        "date": datetime(2025, 8, 1, 19, 0, tzinfo=timezone.utc) + timedelta(days=day),
+        "home": home,
+        "away": away,
+        "storage_path": f"matches/{match_id}.json",
+        "size_bytes": 10,
+        "checksum": match_id * 4,
+    }
+
+
+def _repository() -> _CountingRepository:
+    repository = _CountingRepository()
+    repository.upsert_match_indexes(
+        records=[
+            _record("1", 0),
+            _record("2", 7, home="Sevilla", away="Real Oviedo"),
+            _record("3", 7, home="Sevilla", away="Girona"),
+            _record("4", 14, home="FC Barcelona", away="Girona"),
+            _record("5", 21),
+        ]
+    )
+    return repository
+
+
+def test_listing_is_newest_first_and_cursor_pages_cover_everything() -> None:
+    replica = MatchesIndexReplica(_repository())
+
+    pages, cursor = [], None
+    while True:
+        page = replica.list_matches(limit=2, cursor=cursor)
+        pages.append([entry.id for entry in page.items])
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert pages == [["5", "4"], ["3", "2"], ["1"]]
+
+
+def test_team_and_date_indexes_filter_without_scanning_the_source_again() -> None:
+    repository = _repository()
+    replica = MatchesIndexReplica(repository)
+
+    oviedo = replica.list_matches(team="  real OVIEDO ")
+    august_week_two = replica.list_matches(
+        since=datetime(2025, 8, 8, tzinfo=timezone.utc),
+        until=datetime(2025, 8, 15, tzinfo=timezone.utc),
+    )
+    girona_page = replica.list_matches(team="Girona", limit=1)
+
+    assert [entry.id for entry in oviedo.items] == ["5", "2", "1"]
+    assert [entry.id for entry in august_week_two.items] == ["3", "2"]
+    assert [entry.id for entry in girona_page.items] == ["4"] and girona_page.next_cursor
+    assert replica.list_matches(team="Girona", cursor=girona_page.next_cursor).items[0].id == "3"
+    assert replica.list_matches(team="Desconocido").items == []
+    assert replica.get("4").home == "FC Barcelona" and replica.get("99") is None
+    assert repository.scans == 1
+
+
+def test_refresh_changes_version_only_when_content_changes_and_survives_failures() -> None:
+    repository = _repository()
+    replica = MatchesIndexReplica(repository)
+    version = replica.version
+
+    assert replica.refresh() is False and replica.version == version
+    repository.upsert_match_index(record=_record("6", 28))
+    assert replica.refresh() is True and replica.version != version
+    repository.fail = True
+    with pytest.raises(RuntimeError):
+        replica.refresh()
+    assert replica.get("6") is not None
+
+
+def test_invalid_cursor_is_rejected() -> None:
+    replica = MatchesIndexReplica(_repository())
+
+    with pytest.raises(InvalidCursorError):
+        replica.list_matches(cursor="no-es-un-cursor")
+
+
+def test_sqlite_and_write_behind_sources_list_every_row(tmp_path) -> None:
+    sqlite = SqliteMatchesIndexRepository(path=tmp_path / "index.sqlite3")
+    sqlite.upsert_match_indexes(records=[_record("1", 0), _record("2", 7)])
+    writer = WriteBehindMatchesIndex(sqlite, max_batch=100, max_delay=60)
+    try:
+        writer.upsert_match_index(record=_record("3", 14))
+        replica = MatchesIndexReplica(writer)
+
+        assert [entry.id for entry in replica.list_matches().items] == ["3", "2", "1"]
+        assert replica.get("1").date == datetime(2025, 8, 1, 19, 0, tzinfo=timezone.utc)
+    finally:
+        writer.close()
+        sqlite.close()
+
+
+def test_endpoints_serve_pages_lookups_and_not_modified() -> None:
+    repository = _repository()
+    app = create_app()
+    app.dependency_overrides[get_matches_replica] = lambda: MatchesIndexReplica(repository)
+    client = TestClient(app)
+
+    first = client.get("/v1/matches", params={"team": "Real Oviedo", "limit": 2})
+    second = client.get("/v1/matches", params={"team": "Real Oviedo", "cursor": first.json()["next_cursor"]})
+    ranged = client.get("/v1/matches", params={"date_from": "2025-08-08", "date_to": "2025-08-15"})
+    cached = client.get(
+        "/v1/matches",
+        params={"team": "Real Oviedo", "limit": 2},
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    match = client.get("/v1/matches/4")
+    match_cached = client.get("/v1/matches/4", headers={"If-None-Match": f'W/{match.headers["ETag"]}'})
+
+    assert [item["id"] for item in first.json()["items"]] == ["5", "2"]
+    assert [item["id"] for item in second.json()["items"]] == ["1"] and second.json()["next_cursor"] is None
+    assert [item["id"] for item in ranged.json()["items"]] == ["4", "3", "2"]
+    assert cached.status_code == 304 and cached.headers["ETag"] == first.headers["ETag"]
+    assert match.json()["away"] == "Girona" and match_cached.status_code == 304
+    assert client.get("/v1/matches/99").status_code == 404
+    assert client.get("/v1/matches", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_endpoints_return_503_until_the_first_load_succeeds() -> None:
+    repository = _repository()
+    repository.fail = True
+    app = create_app()
+    app.dependency_overrides[get_matches_replica] = lambda: MatchesIndexReplica(repository)
+
+    assert TestClient(app).get("/v1/matches").status_code == 503
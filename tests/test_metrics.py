@@ -0,0 +1,129 @@
+from dataclasses import replace
+from unittest.mock import Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import create_app
+from src.application.publish_shots import ShotsPayloadValidationError, ShotsPublicationRequest, ShotsPublisher
+from src.application.resilience import RetryPolicy, TransientStorageError
+from src.infrastructure.memory import InMemoryMatchesIndexRepository, InMemoryShotsStorage
+from src.models.schemas import Disparo, Marcador, Partido, ShotsResponse
+from src.observability.metrics import CONTENT_TYPE_LATEST, MetricsRegistry
+from src.observability.publish_metrics import PublishMetrics
+
+
+def _request(match_id: str = "1", shots: int = 2) -> ShotsPublicationRequest:
+    return ShotsPublicationRequest(
+        match_id=match_id,
+        storage_path=f"matches/{match_id}.json",
+        shots=ShotsResponse(
+            partido=Partido(
+                idPartido=match_id,
+                fechaISO="2025-08-16T19:30:00+00:00",
+                local="A",
+                visitante="B",
+                marcadorFinal=Marcador(local=1, visitante=0),
+            ),
+            disparos=[Disparo(minuto=10 + i, equipo="A", jugador="X", xG=0.1, resultado="Parada") for i in range(shots)],
+        ),
+    )
+
+
+def test_registry_renders_prometheus_text_format() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Contador\nde prueba.", ("kind",))
+    histogram = registry.histogram("demo_seconds", "Latencia.", buckets=(0.1, 1.0))
+
+    counter.inc(kind='a"b')
+    counter.inc(2, kind='a"b')
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(3)
+
+    assert registry.counter("demo_total", "otra doc", ("kind",)) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("demo_total", "tipo distinto")
+
+    lines = registry.render().splitlines()
+    assert lines == [
+        "# HELP demo_seconds Latencia.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{le="0.1"} 1',
+        'demo_seconds_bucket{le="1"} 2',
+        'demo_seconds_bucket{le="+Inf"} 3',
+        "demo_seconds_sum 3.55",
+        "demo_seconds_count 3",
+        "# HELP demo_total Contador\\nde prueba.",
+        "# TYPE demo_total counter",
+        'demo_total{kind="a\\"b"} 3',
+    ]
+
+
+def test_counter_rejects_missing_labels() -> None:
+    counter = MetricsRegistry().counter("demo_total", "Contador.", ("kind",))
+
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_publisher_records_stage_timings_sizes_and_outcomes() -> None:
+    metrics = PublishMetrics.create(MetricsRegistry())
+    storage = Mock(wraps=InMemoryShotsStorage())
+    storage.upload.side_effect = [TransientStorageError("503"), None, None]
+    publisher = ShotsPublisher(
+        storage=storage,
+        database=InMemoryMatchesIndexRepository(),
+        retry_policy=RetryPolicy(base_delay=0),
+        content_encoding="gzip",
+        skip_unchanged=True,
+        metrics=metrics,
+    )
+
+    publisher.publish(_request(shots=3))
+    publisher.publish(_request(shots=3))
+
+    for stage in ("validate", "serialize", "hash", "compress", "lookup", "upload", "index", "publish"):
+        assert metrics.stage_seconds.count(stage=stage) >= 1, stage
+    assert metrics.stage_seconds.count(stage="publish") == 2
+    assert metrics.retries.value(operation="upload", error="TransientStorageError") == 1
+    assert metrics.results.value(outcome="published") == 1
+    assert metrics.results.value(outcome="skipped") == 1
+    assert metrics.payload_bytes.count(kind="raw") == 2
+    assert metrics.payload_bytes.count(kind="stored") == 2
+    assert metrics.shots_per_match.count() == 2
+
+
+def test_publisher_counts_failures_by_stage_and_error() -> None:
+    metrics = PublishMetrics.create(MetricsRegistry())
+    storage = Mock()
+    storage.upload.side_effect = TransientStorageError("503")
+    publisher = ShotsPublisher(
+        storage=storage,
+        database=InMemoryMatchesIndexRepository(),
+        retry_policy=RetryPolicy(max_attempts=2, base_delay=0),
+        metrics=metrics,
+    )
+
+    with pytest.raises(TransientStorageError):
+        publisher.publish(_request())
+    with pytest.raises(ShotsPayloadValidationError):
+        publisher.publish(replace(_request(), match_id="otro"))
+    outcomes = publisher.publish_many([_request("2"), _request("3")])
+
+    assert all(outcome.error is not None for outcome in outcomes)
+    assert metrics.failures.value(stage="upload", error="TransientStorageError") == 3
+    assert metrics.failures.value(stage="validate", error="ShotsPayloadValidationError") == 1
+    assert metrics.failures.value(stage="publish", error="TransientStorageError") == 0
+    assert metrics.failures.value(stage="publish", error="ShotsPayloadValidationError") == 0
+    assert metrics.results.value(outcome="failed") == 4
+
+
+def test_metrics_endpoint_exposes_registry() -> None:
+    client = TestClient(create_app())
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE_LATEST
+    assert "# TYPE shots_publish_stage_seconds histogram" in response.text
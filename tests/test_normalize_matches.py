@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from src import match_normalize_cli
+from src.application.normalize_matches import (
+    MatchInputPair,
+    discover_pairs,
+    load_manifest,
+    normalize_many,
+)
+
+
+def _write_match(raw_dir: Path, match_id: int, *, shots: object | None = None) -> None:
+    event = {
+        "id": match_id,
+        "homeTeam": {"name": "Oviedo"},
+        "awayTeam": {"name": "Barcelona"},
+        "startDate": "2025-09-26T19:00:00Z",
+        "homeScore": {"current": 1},
+        "awayScore": {"current": 2},
+    }
+    if shots is None:
+        shots = [{"player": {"name": "Lewandowski"}, "isHome": False, "time": 10, "xg": 0.4, "shotType": "goal"}]
+    (raw_dir / f"event_{match_id}.json").write_text(json.dumps(event), encoding="utf-8")
+    (raw_dir / f"shots_{match_id}.json").write_text(json.dumps(shots), encoding="utf-8")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_normalize_many_collects_per_file_errors(tmp_path: Path, workers: int) -> None:
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _write_match(raw_dir, 1)
+    _write_match(raw_dir, 2)
+    (raw_dir / "shots_2.json").write_text("{not json", encoding="utf-8")
+    _write_match(raw_dir, 3)
+    (raw_dir / "shots_3.json").unlink()
+    _write_match(raw_dir, 4)
+
+    pairs = discover_pairs(raw_dir)
+    report = normalize_many(pairs, tmp_path / "out", workers=workers)
+
+    assert [p.event_path.name for p in pairs] == ["event_1.json", "event_2.json", "event_3.json", "event_4.json"]
+    assert sorted(o.output_path.name for o in report.succeeded) == ["match_1.json", "match_4.json"]
+    assert [o.pair.event_path.name for o in report.failed] == ["event_2.json", "event_3.json"]
+    assert report.failed[0].error.startswith("JSONDecodeError")
+    assert report.failed[1].error.startswith("FileNotFoundError")
+
+    normalized = json.loads((tmp_path / "out" / "match_1.json").read_text(encoding="utf-8"))
+    assert normalized["disparos"][0]["equipo"] == "Barcelona"
+
+
+def test_load_manifest_resolves_relative_paths(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps([{"event": "raw/event_1.json", "shots": str(tmp_path / "raw" / "shots_1.json")}]),
+        encoding="utf-8",
+    )
+
+    assert load_manifest(manifest) == [
+        MatchInputPair(event_path=tmp_path / "raw" / "event_1.json", shots_path=tmp_path / "raw" / "shots_1.json")
+    ]
+
+
+def test_incremental_run_skips_unchanged_pairs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    out_dir = tmp_path / "out"
+    _write_match(raw_dir, 1)
+    _write_match(raw_dir, 2)
+
+    first = normalize_many(discover_pairs(raw_dir), out_dir, workers=1, incremental=True)
+    assert len(first.succeeded) == 2 and not first.skipped
+
+    # Reescribir con el mismo contenido (cambia mtime) y modificar de verdad el partido 2
+    _write_match(raw_dir, 1)
+    _write_match(raw_dir, 2, shots=[])
+
+    second = normalize_many(discover_pairs(raw_dir), out_dir, workers=1, incremental=True)
+    assert [o.pair.event_path.name for o in second.skipped] == ["event_1.json"]
+    assert json.loads((out_dir / "match_2.json").read_text(encoding="utf-8"))["disparos"] == []
+
+    third = normalize_many(discover_pairs(raw_dir), out_dir, workers=1, incremental=True)
+    assert len(third.skipped) == 2
+
+    monkeypatch.setattr("src.application.normalize_matches.MAPPER_VERSION", "next")
+    fourth = normalize_many(discover_pairs(raw_dir), out_dir, workers=1, incremental=True)
+    assert not fourth.skipped
+
+
+@pytest.mark.parametrize("mode", ["single", "archive-match"])
+@pytest.mark.parametrize("flag", [["--incremental"], ["--state-file", "state.json"]])
+def test_normalize_cli_rejects_incremental_flags_outside_batch_mode(tmp_path: Path, mode: str, flag: list[str]) -> None:
+    _write_match(tmp_path, 1)
+    archive = tmp_path / "raw.archive"
+    archive.mkdir()
+    if mode == "single":
+        args = [str(tmp_path / "event_1.json"), str(tmp_path / "shots_1.json")]
+    else:
+        args = ["--archive", str(archive), "--match", "1"]
+    app = typer.Typer()
+    app.command()(match_normalize_cli.main)
+
+    result = CliRunner().invoke(app, [*args, "--out-dir", str(tmp_path / "out"), *flag])
+
+    assert result.exit_code == 2
+    assert "--incremental" in result.output
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,107 @@
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.application.parquet_export import export_shots_parquet, partition_path, read_shots_parquet
+from src.models.schemas import Disparo, Marcador, Partido, ShotsResponse
+
+
+def _match(match_id: str, fecha: str, jugadores: list[str], xgot: float | None = 0.2) -> ShotsResponse:
+    return ShotsResponse(
+        partido=Partido(
+            idPartido=match_id,
+            fechaISO=fecha,
+            local="Real Oviedo",
+            visitante="FC Barcelona",
+            marcadorFinal=Marcador(local=1, visitante=2),
+        ),
+        disparos=[
+            Disparo(minuto=10 + i, equipo="FC Barcelona", jugador=jugador, xG=0.1 * (i + 1), xGOT=xgot, resultado="Gol")
+            for i, jugador in enumerate(jugadores)
+        ],
+    )
+
+
+def test_export_writes_one_row_per_shot_with_match_columns(tmp_path: Path) -> None:
+    results = export_shots_parquet(
+        [
+            _match("1", "2024-09-01T19:00:00Z", ["Pedri", "Lewandowski"], xgot=None),
+            _match("2", "2025-09-01T19:00:00Z", ["Yamal"]),
+        ],
+        tmp_path,
+        competition="laliga",
+    )
+
+    assert [(r.season, r.rows, r.matches) for r in results] == [("2024-2025", 2, 1), ("2025-2026", 1, 1)]
+    assert results[0].path == partition_path(tmp_path, "laliga", "2024-2025")
+    table = read_shots_parquet(tmp_path)
+    rows = sorted(table.to_pylist(), key=lambda row: (row["idPartido"], row["minuto"]))
+    assert rows[0]["jugador"] == "Pedri" and rows[0]["xGOT"] is None
+    assert rows[0]["fecha"] == datetime(2024, 9, 1, 19, tzinfo=timezone.utc)
+    assert (rows[0]["competicion"], rows[0]["temporada"], rows[0]["goles_visitante"]) == ("laliga", "2024-2025", 2)
+    assert rows[2]["idPartido"] == "2" and rows[2]["xGOT"] == 0.2
+
+
+def test_export_merges_by_match_id_and_skips_unchanged_partitions(tmp_path: Path) -> None:
+    first = _match("1", "2024-09-01T19:00:00Z", ["Pedri"])
+    export_shots_parquet([first, _match("2", "2024-10-01T19:00:00Z", ["Yamal"])], tmp_path, competition="laliga")
+    other_season = export_shots_parquet([_match("3", "2025-09-01T19:00:00Z", ["Olmo"])], tmp_path, competition="laliga")
+
+    (unchanged,) = export_shots_parquet([first], tmp_path, competition="laliga")
+    (corrected,) = export_shots_parquet(
+        [_match("1", "2024-09-01T19:00:00Z", ["Raphinha", "Pedri"])], tmp_path, competition="laliga"
+    )
+
+    assert other_season[0].season == "2025-2026"
+    assert unchanged.skipped and unchanged.matches == 2
+    assert (corrected.matches, corrected.rows, corrected.updated_matches) == (2, 3, 1)
+    jugadores = read_shots_parquet(tmp_path, columns=["jugador"], season="2024-2025").column("jugador").to_pylist()
+    assert jugadores == ["Raphinha", "Pedri", "Yamal"]
+
+
+def test_reader_filters_by_columns_partition_and_inclusive_dates(tmp_path: Path) -> None:
+    export_shots_parquet(
+        [_match(str(day), f"2024-09-{day:02d}T19:00:00Z", ["Pedri"]) for day in (1, 8, 15)],
+        tmp_path,
+        competition="laliga",
+    )
+    export_shots_parquet([_match("99", "2024-09-08T12:00:00Z", ["Isco"])], tmp_path, competition="copa")
+
+    table = read_shots_parquet(
+        tmp_path,
+        columns=["idPartido", "jugador"],
+        competition="laliga",
+        date_from=date(2024, 9, 8),
+        date_to=date(2024, 9, 15),
+    )
+    before = read_shots_parquet(tmp_path, date_to=datetime(2024, 9, 8, 12, tzinfo=timezone.utc))
+
+    assert table.column_names == ["idPartido", "jugador"]
+    assert table.column("idPartido").to_pylist() == ["8", "15"]
+    assert sorted(before.column("idPartido").to_pylist()) == ["1", "99"]
+    assert read_shots_parquet(tmp_path / "vacío", columns=["jugador"]).num_rows == 0
+
+
+def test_match_moved_to_another_season_leaves_its_old_partition(tmp_path: Path) -> None:
+    export_shots_parquet(
+        [_match("1", "2025-06-30T19:00:00Z", ["Pedri"]), _match("2", "2025-05-01T19:00:00Z", ["Yamal"])],
+        tmp_path,
+        competition="laliga",
+    )
+    export_shots_parquet([_match("3", "2025-06-30T19:00:00Z", ["Olmo"])], tmp_path, competition="copa")
+
+    results = export_shots_parquet([_match("1", "2025-07-01T19:00:00Z", ["Pedri"])], tmp_path, competition="laliga")
+
+    assert [(r.season, r.matches, r.updated_matches) for r in results] == [("2025-2026", 1, 1), ("2024-2025", 1, 1)]
+    table = read_shots_parquet(tmp_path, columns=["idPartido", "temporada"], competition="laliga")
+    assert sorted(zip(table["idPartido"].to_pylist(), table["temporada"].to_pylist())) == [
+        ("1", "2025-2026"),
+        ("2", "2024-2025"),
+    ]
+    assert read_shots_parquet(tmp_path, competition="copa").num_rows == 1
+
+    export_shots_parquet([_match("2", "2025-08-01T19:00:00Z", ["Yamal"])], tmp_path, competition="laliga")
+    assert not partition_path(tmp_path, "laliga", "2024-2025").exists()
@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from src import match_normalize_cli
+from src.application.normalize_matches import discover_pairs, normalize_many
+from src.observability.profiling import StageTimer, profile_run, profiling_enabled, stage
+
+
+def _write_match(raw_dir: Path, match_id: int) -> None:
+    event = {
+        "id": match_id,
+        "homeTeam": {"name": "Oviedo"},
+        "awayTeam": {"name": "Barcelona"},
+        "startDate": "2025-09-26T19:00:00Z",
+        "homeScore": {"current": 1},
+        "awayScore": {"current": 2},
+    }
+    shots = [{"player": {"name": "Lewandowski"}, "isHome": False, "time": 10, "xg": 0.4, "shotType": "goal"}]
+    (raw_dir / f"event_{match_id}.json").write_text(json.dumps(event), encoding="utf-8")
+    (raw_dir / f"shots_{match_id}.json").write_text(json.dumps(shots), encoding="utf-8")
+
+
+def test_stage_is_a_noop_without_an_active_run() -> None:
+    assert not profiling_enabled()
+    with stage("anything"):
+        pass
+
+
+def test_stage_timer_aggregates_samples() -> None:
+    timer = StageTimer()
+    timer.add("map", 0.2)
+    timer.add("map", 0.4)
+    timer.merge({"map": 0.1, "validate": 0.05})
+
+    stats = timer.as_dict()
+
+    assert list(stats) == ["map", "validate"]
+    assert stats["map"] == {"count": 3, "total_seconds": 0.7, "mean_ms": pytest.approx(233.333), "max_ms": 400.0}
+
+
+def test_profile_run_writes_cprofile_and_stage_report(tmp_path: Path) -> None:
+    with profile_run("demo", tmp_path) as run:
+        assert profiling_enabled()
+        with stage("work"):
+            sum(range(1000))
+
+    assert not profiling_enabled()
+    assert run.stats_path.exists() and run.stats_path.parent == tmp_path / "profiles"
+    report = json.loads(run.json_path.read_text(encoding="utf-8"))
+    assert report["command"] == "demo"
+    assert report["failed"] is False
+    assert report["stages"]["work"]["count"] == 1
+    assert report["top_functions"]
+
+
+def test_profile_run_disabled_yields_none(tmp_path: Path) -> None:
+    with profile_run("demo", tmp_path, enabled=False) as run:
+        assert run is None
+    assert not (tmp_path / "profiles").exists()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_normalize_many_records_stages_from_worker_processes(tmp_path: Path, workers: int) -> None:
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    for match_id in (1, 2, 3):
+        _write_match(raw_dir, match_id)
+
+    with profile_run("normalize", tmp_path / "out") as run:
+        normalize_many(discover_pairs(raw_dir), tmp_path / "out", workers=workers)
+
+    stages = run.timer.as_dict()
+    for name in ("read_inputs", "parse_json", "map", "validate", "write_output"):
+        assert stages[name]["count"] == 3, name
+
+
+def test_normalize_cli_profile_flag_and_env_var(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _write_match(raw_dir, 1)
+    out_dir = tmp_path / "out"
+    app = typer.Typer()
+    app.command()(match_normalize_cli.main)
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["--raw-dir", str(raw_dir), "--out-dir", str(out_dir), "--workers", "1", "--profile"])
+    assert result.exit_code == 0, result.output
+    assert len(list((out_dir / "profiles").glob("normalize_*.json"))) == 1
+
+    monkeypatch.setenv("SHOTS_PROFILE", "1")
+    result = runner.invoke(app, ["--raw-dir", str(raw_dir), "--out-dir", str(out_dir), "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    assert len(list((out_dir / "profiles").glob("normalize_*.json"))) == 2
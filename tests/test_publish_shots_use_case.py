@@ -1,17 +1,28 @@
+import asyncio
 import json
 from datetime import datetime, timezone
 from typing import Any
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
 from src.application.publish_shots import (
+    AsyncShotsPublisher,
+    PublishedMatchesCache,
     PublishResult,
     ShotsPayloadValidationError,
     ShotsPublicationRequest,
     ShotsPublisher,
+    SupersededPublicationError,
     TransientStorageError,
 )
+from src.application.compression import decompress
+from src.infrastructure.memory import (
+    AsyncInMemoryMatchesIndexRepository,
+    AsyncInMemoryShotsStorage,
+    InMemoryMatchesIndexRepository,
+    InMemoryShotsStorage,
+)
 from src.models.schemas import Disparo, Marcador, Partido, ShotsResponse
 
 
@@ -138,3 +149,257 @@ def test_publish_shots_raises_validation_error_for_invalid_storage_path() -> Non
 
     storage.upload.assert_not_called()
     database.upsert_match_index.assert_not_called()
+
+
+def test_publish_many_uploads_all_and_upserts_index_once() -> None:
+    storage = Mock()
+    database = Mock()
+    publisher = ShotsPublisher(storage=storage, database=database, max_workers=4)
+    requests = [_build_request(match_id=f"match-{n}") for n in range(5)]
+
+    outcomes = publisher.publish_many(requests)
+
+    assert [outcome.match_id for outcome in outcomes] == [request.match_id for request in requests]
+    assert all(outcome.ok for outcome in outcomes)
+    assert storage.upload.call_count == 5
+    database.upsert_match_index.assert_not_called()
+    database.upsert_match_indexes.assert_called_once()
+    records = database.upsert_match_indexes.call_args.kwargs["records"]
+    assert sorted(record["id"] for record in records) == [request.match_id for request in requests]
+    assert {record["checksum"] for record in records} == {outcome.result.checksum for outcome in outcomes}
+
+
+def test_publish_many_reports_errors_per_item() -> None:
+    storage = Mock()
+    database = Mock()
+
+    def _upload(*, path: str, **_: Any) -> None:
+        if path == "matches/broken.json":
+            raise TransientStorageError("timeout")
+
+    storage.upload.side_effect = _upload
+    publisher = ShotsPublisher(storage=storage, database=database)
+    invalid = ShotsPublicationRequest(
+        match_id="match-1",
+        storage_path="../../secret.txt",
+        shots=_build_sample_shots("match-1"),
+    )
+
+    outcomes = publisher.publish_many([_build_request("match-0"), invalid, _build_request("broken")])
+
+    assert outcomes[0].ok and outcomes[0].result is not None
+    assert isinstance(outcomes[1].error, ShotsPayloadValidationError)
+    assert isinstance(outcomes[2].error, TransientStorageError)
+    records = database.upsert_match_indexes.call_args.kwargs["records"]
+    assert [record["id"] for record in records] == ["match-0"]
+
+
+def test_publish_many_marks_uploaded_items_failed_when_index_upsert_fails() -> None:
+    storage = Mock()
+    database = Mock()
+    database.upsert_match_indexes.side_effect = RuntimeError("db down")
+    publisher = ShotsPublisher(storage=storage, database=database)
+
+    outcomes = publisher.publish_many([_build_request("match-0"), _build_request("match-1")])
+
+    assert all(isinstance(outcome.error, RuntimeError) for outcome in outcomes)
+
+
+def test_async_publisher_uploads_and_upserts_same_payload_as_sync() -> None:
+    storage = AsyncMock()
+    database = AsyncMock()
+    storage.upload.side_effect = [TransientStorageError("timeout"), None]
+    clock = Mock(return_value=datetime(2024, 9, 28, 21, 0, tzinfo=timezone.utc))
+    request = _build_request()
+
+    result = asyncio.run(AsyncShotsPublisher(storage=storage, database=database, clock=clock).publish(request))
+    sync_result = ShotsPublisher(storage=Mock(), database=Mock(), clock=clock).publish(request)
+
+    assert storage.upload.await_count == 2
+    database.upsert_match_index.assert_awaited_once()
+    assert result == sync_result
+
+
+def test_async_publish_many_reports_errors_per_item() -> None:
+    storage = AsyncMock()
+    database = AsyncMock()
+    publisher = AsyncShotsPublisher(storage=storage, database=database, max_workers=2)
+    invalid = ShotsPublicationRequest(
+        match_id="match-1",
+        storage_path="../../secret.txt",
+        shots=_build_sample_shots("match-1"),
+    )
+
+    outcomes = asyncio.run(publisher.publish_many([_build_request("match-0"), invalid, _build_request("match-2")]))
+
+    assert [outcome.ok for outcome in outcomes] == [True, False, True]
+    records = database.upsert_match_indexes.await_args.kwargs["records"]
+    assert [record["id"] for record in records] == ["match-0", "match-2"]
+
+
+def test_publish_skips_upload_when_index_checksum_matches() -> None:
+    storage = Mock()
+    database = Mock()
+    request = _build_request()
+    first = ShotsPublisher(storage=Mock(), database=Mock()).publish(request)
+    database.get_match_indexes.return_value = {
+        request.match_id: {
+            "id": request.match_id,
+            "storage_path": request.storage_path,
+            "checksum": first.checksum,
+            "size_bytes": first.size_bytes,
+        }
+    }
+    publisher = ShotsPublisher(storage=storage, database=database, skip_unchanged=True)
+
+    result = publisher.publish(request)
+
+    assert result.skipped is True
+    assert result.checksum == first.checksum
+    storage.upload.assert_not_called()
+    database.upsert_match_index.assert_not_called()
+
+    # La segunda vez se resuelve con la caché local, sin consultar el índice
+    database.get_match_indexes.reset_mock()
+    assert publisher.publish(request).skipped is True
+    database.get_match_indexes.assert_not_called()
+
+
+def test_publish_uploads_when_checksum_differs_or_lookup_fails() -> None:
+    storage = Mock()
+    database = Mock()
+    request = _build_request()
+    database.get_match_indexes.return_value = {
+        request.match_id: {"id": request.match_id, "storage_path": request.storage_path, "checksum": "0" * 64},
+    }
+    publisher = ShotsPublisher(storage=storage, database=database, skip_unchanged=True)
+
+    assert publisher.publish(request).skipped is False
+    storage.upload.assert_called_once()
+
+    failing_database = Mock()
+    failing_database.get_match_indexes.side_effect = TransientStorageError("timeout")
+    publisher = ShotsPublisher(storage=storage, database=failing_database, skip_unchanged=True)
+    assert publisher.publish(request).skipped is False
+    failing_database.upsert_match_index.assert_called_once()
+
+
+def test_publish_many_skips_unchanged_items() -> None:
+    storage = Mock()
+    database = Mock()
+    cache = PublishedMatchesCache()
+    seed = ShotsPublisher(storage=Mock(), database=Mock(), skip_unchanged=True, published_cache=cache)
+    seed.publish(_build_request("match-0"))
+    database.get_match_indexes.return_value = {}
+    publisher = ShotsPublisher(storage=storage, database=database, skip_unchanged=True, published_cache=cache)
+
+    outcomes = publisher.publish_many([_build_request("match-0"), _build_request("match-1")])
+
+    assert [outcome.result.skipped for outcome in outcomes] == [True, False]
+    storage.upload.assert_called_once()
+    records = database.upsert_match_indexes.call_args.kwargs["records"]
+    assert [record["id"] for record in records] == ["match-1"]
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_publish_compresses_content_and_keeps_checksum_over_raw_bytes(encoding: str) -> None:
+    if encoding == "zstd":
+        pytest.importorskip("zstandard")
+    storage = InMemoryShotsStorage()
+    database = InMemoryMatchesIndexRepository()
+    request = _build_request()
+    plain = ShotsPublisher(storage=Mock(), database=Mock()).publish(request)
+
+    result = ShotsPublisher(storage=storage, database=database, content_encoding=encoding).publish(request)
+
+    key = ("shots", request.storage_path)
+    raw = decompress(storage.objects[key], encoding)
+    assert raw == ShotsPublisher._serialize(request.shots)
+    assert storage.content_encodings[key] == encoding
+    assert result.checksum == plain.checksum
+    record = database.records[request.match_id]
+    assert record["size_bytes"] == len(storage.objects[key]) == result.size_bytes
+    assert record["raw_size_bytes"] == len(raw)
+    assert record["content_encoding"] == encoding
+
+
+def test_publish_gzip_output_is_deterministic() -> None:
+    storage = Mock()
+    publisher = ShotsPublisher(storage=storage, database=Mock(), content_encoding="gzip")
+
+    publisher.publish(_build_request())
+    publisher.publish(_build_request())
+
+    first, second = (call.kwargs for call in storage.upload.call_args_list)
+    assert first["content"] == second["content"]
+    assert first["content_encoding"] == "gzip"
+
+
+def test_publisher_rejects_unknown_content_encoding() -> None:
+    with pytest.raises(ValueError):
+        ShotsPublisher(storage=Mock(), database=Mock(), content_encoding="brotli")
+    assert "content_encoding" not in ShotsPublisher(storage=Mock(), database=Mock(), content_encoding="identity")._upload_options
+
+
+def test_enabling_compression_republishes_matches_stored_uncompressed() -> None:
+    storage = InMemoryShotsStorage()
+    database = InMemoryMatchesIndexRepository()
+    cache = PublishedMatchesCache()
+    request = _build_request()
+    ShotsPublisher(storage=storage, database=database, skip_unchanged=True, published_cache=cache).publish(request)
+
+    compressed = ShotsPublisher(
+        storage=storage, database=database, skip_unchanged=True, published_cache=cache, content_encoding="gzip"
+    )
+    first = compressed.publish(request)
+    again = compressed.publish(request)
+    from_index = ShotsPublisher(
+        storage=storage, database=database, skip_unchanged=True, content_encoding="gzip"
+    ).publish(request)
+
+    assert first.skipped is False and first.content_encoding == "gzip"
+    assert storage.content_encodings[("shots", request.storage_path)] == "gzip"
+    assert database.records[request.match_id]["content_encoding"] == "gzip"
+    assert again.skipped is True and from_index.skipped is True
+
+
+def test_publish_many_uploads_repeated_match_id_with_new_content() -> None:
+    storage = InMemoryShotsStorage()
+    database = InMemoryMatchesIndexRepository()
+    cache = PublishedMatchesCache()
+    original = _build_request("match-0")
+    ShotsPublisher(storage=storage, database=database, skip_unchanged=True, published_cache=cache).publish(original)
+    corrected = ShotsPublicationRequest(
+        match_id="match-0",
+        storage_path=original.storage_path,
+        shots=original.shots.model_copy(update={"disparos": []}),
+    )
+    publisher = ShotsPublisher(storage=storage, database=database, skip_unchanged=True, published_cache=cache)
+
+    outcomes = publisher.publish_many([original, corrected])
+
+    assert isinstance(outcomes[0].error, SupersededPublicationError)
+    assert outcomes[-1].ok and outcomes[-1].result.skipped is False
+    stored = storage.objects[("shots", original.storage_path)]
+    assert stored == ShotsPublisher._serialize(corrected.shots)
+    assert database.records["match-0"]["checksum"] == outcomes[-1].result.checksum
+
+
+def test_publish_many_uploads_only_the_last_item_of_a_repeated_match_id() -> None:
+    storage = AsyncInMemoryShotsStorage()
+    database = AsyncInMemoryMatchesIndexRepository()
+    first = _build_request("match-0")
+    last = ShotsPublicationRequest(
+        match_id="match-0",
+        storage_path=first.storage_path,
+        shots=first.shots.model_copy(update={"disparos": []}),
+    )
+
+    outcomes = asyncio.run(
+        AsyncShotsPublisher(storage=storage, database=database).publish_many([first, _build_request("match-1"), last])
+    )
+
+    assert [outcome.ok for outcome in outcomes] == [False, True, True]
+    assert isinstance(outcomes[0].error, SupersededPublicationError)
+    assert storage.objects[("shots", first.storage_path)] == ShotsPublisher._serialize(last.shots)
+    assert database.records["match-0"]["checksum"] == outcomes[2].result.checksum
@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.application.normalize_matches import archive_pair, discover_archive_pairs, normalize_many, normalize_pair
+from src.application.raw_archive import EVENT, INDEX_FILENAME, SHOTS, RawArchive
+from src.scraper.batch import fetch_matches
+
+
+def _event(match_id: int) -> dict:
+    return {
+        "id": match_id,
+        "homeTeam": {"name": "Oviedo"},
+        "awayTeam": {"name": "Barcelona"},
+        "startDate": "2025-09-26T19:00:00Z",
+        "homeScore": {"current": 1},
+        "awayScore": {"current": 2},
+    }
+
+
+_SHOTS = [{"player": {"name": "Lewandowski"}, "isHome": False, "time": 10, "xg": 0.4, "shotType": "goal"}]
+
+
+def test_append_get_overwrite_and_reopen(tmp_path: Path) -> None:
+    root = tmp_path / "raw.archive"
+    with RawArchive(root, max_segment_bytes=200) as archive:
+        for match_id in range(1, 5):
+            archive.append(EVENT, str(match_id), _event(match_id))
+        archive.append(SHOTS, "1", _SHOTS)
+        archive.append(EVENT, "2", {**_event(2), "homeTeam": {"name": "Sevilla"}})
+
+        assert archive.get(SHOTS, "1") == _SHOTS
+        assert archive.get(EVENT, "2")["homeTeam"]["name"] == "Sevilla"
+        with pytest.raises(KeyError):
+            archive.get(SHOTS, "2")
+
+    segments = sorted(path.name for path in root.glob("segment-*.jsonl"))
+    assert len(segments) > 1
+    with RawArchive(root) as reopened:
+        assert reopened.match_ids(EVENT) == ["1", "3", "4", "2"]
+        assert [json.loads(raw)["id"] for _, raw in reopened.iter_records(EVENT)] == [1, 3, 4, 2]
+        assert reopened.get(EVENT, "2")["homeTeam"]["name"] == "Sevilla"
+        assert b"\n" not in reopened.get_bytes(EVENT, "1")
+
+
+def test_torn_writes_are_ignored_and_appends_continue(tmp_path: Path) -> None:
+    root = tmp_path / "raw.archive"
+    with RawArchive(root) as archive:
+        archive.append(EVENT, "1", _event(1))
+    # Corte a mitad: bytes sin índice en el segmento, entrada que apunta más allá y línea a medias
+    with (root / "segment-000001.jsonl").open("ab") as segment:
+        segment.write(b'{"id": 2')
+    with (root / INDEX_FILENAME).open("ab") as index:
+        index.write(b'{"kind":"event","id":"9","segment":1,"offset":0,"length":999999}\n{"kind":"ev')
+
+    with RawArchive(root) as archive:
+        assert archive.match_ids(EVENT) == ["1"]
+        archive.append(EVENT, "3", _event(3))
+        assert archive.get(EVENT, "3")["id"] == 3
+
+    with RawArchive(root) as reopened:
+        assert reopened.match_ids(EVENT) == ["1", "3"]
+
+
+def test_readers_see_records_appended_by_another_writer(tmp_path: Path) -> None:
+    root = tmp_path / "raw.archive"
+    with RawArchive(root) as writer, RawArchive(root) as reader:
+        writer.append(EVENT, "1", _event(1))
+        assert reader.get(EVENT, "1")["id"] == 1
+        writer.append(EVENT, "2", _event(2))
+        assert reader.get(EVENT, "2")["id"] == 2
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_normalize_reads_single_matches_and_streams_the_archive(tmp_path: Path, workers: int) -> None:
+    root = tmp_path / "raw.archive"
+    with RawArchive(root) as archive:
+        for match_id in (1, 2, 3):
+            archive.append(EVENT, str(match_id), _event(match_id))
+        archive.append(SHOTS, "1", _SHOTS)
+        archive.append(SHOTS, "3", [])
+    out_dir = tmp_path / "out"
+
+    single = normalize_pair(archive_pair(root, "1"), out_dir)
+    report = normalize_many(discover_archive_pairs(root), out_dir, workers=workers)
+
+    assert json.loads(single.read_text(encoding="utf-8"))["disparos"][0]["jugador"] == "Lewandowski"
+    assert sorted(o.output_path.name for o in report.succeeded) == ["match_1.json", "match_3.json"]
+    assert [o.pair.match_id for o in report.failed] == ["2"] and report.failed[0].error.startswith("KeyError")
+
+
+def test_incremental_normalization_skips_unchanged_archive_records(tmp_path: Path) -> None:
+    root = tmp_path / "raw.archive"
+    out_dir = tmp_path / "out"
+    with RawArchive(root) as archive:
+        for match_id in (1, 2):
+            archive.append(EVENT, str(match_id), _event(match_id))
+            archive.append(SHOTS, str(match_id), _SHOTS)
+
+        first = normalize_many(discover_archive_pairs(root), out_dir, workers=1, incremental=True)
+        archive.append(SHOTS, "2", [])
+        second = normalize_many(discover_archive_pairs(root), out_dir, workers=1, incremental=True)
+
+    assert len(first.succeeded) == 2 and not first.skipped
+    assert [o.pair.match_id for o in second.skipped] == ["1"]
+    assert json.loads((out_dir / "match_2.json").read_text(encoding="utf-8"))["disparos"] == []
+
+
+def test_fetch_matches_can_write_into_an_archive(tmp_path: Path) -> None:
+    class _Frame:
+        def to_dict(self, orient):
+            return _SHOTS
+
+    class _Client:
+        def event_from_url(self, match):
+            return _event(int(match))
+
+        def shots_df(self, match):
+            return _Frame()
+
+    with RawArchive(tmp_path / "raw.archive") as archive:
+        report = fetch_matches(_Client(), ["1", "2"], tmp_path / "raw", workers=2, archive=archive)
+
+        assert [o.match_id for o in report.succeeded] == ["1", "2"]
+        assert archive.get(SHOTS, "2") == _SHOTS and archive.get(EVENT, "1")["id"] == 1
+    assert not (tmp_path / "raw").exists()
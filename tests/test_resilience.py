@@ -0,0 +1,143 @@
+import asyncio
+import random
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from src.application.publish_shots import ShotsPublicationRequest, ShotsPublisher
+from src.application.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, TransientStorageError
+from src.infrastructure.supabase_async import AsyncSupabaseStorageAdapter
+from src.models.schemas import Marcador, Partido, ShotsResponse
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _flaky(failures: int, error: Exception):
+    calls = {"count": 0}
+
+    def fn() -> str:
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise error
+        return "ok"
+
+    return fn, calls
+
+
+def test_retry_policy_backs_off_exponentially_with_full_jitter() -> None:
+    policy = RetryPolicy(base_delay=0.5, multiplier=2.0, max_delay=3.0)
+    rng = random.Random(1)
+
+    for retry, ceiling in [(1, 0.5), (2, 1.0), (3, 2.0), (4, 3.0), (8, 3.0)]:
+        samples = [policy.backoff(retry, rng) for _ in range(200)]
+        assert 0 <= min(samples) and max(samples) <= ceiling
+        assert max(samples) > ceiling * 0.8
+
+
+def test_retry_policy_stops_at_max_attempts_and_deadline() -> None:
+    clock = _Clock()
+    fn, calls = _flaky(10, TransientStorageError("503"))
+    with pytest.raises(TransientStorageError):
+        RetryPolicy(max_attempts=4, base_delay=0.1, deadline=None).call(fn, sleep=clock.sleep, clock=clock)
+    assert calls["count"] == 4
+
+    clock = _Clock()
+    fn, calls = _flaky(1000, TransientStorageError("503"))
+    policy = RetryPolicy(max_attempts=100, base_delay=1.0, max_delay=1.0, deadline=5.0)
+    with pytest.raises(TransientStorageError):
+        policy.call(fn, sleep=clock.sleep, clock=clock)
+    assert clock.now <= 5.0
+    assert 2 < calls["count"] < 100
+
+
+def test_retry_policy_never_retries_open_circuit_or_permanent_errors() -> None:
+    for error in (CircuitOpenError("abierto"), RuntimeError("400")):
+        fn, calls = _flaky(10, error)
+        with pytest.raises(type(error)):
+            RetryPolicy(base_delay=0).call(fn)
+        assert calls["count"] == 1
+
+
+def test_circuit_breaker_opens_fails_fast_and_recovers_after_probe() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    for _ in range(2):
+        with pytest.raises(TransientStorageError):
+            with breaker.guard():
+                raise TransientStorageError("503")
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 10
+    breaker.before_call()  # sonda en half-open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    with breaker.guard():
+        pass
+    with pytest.raises(ValueError):
+        with breaker.guard():
+            raise ValueError("4xx: el backend respondió")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_publisher_retries_index_upsert_with_policy() -> None:
+    database = Mock()
+    database.upsert_match_index.side_effect = [TransientStorageError("503"), None]
+    publisher = ShotsPublisher(storage=Mock(), database=database, retry_policy=RetryPolicy(base_delay=0))
+
+    publisher.publish(
+        ShotsPublicationRequest(
+            match_id="1",
+            storage_path="matches/1.json",
+            shots=ShotsResponse(
+                partido=Partido(
+                    idPartido="1",
+                    fechaISO="2025-08-16T19:30:00+00:00",
+                    local="A",
+                    visitante="B",
+                    marcadorFinal=Marcador(local=0, visitante=0),
+                ),
+                disparos=[],
+            ),
+        )
+    )
+
+    assert database.upsert_match_index.call_count == 2
+
+
+def test_async_adapter_fails_fast_once_shared_breaker_opens() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    async def run() -> None:
+        async with httpx.AsyncClient(base_url="https://example.supabase.co", transport=httpx.MockTransport(handler)) as client:
+            adapter = AsyncSupabaseStorageAdapter(client=client, bucket="shots", breaker=breaker)
+            policy = RetryPolicy(max_attempts=5, base_delay=0)
+            with pytest.raises(CircuitOpenError):
+                await policy.acall(
+                    lambda: adapter.upload(bucket="shots", path="m/1.json", content=b"{}", content_type="application/json")
+                )
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
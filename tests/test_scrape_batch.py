@@ -0,0 +1,113 @@
+# tests/test_scrape_batch.py
+import json
+import threading
+
+from src.scraper.batch import RateLimiter, fetch_matches, match_id_from, read_match_list
+
+
+class _FakeFrame:
+    def __init__(self, records):
+        self._records = records
+
+    def to_dict(self, orient):
+        assert orient == "records"
+        return self._records
+
+
+class FakeSofaClient:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def event_from_url(self, match):
+        with self._lock:
+            self.calls.append(("event", match))
+        if match == "666":
+            raise RuntimeError("403 Forbidden")
+        return {"id": int(match_id_from(match)), "homeTeam": {"name": "Oviedo"}}
+
+    def shots_df(self, match):
+        with self._lock:
+            self.calls.append(("shots", match))
+        return _FakeFrame([{"xg": 0.1, "player": {"name": "Rondón"}}])
+
+
+def test_fetch_matches_writes_raw_files_and_reports_failures(tmp_path):
+    client = FakeSofaClient()
+    matches = ["1", "https://www.sofascore.com/es/football/match/a-b/UHsrgb#id:2", "666", "https://x/sin-id"]
+
+    report = fetch_matches(client, matches, tmp_path, workers=3)
+
+    assert [o.match_id for o in report.succeeded] == ["1", "2"]
+    assert [o.match for o in report.failed] == ["666", "https://x/sin-id"]
+    assert json.loads((tmp_path / "event_2.json").read_text(encoding="utf-8"))["id"] == 2
+    assert json.loads((tmp_path / "shots_1.json").read_text(encoding="utf-8")) == [{"xg": 0.1, "player": {"name": "Rondón"}}]
+    assert ("shots", "666") not in client.calls
+
+
+def test_rate_limiter_spaces_calls():
+    now = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(4.0, clock=lambda: now[0], sleep=fake_sleep)
+    for _ in range(3):
+        limiter.acquire()
+
+    assert sleeps == [0.25, 0.25]
+
+
+def test_read_match_list_ignores_blank_lines_and_comments():
+    assert read_match_list(["14566650\n", "\n", "# jornada 7\n", "  14566651  "]) == ["14566650", "14566651"]
+
+
+def test_fetch_matches_cache_hits_never_wait_on_the_rate_limiter(tmp_path, monkeypatch):
+    from src.scraper.sofascore_fc import ResponseCache, SofaClient
+
+    class _Scraper:
+        def __init__(self):
+            self.calls = []
+
+        def get_match_dict(self, match):
+            self.calls.append(("event", match))
+            return {"id": match, "status": {"type": "finished"}}
+
+        def scrape_match_shots(self, match):
+            import pandas
+
+            self.calls.append(("shots", match))
+            return pandas.DataFrame([{"xg": 0.1}])
+
+    class _CachedClient(SofaClient):
+        def __init__(self, scraper, cache):
+            self.client = scraper
+            self.cache = cache
+
+    cache = ResponseCache(tmp_path / "cache")
+    scraper = _Scraper()
+    client = _CachedClient(scraper, cache)
+    client.event_from_url("7")
+    client.shots_df("7")
+    scraper.calls.clear()
+
+    waits = []
+    original_acquire = RateLimiter.acquire
+
+    def counting_acquire(self):
+        waits.append(1)
+        original_acquire(self)
+
+    monkeypatch.setattr(RateLimiter, "acquire", counting_acquire)
+
+    report = fetch_matches(client, ["7", "7", "7"], tmp_path / "raw", workers=2, rate=0.001)
+    assert len(report.succeeded) == 3
+    assert waits == []
+    assert scraper.calls == []
+
+    fetch_matches(client, ["8"], tmp_path / "raw", rate=1000)
+    assert waits == [1, 1]
+    assert scraper.calls == [("event", 8), ("shots", 8)]
+    assert client.limiter is None
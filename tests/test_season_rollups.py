@@ -0,0 +1,152 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from src.application.season_rollups import (
+    ROLLUP_CACHE_CONTROL,
+    SeasonRollupPublisher,
+    load_matches,
+    season_of,
+)
+from src.infrastructure.local import LocalFileStorageAdapter
+from src.infrastructure.memory import InMemoryShotsStorage
+from src.models.schemas import Disparo, Marcador, Partido, ShotsResponse
+
+
+def _match(match_id: str, fecha: str, shots: list[tuple[str, str, float, str, str | None]]) -> ShotsResponse:
+    return ShotsResponse(
+        partido=Partido(
+            idPartido=match_id,
+            fechaISO=fecha,
+            local="Oviedo",
+            visitante="Barcelona",
+            marcadorFinal=Marcador(local=0, visitante=1),
+        ),
+        disparos=[
+            Disparo(minuto=10, equipo=equipo, jugador=jugador, xG=xg, xGOT=xg / 2, resultado=resultado, situacion=situacion)
+            for equipo, jugador, xg, resultado, situacion in shots
+        ],
+    )
+
+
+def _publisher(storage) -> SeasonRollupPublisher:
+    return SeasonRollupPublisher(storage=storage, clock=lambda: datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+
+def _rollup(storage: InMemoryShotsStorage, path: str = "rollups/laliga/2024-2025.json") -> dict:
+    return json.loads(storage.objects[("shots", path)])
+
+
+def test_season_of_splits_at_july() -> None:
+    assert season_of("2024-08-18T19:00:00+00:00") == "2024-2025"
+    assert season_of("2025-05-25T19:00:00Z") == "2024-2025"
+    assert season_of("2025-03-01T19:00:00Z", start_month=1) == "2025-2026"
+
+
+def test_update_builds_team_and_player_totals_with_situations() -> None:
+    storage = InMemoryShotsStorage()
+    matches = [
+        _match("1", "2024-09-01T19:00:00Z", [
+            ("Barcelona", "Lewandowski", 0.5, "Gol", "Juego abierto"),
+            ("Barcelona", "Lewandowski", 0.25, "Parada", "Córner"),
+            ("Oviedo", "Rondón", 0.125, "Fallado", None),
+        ]),
+        _match("2", "2024-10-01T19:00:00Z", [("Barcelona", "Lewandowski", 0.75, "Gol", "Penalti")]),
+    ]
+
+    (result,) = _publisher(storage).update("laliga", matches)
+
+    assert result.matches == 2 and result.updated_matches == 2 and not result.skipped
+    rollup = _rollup(storage)
+    assert rollup["partidos"] == 2 and rollup["actualizado"] == "2025-01-01T00:00:00+00:00"
+    barcelona, oviedo = rollup["equipos"]
+    assert barcelona["equipo"] == "Barcelona"
+    assert (barcelona["partidos"], barcelona["disparos"], barcelona["goles"], barcelona["xG"], barcelona["xGOT"]) == (
+        2, 3, 2, 1.5, 0.75
+    )
+    assert barcelona["situaciones"]["Penalti"] == {"disparos": 1, "goles": 1, "xG": 0.75}
+    assert oviedo["situaciones"] == {"Desconocida": {"disparos": 1, "goles": 0, "xG": 0.125}}
+    assert rollup["jugadores"][0]["jugador"] == "Lewandowski" and rollup["jugadores"][0]["goles"] == 2
+    assert storage.cache_controls[("shots", "rollups/laliga/2024-2025.json")] == ROLLUP_CACHE_CONTROL
+
+
+def test_republishing_one_match_updates_rollup_incrementally() -> None:
+    storage = InMemoryShotsStorage()
+    publisher = _publisher(storage)
+    first = _match("1", "2024-09-01T19:00:00Z", [("Barcelona", "Lewandowski", 0.5, "Gol", None)])
+    second = _match("2", "2024-10-01T19:00:00Z", [("Oviedo", "Rondón", 0.25, "Parada", None)])
+    publisher.update("laliga", [first, second])
+
+    (unchanged,) = publisher.update("laliga", [first])
+    corrected = _match("1", "2024-09-01T19:00:00Z", [("Barcelona", "Raphinha", 0.5, "Gol", None)])
+    (result,) = publisher.update("laliga", [corrected])
+
+    assert unchanged.skipped
+    assert result.updated_matches == 1 and result.matches == 2
+    rollup = _rollup(storage)
+    assert [(p["jugador"], p["xG"]) for p in rollup["jugadores"]] == [("Raphinha", 0.5), ("Rondón", 0.25)]
+
+
+def test_failed_rollup_upload_is_retried_on_next_update() -> None:
+    class _FailingRollupStorage(InMemoryShotsStorage):
+        fail = True
+
+        def upload(self, *, bucket, path, content, content_type, content_encoding=None, cache_control=None):
+            if self.fail and path == "rollups/laliga/2024-2025.json":
+                raise RuntimeError("Storage rechazó la subida")
+            super().upload(bucket=bucket, path=path, content=content, content_type=content_type, cache_control=cache_control)
+
+    storage = _FailingRollupStorage()
+    publisher = _publisher(storage)
+    match = _match("1", "2024-09-01T19:00:00Z", [("Barcelona", "Lewandowski", 0.5, "Gol", None)])
+    with pytest.raises(RuntimeError):
+        publisher.update("laliga", [match])
+
+    storage.fail = False
+    (result,) = publisher.update("laliga", [match])
+
+    assert not result.skipped and result.updated_matches == 1
+    assert _rollup(storage)["partidos"] == 1
+
+
+def test_rebuild_ignores_stored_contributions_and_seasons_are_separate() -> None:
+    storage = InMemoryShotsStorage()
+    publisher = _publisher(storage)
+    publisher.update("laliga", [_match("1", "2024-09-01T19:00:00Z", [("Oviedo", "Rondón", 0.1, "Gol", None)])])
+
+    results = publisher.update(
+        "laliga",
+        [
+            _match("2", "2024-10-01T19:00:00Z", [("Oviedo", "Rondón", 0.2, "Gol", None)]),
+            _match("3", "2025-09-01T19:00:00Z", [("Oviedo", "Rondón", 0.3, "Gol", None)]),
+        ],
+        rebuild=True,
+    )
+
+    assert [r.season for r in results] == ["2024-2025", "2025-2026"]
+    assert _rollup(storage)["partidos"] == 1
+    assert _rollup(storage, "rollups/laliga/2025-2026.json")["equipos"][0]["xG"] == 0.3
+
+
+def test_rollups_round_trip_through_local_storage(tmp_path: Path) -> None:
+    storage = LocalFileStorageAdapter(root=tmp_path)
+    match_file = tmp_path / "match_1.json"
+    match_file.write_text(
+        _match("1", "2024-09-01T19:00:00Z", [("Oviedo", "Rondón", 0.1, "Gol", None)]).model_dump_json(),
+        encoding="utf-8",
+    )
+    publisher = _publisher(storage)
+
+    publisher.update("laliga", load_matches([match_file]))
+    (again,) = publisher.update("laliga", load_matches([match_file]))
+
+    assert again.skipped
+    assert storage.download(bucket="shots", path="rollups/laliga/missing.json") is None
+    assert json.loads(storage.download(bucket="shots", path="rollups/laliga/2024-2025.json"))["partidos"] == 1
+
+
+def test_rollup_path_rejects_traversal() -> None:
+    with pytest.raises(ValueError):
+        _publisher(InMemoryShotsStorage()).rollup_path("..", "2024-2025")
@@ -0,0 +1,80 @@
+import json
+import math
+import random
+
+import pytest
+
+from src.application.publish_shots import ShotsPublisher
+from src.application.serialization import CanonicalShotsSerializer, StdlibShotsSerializer
+from src.models.schemas import Disparo, Marcador, Partido, ShotsResponse
+
+
+def _reference(shots: ShotsResponse) -> bytes:
+    return json.dumps(shots.model_dump(exclude_none=True), sort_keys=True).encode("utf-8")
+
+
+def _shots(disparos: list[Disparo]) -> ShotsResponse:
+    return ShotsResponse(
+        partido=Partido(
+            idPartido="14566650",
+            fechaISO="2025-08-16T19:30:00+00:00",
+            local="Atlético de Madrid",
+            visitante='Club "Ñ" \\ 東京',
+            marcadorFinal=Marcador(local=2, visitante=0),
+        ),
+        disparos=disparos,
+    )
+
+
+@pytest.mark.parametrize(
+    "xg",
+    [0.0, -0.0, 1.0, 0.1, 1e-05, 0.00012, 123456789.125, 1e16, 1e-300, math.nan, math.inf, -math.inf],
+)
+def test_canonical_engine_matches_stdlib_for_edge_floats(xg: float) -> None:
+    shots = _shots([Disparo(minuto=1, equipo="A", jugador="B", xG=xg, xGOT=xg, resultado="goal")])
+
+    assert CanonicalShotsSerializer().serialize(shots) == _reference(shots)
+
+
+def test_canonical_engine_matches_stdlib_on_random_payloads() -> None:
+    rng = random.Random(7)
+    alphabet = "aZ09 ,:{}[]\"\\\n\t\x00\x7fñé東🙂"
+    engine = CanonicalShotsSerializer()
+
+    for _ in range(50):
+        disparos = [
+            Disparo(
+                minuto=rng.randint(0, 120),
+                equipo="".join(rng.choices(alphabet, k=rng.randint(0, 8))),
+                jugador="".join(rng.choices(alphabet, k=rng.randint(0, 8))),
+                xG=rng.random() * rng.choice([1e-6, 1.0, 1e6]),
+                xGOT=rng.choice([None, rng.random()]),
+                situacion=rng.choice([None, "regular", "córner"]),
+                resultado=rng.choice(["goal", "save", "miss"]),
+                tipo_disparo=rng.choice([None, "cabeza", "pie derecho"]),
+            )
+            for _ in range(rng.randint(0, 12))
+        ]
+        shots = _shots(disparos)
+
+        assert engine.serialize(shots) == _reference(shots)
+
+
+def test_canonical_engine_falls_back_for_unexpected_values() -> None:
+    # model_construct no valida: un int en un campo float o un subtipo con campos extra
+    loose = Disparo.model_construct(minuto=3, equipo="A", jugador="B", xG=1, xGOT=None, situacion=None, resultado="miss", tipo_disparo=None)
+
+    class TaggedDisparo(Disparo):
+        etiqueta: str = "extra"
+
+    tagged = TaggedDisparo(minuto=5, equipo="A", jugador="C", xG=0.2, resultado="goal")
+    shots = _shots([loose, tagged])
+
+    assert CanonicalShotsSerializer().serialize(shots) == StdlibShotsSerializer().serialize(shots) == _reference(shots)
+
+
+def test_publisher_checksum_is_unchanged_by_default_engine() -> None:
+    shots = _shots([Disparo(minuto=10, equipo="A", jugador="Ñ", xG=0.05, resultado="goal", situacion="regular")])
+
+    assert ShotsPublisher._serialize(shots) == _reference(shots)
+    assert ShotsPublisher._serialize(shots, StdlibShotsSerializer()) == _reference(shots)
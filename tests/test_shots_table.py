@@ -0,0 +1,95 @@
+import random
+import tracemalloc
+from pathlib import Path
+
+from src.models.schemas import Disparo, Marcador, Partido, ShotsResponse
+from src.models.shots_table import ShotsTable
+
+
+def _response(match_id: str, shots: int, rng: random.Random) -> ShotsResponse:
+    teams = ["Real Oviedo", "FC Barcelona"]
+    return ShotsResponse(
+        partido=Partido(
+            idPartido=match_id,
+            fechaISO="2025-09-26T19:00:00+00:00",
+            local=teams[0],
+            visitante=teams[1],
+            marcadorFinal=Marcador(local=1, visitante=2),
+        ),
+        disparos=[
+            Disparo(
+                minuto=rng.randint(1, 95),
+                equipo=rng.choice(teams),
+                jugador=f"Jugador {rng.randint(1, 22)}",
+                xG=rng.random(),
+                xGOT=rng.choice([None, rng.random()]),
+                situacion=rng.choice([None, "regular", "corner", "penalty"]),
+                resultado=rng.choice(["Gol", "Parada", "Fuera"]),
+                tipo_disparo=rng.choice([None, "right-foot", "head"]),
+            )
+            for _ in range(shots)
+        ],
+    )
+
+
+def test_round_trip_is_lossless_across_matches() -> None:
+    rng = random.Random(7)
+    responses = [_response(str(i), shots, rng) for i, shots in enumerate([3, 0, 12])]
+    responses[2].disparos[0].xG = 0.1 + 0.2  # bits exactos, no redondeo decimal
+
+    table = ShotsTable.from_responses(responses)
+    restored = list(table.to_responses())
+
+    assert table.match_count == 3 and len(table) == 15
+    assert [r.model_dump() for r in restored] == [r.model_dump() for r in responses]
+    assert [r.model_dump_json() for r in restored] == [r.model_dump_json() for r in responses]
+    assert restored[2].disparos[0].xG == 0.1 + 0.2
+
+
+def test_string_columns_are_interned_in_shared_pools() -> None:
+    table = ShotsTable.from_responses(_response(str(i), 20, random.Random(i)) for i in range(5))
+
+    assert len(table.pools["equipo"]) == 2
+    assert len(table.pools["resultado"]) == 3
+    assert table.column("equipo")[0] in ("Real Oviedo", "FC Barcelona")
+    assert set(table.column("situacion")) <= {None, "regular", "corner", "penalty"}
+
+
+def test_to_columns_adds_match_id_per_row() -> None:
+    table = ShotsTable.from_responses([_response("a", 2, random.Random(1)), _response("b", 1, random.Random(2))])
+
+    columns = table.to_columns()
+
+    assert columns["idPartido"] == ["a", "a", "b"]
+    assert set(columns) == {"idPartido", *Disparo.model_fields}
+    assert all(len(values) == 3 for values in columns.values())
+
+
+def test_from_json_files_loads_normalized_matches(tmp_path: Path) -> None:
+    responses = [_response(str(i), 5, random.Random(i)) for i in range(3)]
+    paths = []
+    for response in responses:
+        path = tmp_path / f"match_{response.partido.idPartido}.json"
+        path.write_text(response.model_dump_json(), encoding="utf-8")
+        paths.append(path)
+
+    table = ShotsTable.from_json_files(paths)
+
+    assert [r.model_dump() for r in table.to_responses()] == [r.model_dump() for r in responses]
+
+
+def test_table_uses_a_fraction_of_the_memory_of_models() -> None:
+    rng = random.Random(3)
+
+    tracemalloc.start()
+    models = [_response(str(i), 40, rng) for i in range(50)]
+    models_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = ShotsTable.from_responses(models)
+    table_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(table) == 2000
+    assert table_bytes < models_bytes / 4
@@ -1,5 +1,5 @@
 # tests/test_sofascore_fc_wrapper.py
-from src.scraper.sofascore_fc import SofaClient
+from src.scraper.sofascore_fc import ResponseCache, SofaClient
 
 class DummyClient(SofaClient):
     def __init__(self):  # evita dependencia real en import
@@ -20,4 +20,71 @@ def test_wrapper_shots_and_fields():
     assert len(shots) == 1
     assert c.event_id(fake_event) == "42"
     assert c.teams(fake_event) == ("Atlético", "Real Madrid")
-    assert c.start_iso(fake_event) == "2025-09-27T20:00:00Z"
\ No newline at end of file
+    assert c.start_iso(fake_event) == "2025-09-27T20:00:00Z"
+
+class _CountingScraper:
+    def __init__(self, status="finished"):
+        self.status = status
+        self.calls = []
+
+    def get_match_dict(self, match):
+        self.calls.append(("event", match))
+        return {"id": match, "status": {"type": self.status}}
+
+    def scrape_match_shots(self, match):
+        import pandas
+
+        self.calls.append(("shots", match))
+        return pandas.DataFrame([{"xg": 0.1, "player": {"name": "Griezmann"}}])
+
+
+class CachedDummyClient(SofaClient):
+    def __init__(self, scraper, cache):
+        self.client = scraper
+        self.cache = cache
+
+
+def test_cache_serves_finished_matches_without_new_requests(tmp_path):
+    now = [1000.0]
+    cache = ResponseCache(tmp_path, live_ttl=60, clock=lambda: now[0])
+    scraper = _CountingScraper(status="finished")
+    c = CachedDummyClient(scraper, cache)
+
+    c.event_from_url("42")
+    c.shots_df("https://www.sofascore.com/es/football/match/a-b/x#id:42")
+    now[0] += 10 * 365 * 24 * 3600
+    event = c.event_from_url("https://www.sofascore.com/es/football/match/a-b/x#id:42")
+    shots = c.shots_df("42")
+
+    assert event["status"]["type"] == "finished"
+    assert shots.to_dict(orient="records") == [{"xg": 0.1, "player": {"name": "Griezmann"}}]
+    assert scraper.calls == [("event", 42), ("shots", "https://www.sofascore.com/es/football/match/a-b/x#id:42")]
+
+
+def test_cache_expires_live_matches(tmp_path):
+    now = [1000.0]
+    cache = ResponseCache(tmp_path, live_ttl=60, clock=lambda: now[0])
+    scraper = _CountingScraper(status="inprogress")
+    c = CachedDummyClient(scraper, cache)
+
+    c.event_from_url("7")
+    c.event_from_url("7")
+    now[0] += 61
+    c.event_from_url("7")
+
+    assert scraper.calls == [("event", 7), ("event", 7)]
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    import os
+
+    cache = ResponseCache(tmp_path, max_bytes=520)
+    for n in range(3):
+        cache.put("event", str(n), {"blob": "x" * 100}, finished=True)
+        os.utime(tmp_path / f"event_{n}.json", (n, n))
+    cache.get("event", "0")  # "0" pasa a ser la más reciente
+    cache.put("event", "3", {"blob": "x" * 100}, finished=True)
+
+    remaining = sorted(p.name for p in tmp_path.glob("*.json"))
+    assert "event_1.json" not in remaining
+    assert "event_0.json" in remaining and "event_3.json" in remaining
@@ -0,0 +1,244 @@
+import asyncio
+import gzip
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+from storage3.exceptions import StorageApiError
+
+from src.application.publish_shots import TransientStorageError
+from src.application.resilience import CircuitBreaker, RetryPolicy
+from src.infrastructure.supabase import SupabaseMatchesIndexRepository, SupabaseStorageAdapter
+from src.infrastructure.supabase_async import (
+    AsyncSupabaseMatchesIndexRepository,
+    AsyncSupabaseStorageAdapter,
+)
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(base_url="https://example.supabase.co", transport=httpx.MockTransport(handler))
+
+
+def test_storage_adapter_posts_object_with_upsert_headers() -> None:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"Key": "shots/matches/1.json"})
+
+    async def run() -> None:
+        async with _client(handler) as client:
+            adapter = AsyncSupabaseStorageAdapter(client=client, bucket="shots")
+            await adapter.upload(bucket="shots", path="matches/1.json", content=b"{}", content_type="application/json")
+
+    asyncio.run(run())
+
+    (request,) = seen
+    assert request.method == "POST"
+    assert request.url.path == "/storage/v1/object/shots/matches/1.json"
+    assert request.headers["x-upsert"] == "true"
+    assert request.headers["content-type"] == "application/json"
+    assert request.content == b"{}"
+    assert "content-encoding" not in request.headers
+
+
+def test_storage_adapter_sends_compressed_objects_as_gzip_without_content_encoding() -> None:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"Key": "shots/matches/1.json"})
+
+    async def run() -> None:
+        async with _client(handler) as client:
+            adapter = AsyncSupabaseStorageAdapter(client=client, bucket="shots")
+            await adapter.upload(
+                bucket="shots",
+                path="matches/1.json",
+                content=b"\x1f\x8b",
+                content_type="application/json",
+                content_encoding="gzip",
+            )
+
+    asyncio.run(run())
+
+    (request,) = seen
+    assert request.headers["content-type"] == "application/gzip"
+    assert "content-encoding" not in request.headers
+    assert request.content == b"\x1f\x8b"
+
+
+class _SyncBucket:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.uploads: list[dict] = []
+
+    def upload(self, *, path, file, file_options):
+        if self.error is not None:
+            raise self.error
+        self.uploads.append({"path": path, "file": file, "file_options": file_options})
+
+    def download(self, path):
+        if self.error is not None:
+            raise self.error
+        return b"{}"
+
+
+def _sync_adapter(bucket: _SyncBucket) -> SupabaseStorageAdapter:
+    client = SimpleNamespace(storage=SimpleNamespace(from_=lambda _: bucket))
+    return SupabaseStorageAdapter(client=client, bucket="shots", breaker=CircuitBreaker())
+
+
+def test_sync_storage_adapter_sends_compressed_objects_as_gzip_without_content_encoding() -> None:
+    bucket = _SyncBucket()
+
+    _sync_adapter(bucket).upload(
+        bucket="shots",
+        path="matches/1.json",
+        content=b"\x1f\x8b",
+        content_type="application/json",
+        content_encoding="gzip",
+    )
+
+    (upload,) = bucket.uploads
+    assert upload["file_options"]["content-type"] == "application/gzip"
+    assert "content-encoding" not in upload["file_options"]
+    assert upload["file"] == b"\x1f\x8b"
+
+
+@pytest.mark.parametrize(
+    ("status", "expected"),
+    [(503, TransientStorageError), ("429", TransientStorageError), (400, RuntimeError), ("413", RuntimeError)],
+)
+def test_sync_storage_adapter_retries_only_transient_statuses(status, expected) -> None:
+    adapter = _sync_adapter(_SyncBucket(StorageApiError("fallo", "Error", status)))
+
+    with pytest.raises(expected) as raised:
+        adapter.upload(bucket="shots", path="matches/1.json", content=b"{}", content_type="application/json")
+
+    assert type(raised.value) is expected
+
+
+def test_sync_storage_adapter_maps_missing_download_to_none() -> None:
+    missing = _sync_adapter(_SyncBucket(StorageApiError("Object not found", "not_found", 400)))
+    down = _sync_adapter(_SyncBucket(StorageApiError("Bad gateway", "Error", 502)))
+
+    assert missing.download(bucket="shots", path="matches/1.json") is None
+    with pytest.raises(TransientStorageError):
+        down.download(bucket="shots", path="matches/1.json")
+
+
+class _SyncIndexTable:
+    def __init__(self, errors: list[Exception]) -> None:
+        self.errors = errors
+        self.payloads: list = []
+
+    def upsert(self, payload, *, on_conflict):
+        self._payload = payload
+        return self
+
+    def execute(self):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.payloads.append(self._payload)
+        return SimpleNamespace(data=[])
+
+
+def test_sync_index_repository_retries_postgrest_503_on_upsert() -> None:
+    # Un 503 del gateway sin cuerpo JSON llega como APIError con el estado en ``code``.
+    table = _SyncIndexTable([APIError({"message": "JSON could not be generated", "code": 503})])
+    breaker = CircuitBreaker()
+    repository = SupabaseMatchesIndexRepository(client=SimpleNamespace(table=lambda _: table), breaker=breaker)
+    date = datetime(2024, 9, 28, 20, 0, tzinfo=timezone.utc)
+    retries: list[BaseException] = []
+
+    RetryPolicy(base_delay=0).call(
+        lambda: repository.upsert_match_index(record={"id": "1", "date": date}),
+        sleep=lambda _: None,
+        on_retry=lambda _attempt, exc, _delay: retries.append(exc),
+    )
+
+    assert [type(exc) for exc in retries] == [TransientStorageError]
+    assert table.payloads == [{"id": "1", "date": date.isoformat()}]
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [(503, TransientStorageError), ("PGRST001", TransientStorageError), ("23502", RuntimeError), (400, RuntimeError)],
+)
+def test_sync_index_repository_classifies_postgrest_errors(code, expected) -> None:
+    table = _SyncIndexTable([APIError({"message": "fallo", "code": code})])
+    repository = SupabaseMatchesIndexRepository(client=SimpleNamespace(table=lambda _: table), breaker=CircuitBreaker())
+
+    with pytest.raises(expected) as raised:
+        repository.upsert_match_index(record={"id": "1", "date": datetime(2024, 9, 28, tzinfo=timezone.utc)})
+
+    assert type(raised.value) is expected
+
+
+def test_storage_adapter_maps_server_errors_to_transient() -> None:
+    async def run() -> None:
+        async with _client(lambda _: httpx.Response(503)) as client:
+            adapter = AsyncSupabaseStorageAdapter(client=client, bucket="shots")
+            await adapter.upload(bucket="shots", path="matches/1.json", content=b"{}", content_type="application/json")
+
+    with pytest.raises(TransientStorageError):
+        asyncio.run(run())
+
+
+def test_index_repository_sends_multi_row_upsert() -> None:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(201)
+
+    date = datetime(2024, 9, 28, 20, 0, tzinfo=timezone.utc)
+
+    async def run() -> None:
+        async with _client(handler) as client:
+            repository = AsyncSupabaseMatchesIndexRepository(client=client)
+            await repository.upsert_match_indexes(
+                records=[{"id": "1", "date": date}, {"id": "2", "date": date}],
+            )
+
+    asyncio.run(run())
+
+    (request,) = seen
+    assert request.url.path == "/rest/v1/matches_index"
+    assert request.url.params["on_conflict"] == "id"
+    assert "resolution=merge-duplicates" in request.headers["prefer"]
+    assert json.loads(request.content) == [
+        {"id": "1", "date": date.isoformat()},
+        {"id": "2", "date": date.isoformat()},
+    ]
+
+
+class _StoredObject(httpx.AsyncByteStream):
+    def __init__(self, content: bytes) -> None:
+        self._content = content
+
+    async def __aiter__(self):
+        yield self._content
+
+
+def test_storage_adapter_downloads_raw_bytes_and_maps_missing_to_none() -> None:
+    stored = gzip.compress(b"{}", mtime=0)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/missing.json"):
+            return httpx.Response(400, json={"error": "not_found", "message": "Object not found"})
+        return httpx.Response(200, stream=_StoredObject(stored), headers={"content-encoding": "gzip"})
+
+    async def run() -> tuple[bytes | None, bytes | None]:
+        async with _client(handler) as client:
+            adapter = AsyncSupabaseStorageAdapter(client=client, bucket="shots")
+            found = await adapter.download(bucket="shots", path="rollups/laliga/2024-2025.json")
+            missing = await adapter.download(bucket="shots", path="missing.json")
+            return found, missing
+
+    # Los bytes tal y como se subieron: httpx no deshace el Content-Encoding.
+    assert asyncio.run(run()) == (stored, None)
@@ -0,0 +1,171 @@
+import json
+import threading
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from src.api import dependencies
+from src.api.app import create_app
+from src.application.resilience import TransientStorageError
+from src.infrastructure.memory import InMemoryMatchesIndexRepository
+from src.infrastructure.write_behind import WriteBehindMatchesIndex, _encode_record
+
+
+class _RecordingRepository(InMemoryMatchesIndexRepository):
+    def __init__(self, failures: int = 0) -> None:
+        super().__init__()
+        self.batches: list[list[str]] = []
+        self.failures = failures
+        self.flushed = threading.Event()
+
+    def upsert_match_indexes(self, *, records):
+        if self.failures:
+            self.failures -= 1
+            raise TransientStorageError("PostgREST caído")
+        self.batches.append([record["id"] for record in records])
+        super().upsert_match_indexes(records=records)
+        self.flushed.set()
+
+
+def _record(match_id: str, checksum: str = "a" * 64) -> dict:
+    return {
+        "id": match_id,
+        "date": datetime(2025, 8, 16, 19, 30, tzinfo=timezone.utc),
+        "storage_path": f"matches/{match_id}.json",
+        "size_bytes": 10,
+        "checksum": checksum,
+    }
+
+
+def test_coalesces_by_id_and_flushes_on_size_threshold() -> None:
+    repository = _RecordingRepository()
+    writer = WriteBehindMatchesIndex(repository, max_batch=3, max_delay=60)
+
+    writer.upsert_match_index(record=_record("1", "a" * 64))
+    writer.upsert_match_index(record=_record("1", "b" * 64))
+    assert writer.get_match_indexes(match_ids=["1"])["1"]["checksum"] == "b" * 64
+    writer.upsert_match_indexes(records=[_record("2"), _record("3")])
+
+    assert repository.flushed.wait(2)
+    assert repository.batches == [["1", "2", "3"]]
+    assert repository.records["1"]["checksum"] == "b" * 64
+    assert writer.close()
+
+
+def test_flushes_on_time_threshold_and_on_close() -> None:
+    repository = _RecordingRepository()
+    writer = WriteBehindMatchesIndex(repository, max_batch=100, max_delay=0.05)
+
+    writer.upsert_match_index(record=_record("1"))
+    assert repository.flushed.wait(2)
+
+    writer.upsert_match_index(record=_record("2"))
+    writer.close()
+    assert set(repository.records) == {"1", "2"}
+
+
+def test_failed_flush_is_retried() -> None:
+    repository = _RecordingRepository(failures=2)
+    writer = WriteBehindMatchesIndex(repository, max_batch=1, retry_backoff=0.01)
+
+    writer.upsert_match_index(record=_record("1"))
+
+    assert writer.flush(timeout=2)
+    assert repository.batches == [["1"]]
+    writer.close()
+
+
+def test_journal_replays_records_left_by_a_failed_shutdown(tmp_path) -> None:
+    journal = tmp_path / "journal.jsonl"
+    down = _RecordingRepository(failures=10**6)
+    writer = WriteBehindMatchesIndex(down, max_batch=1, journal_path=journal, retry_backoff=0.01)
+    writer.upsert_match_indexes(records=[_record("1"), _record("2")])
+    assert writer.close(timeout=2) is False
+
+    repository = _RecordingRepository()
+    recovered = WriteBehindMatchesIndex(repository, journal_path=journal)
+
+    assert recovered.flush(timeout=2)
+    assert set(repository.records) == {"1", "2"}
+    assert repository.records["1"]["date"] == datetime(2025, 8, 16, 19, 30, tzinfo=timezone.utc)
+    recovered.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_journal_is_per_process_and_orphans_are_adopted_only_when_unlocked(tmp_path) -> None:
+    journal = tmp_path / "journal.jsonl"
+    down = _RecordingRepository(failures=10**6)
+    live = WriteBehindMatchesIndex(down, max_batch=1, journal_path=journal, retry_backoff=0.01)
+    live.upsert_match_indexes(records=[_record("1")])
+    dead = WriteBehindMatchesIndex(down, max_batch=1, journal_path=journal, retry_backoff=0.01)
+    dead.upsert_match_indexes(records=[_record("2")])
+    assert dead.close(timeout=2) is False
+    # Journal compartido de versiones anteriores: también se recupera.
+    journal.write_text(_encode_record(_record("3")) + "\n", encoding="utf-8")
+
+    repository = _RecordingRepository()
+    recovered = WriteBehindMatchesIndex(repository, journal_path=journal)
+
+    assert recovered.flush(timeout=2)
+    assert set(repository.records) == {"2", "3"}
+    assert not journal.exists()
+    live.close(timeout=0.1)
+    recovered.close()
+
+
+def test_app_lifespan_flushes_write_behind_index(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("SHOTS_STORAGE_BACKEND", "memory")
+    monkeypatch.setenv("SHOTS_INDEX_WRITE_BEHIND", "true")
+    monkeypatch.setenv("SHOTS_INDEX_FLUSH_INTERVAL", "60")
+    monkeypatch.setenv("SHOTS_INDEX_JOURNAL", str(tmp_path / "journal.jsonl"))
+    dependencies.get_settings.cache_clear()
+    body = {
+        "match_id": "1",
+        "storage_path": "matches/1.json",
+        "shots": {
+            "partido": {
+                "idPartido": "1",
+                "fechaISO": "2025-08-16T19:30:00+00:00",
+                "local": "A",
+                "visitante": "B",
+                "marcadorFinal": {"local": 0, "visitante": 0},
+            },
+            "disparos": [],
+        },
+    }
+
+    try:
+        with TestClient(create_app()) as client:
+            assert client.post("/v1/shots/publish", json=body).status_code == 201
+            _, database = dependencies.get_local_backend()
+            assert database.records == {}
+            assert dependencies.get_index_writer().pending_count == 1
+        assert set(database.records) == {"1"}
+    finally:
+        dependencies.get_settings.cache_clear()
+        dependencies.get_local_backend.cache_clear()
+        dependencies.get_index_writer.cache_clear()
+
+
+def test_permanent_failure_isolates_bad_record_and_flushes_the_rest(tmp_path) -> None:
+    class _PoisonRepository(_RecordingRepository):
+        calls = 0
+
+        def upsert_match_indexes(self, *, records):
+            self.calls += 1
+            if any(record["id"] == "bad" for record in records):
+                raise ValueError("column matches_index.content_encoding does not exist")
+            super().upsert_match_indexes(records=records)
+
+    journal = tmp_path / "journal.jsonl"
+    repository = _PoisonRepository()
+    writer = WriteBehindMatchesIndex(repository, max_batch=10, max_delay=60, journal_path=journal)
+    writer.upsert_match_indexes(records=[_record("1"), _record("bad"), _record("2")])
+
+    assert writer.flush(timeout=2)
+    assert set(repository.records) == {"1", "2"}
+    assert repository.calls <= 5
+    assert writer.get_match_indexes(match_ids=["bad"]) == {}
+    assert writer.close()
+    (dead,) = (tmp_path / "journal.jsonl.dead").read_text(encoding="utf-8").splitlines()
+    assert json.loads(dead)["record"]["id"] == "bad" and "content_encoding" in json.loads(dead)["error"]